@@ -1,9 +1,30 @@
-from ui.main_window import MainWindow
-from ui.theme import apply_theme
+import sys
+import time
+
+STARTED = time.perf_counter()
+
+from ui import startup
 
 def main():
+    startup.profile.started = STARTED
+    profiling = "--profile-startup" in sys.argv
+    if profiling:
+        startup.profile.imports = startup.ImportProfiler()
+        startup.profile.imports.install()
+
+    from ui.main_window import MainWindow
+    from ui.theme import apply_theme
+
     app = MainWindow()
     apply_theme(app)
+
+    if profiling:
+        def on_ready():
+            startup.profile.imports.uninstall()
+            print(startup.profile.report(), flush=True)
+            app._on_close()
+        app.on_ready = on_ready
+
     app.mainloop()
 
 if __name__ == "__main__":
@@ -0,0 +1,92 @@
+import statistics
+import sys
+import time
+
+from services.connection_service import ConnectionService, ConnectionInfo
+from db import objects_repo, prepared
+from db.metadata_cache import metadata_cache
+
+ITERATIONS = 20
+
+
+def expand_tree(conn, schema: str) -> None:
+    objects_repo.list_schemas(conn)
+    objects_repo.list_tables_by_schema(conn, schema)
+    objects_repo.list_views_by_schema(conn, schema)
+    objects_repo.list_indexes_by_schema(conn, schema)
+    objects_repo.list_functions_by_schema(conn, schema)
+    objects_repo.list_sequences_by_schema(conn, schema)
+    objects_repo.list_types_by_schema(conn, schema)
+
+
+def select_table(conn, schema: str, table: str) -> None:
+    objects_repo.describe_table(conn, schema, table)
+    objects_repo.get_unique_constraints(conn, schema, table)
+    objects_repo.get_table_indexes(conn, schema, table)
+    objects_repo.get_foreign_keys(conn, schema, table)
+
+
+def measure(conn, op, *args) -> list[float]:
+    times = []
+    for _ in range(ITERATIONS):
+        # Sin caché de metadatos, para que cada vuelta llegue al servidor
+        metadata_cache.clear()
+        started = time.perf_counter()
+        op(conn, *args)
+        times.append(time.perf_counter() - started)
+        conn.rollback()
+    return times
+
+
+def main():
+    svc = ConnectionService()
+
+    info = ConnectionInfo(
+        id="local",
+        name="local",
+        host="localhost",
+        port=26257,
+        database=sys.argv[1] if len(sys.argv) > 1 else "defaultdb",
+        user="root",
+        password=None,
+        sslmode="disable",
+    )
+
+    ok, msg = svc.test_connection(info)
+    print(ok, msg)
+    if not ok:
+        return
+
+    svc.connect(info)
+    conn = svc.get_conn()
+
+    schema = "public"
+    tables = objects_repo.list_tables_by_schema(conn, schema)
+    table = tables[0].name if tables else None
+
+    ops = [("expandir árbol", expand_tree, (schema,))]
+    if table:
+        ops.append((f"seleccionar tabla {table}", select_table, (schema, table)))
+
+    for label, op, args in ops:
+        objects_repo.PREPARE_CATALOG_QUERIES = False
+        plain = measure(conn, op, *args)
+        objects_repo.PREPARE_CATALOG_QUERIES = True
+        op(conn, *args)   # primera vuelta: PREPARE
+        metadata_cache.clear()
+        prep = measure(conn, op, *args)
+
+        a, b = statistics.median(plain), statistics.median(prep)
+        print(
+            f"{label}: sin PREPARE {a * 1000:.2f} ms · con PREPARE {b * 1000:.2f} ms "
+            f"· ahorro {(a - b) * 1000:.2f} ms ({(a - b) / a * 100 if a else 0:.0f}%)"
+        )
+
+    print("preparadas en esta conexión:", len(prepared.prepared_names(conn)))
+    print(prepared.stats)
+
+    svc.disconnect()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,665 @@
+import itertools
+import re
+import time
+from collections import Counter
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from typing import Any, Optional
+from psycopg2 import extensions
+
+from db import crdb_system_tables
+from db.prepared import to_positional
+
+DEFAULT_LATENCY_MS = 1.0
+# schema -> cantidad de tablas: "public" supera FOLDER_PAGE_SIZE (se pagina), "app" entra en una página
+DEFAULT_SCHEMAS = {"public": 1200, "app": 40}
+COLUMN_TYPES = ("STRING", "INT8", "DECIMAL", "TIMESTAMPTZ", "BOOL", "JSONB")
+SEQUENCE_DEFINITION = "INCREMENT 1 MINVALUE 1 MAXVALUE 9223372036854775807 START 1 CACHE 1"
+
+_QUOTED = re.compile(r'"((?:[^"]|"")+)"')
+_backend_pids = itertools.count(1000)
+
+
+def _normalize(sql: str) -> str:
+    return " ".join(sql.split()).rstrip(";").strip()
+
+
+def _ilike(pattern: str) -> re.Pattern:
+    """
+    Traduce un patrón ILIKE (con escapes \\) a regex.
+    """
+    out, i = [], 0
+    while i < len(pattern):
+        ch = pattern[i]
+        if ch == "\\" and i + 1 < len(pattern):
+            out.append(re.escape(pattern[i + 1]))
+            i += 2
+            continue
+        out.append(".*" if ch == "%" else "." if ch == "_" else re.escape(ch))
+        i += 1
+    return re.compile("".join(out), re.IGNORECASE | re.DOTALL)
+
+
+def _unquote_qualified(text: str) -> tuple[str, str]:
+    parts = [p.replace('""', '"') for p in _QUOTED.findall(text)]
+    return parts[-2], parts[-1]
+
+
+@dataclass
+class FakeTable:
+    schema: str
+    name: str
+    oid: int
+    columns: list[tuple[str, str, bool, str]]           # (nombre, tipo, not null, default)
+    primary_key: list[str]
+    indexes: list[tuple[str, list[str], bool]]          # (nombre, columnas, único), sin el primario
+    uniques: list[tuple[str, list[str]]]
+    foreign_keys: list[tuple[str, str, str, str, str]]  # (fk, columna, schema ref, tabla ref, columna ref)
+    rows: int
+
+    def index_definitions(self, database: str) -> list[tuple[str, bool, bool, str]]:
+        """
+        Retorna: [(índice, primario, único, definición)] como pg_get_indexdef.
+        """
+        on = f"{database}.{self.schema}.{self.name}"
+        out = [(f"{self.name}_pkey", True, True,
+                f"CREATE UNIQUE INDEX {self.name}_pkey ON {on} USING btree ({', '.join(c + ' ASC' for c in self.primary_key)})")]
+        for name, cols, unique in self.indexes:
+            kind = "UNIQUE INDEX" if unique else "INDEX"
+            out.append((name, False, unique, f"CREATE {kind} {name} ON {on} USING btree ({', '.join(c + ' ASC' for c in cols)})"))
+        return out
+
+    def create_statement(self, with_fks: bool = True) -> str:
+        lines = []
+        for name, typ, not_null, default in self.columns:
+            line = f"\t{name} {typ}"
+            if not_null:
+                line += " NOT NULL"
+            if default:
+                line += f" DEFAULT {default}"
+            lines.append(line)
+        lines.append(f"\tCONSTRAINT {self.name}_pkey PRIMARY KEY ({', '.join(self.primary_key)} ASC)")
+        if with_fks:
+            for fk, col, rs, rt, rc in self.foreign_keys:
+                lines.append(f"\tCONSTRAINT {fk} FOREIGN KEY ({col}) REFERENCES {rs}.{rt}({rc})")
+        for name, cols, unique in self.indexes:
+            lines.append(f"\t{'UNIQUE ' if unique else ''}INDEX {name} ({', '.join(c + ' ASC' for c in cols)})")
+        return f"CREATE TABLE {self.schema}.{self.name} (\n" + ",\n".join(lines) + "\n)"
+
+    def fk_alters(self) -> list[str]:
+        return [
+            f"ALTER TABLE {self.schema}.{self.name} ADD CONSTRAINT {fk} FOREIGN KEY ({col}) REFERENCES {rs}.{rt}({rc})"
+            for fk, col, rs, rt, rc in self.foreign_keys
+        ]
+
+    def value(self, column: int, k: int) -> Any:
+        typ = self.columns[column][1]
+        if column == 0:
+            return k
+        if typ == "STRING":
+            return f"valor {k}"
+        if typ == "INT8":
+            return k * 3
+        if typ == "DECIMAL":
+            return k * 1.5
+        if typ == "TIMESTAMPTZ":
+            return datetime(2024, 1, 1) + timedelta(seconds=k)
+        if typ == "BOOL":
+            return k % 2 == 0
+        return f'{{"k": {k}}}'
+
+
+class FakeCatalog:
+    """
+    Catálogo sintético y determinista: las mismas tablas, índices, FKs, vistas, secuencias,
+    tipos y funciones en cada corrida. El modo --live crea este mismo schema en un cluster real.
+    """
+
+    def __init__(
+        self,
+        database: str = "dmt_bench",
+        schemas: Optional[dict[str, int]] = None,
+        columns: int = 8,
+        rows_per_table: int = 5_000,
+        extra_objects: int = 10,
+    ):
+        self.database = database
+        self.schemas = dict(schemas or DEFAULT_SCHEMAS)
+        self.rows_per_table = rows_per_table
+        self.tables: dict[tuple[str, str], FakeTable] = {}
+        self.views: dict[tuple[str, str], str] = {}
+        self.sequences: list[tuple[str, str]] = []
+        self.types: list[tuple[str, str, int]] = []
+        self.functions: list[tuple[str, str, int]] = []
+
+        oids = itertools.count(100)
+        for schema, count in self.schemas.items():
+            for i in range(count):
+                name = f"t{i:04d}"
+                cols = [("id", "INT8", True, "unique_rowid()")]
+                cols += [(f"c{j}", COLUMN_TYPES[(i + j) % len(COLUMN_TYPES)], j == 1, "") for j in range(1, columns)]
+                fks = []
+                if i % 3 == 1:
+                    cols.append(("parent_id", "INT8", False, ""))
+                    fks.append((f"{name}_parent_fk", "parent_id", schema, f"t{i - 1:04d}", "id"))
+                uniques = [(f"{name}_c1_key", ["c1"])] if i % 5 == 0 else []
+                indexes = [(f"{name}_c2_idx", ["c2"], False)] + [(u, c, True) for u, c in uniques]
+                self.tables[(schema, name)] = FakeTable(
+                    schema, name, next(oids), cols, ["id"], indexes, uniques, fks, rows_per_table,
+                )
+            for j in range(extra_objects):
+                self.views[(schema, f"v{j:03d}")] = f"SELECT id, c1 FROM {schema}.t{j:04d}"
+                self.sequences.append((schema, f"s{j:03d}"))
+                self.types.append((schema, f"e{j:03d}", next(oids)))
+                self.functions.append((schema, f"f{j:03d}", next(oids)))
+        self._view_oids = {key: next(oids) for key in self.views}
+        self._seq_oids = {key: next(oids) for key in self.sequences}
+
+    def tables_in(self, schema: str) -> list[FakeTable]:
+        return sorted((t for t in self.tables.values() if t.schema == schema), key=lambda t: t.name)
+
+    def sample_table(self, schema: str = "public") -> FakeTable:
+        """
+        Una tabla con FK en el medio del schema (fuera de la primera página del árbol).
+        """
+        tables = self.tables_in(schema)
+        return next(t for t in tables[len(tables) // 2:] if t.foreign_keys)
+
+    def relations(self, schema: str, relkind: str) -> list[str]:
+        if relkind == "r":
+            return [t.name for t in self.tables_in(schema)]
+        if relkind == "v":
+            return sorted(n for s, n in self.views if s == schema)
+        return sorted(n for s, n in self.sequences if s == schema)
+
+    def seed_statements(self) -> list[str]:
+        """
+        DDL + datos para crear este catálogo en un cluster real (modo --live).
+        """
+        stmts = [f"CREATE DATABASE IF NOT EXISTS {self.database}", f"USE {self.database}"]
+        for schema in self.schemas:
+            if schema != "public":
+                stmts.append(f"CREATE SCHEMA IF NOT EXISTS {schema}")
+        for schema, name, _ in self.types:
+            stmts.append(f"CREATE TYPE IF NOT EXISTS {schema}.{name} AS ENUM ('a', 'b')")
+        for schema, name in self.sequences:
+            stmts.append(f"CREATE SEQUENCE IF NOT EXISTS {schema}.{name}")
+        ordered = sorted(self.tables.values(), key=lambda t: t.oid)
+        for t in ordered:
+            stmts.append(t.create_statement(with_fks=False).replace("CREATE TABLE", "CREATE TABLE IF NOT EXISTS", 1))
+        for t in ordered:
+            for fk, col, rs, rt, rc in t.foreign_keys:
+                stmts.append(
+                    f"ALTER TABLE {t.schema}.{t.name} ADD CONSTRAINT IF NOT EXISTS {fk} "
+                    f"FOREIGN KEY ({col}) REFERENCES {rs}.{rt}({rc}) NOT VALID"
+                )
+        for (schema, name), body in self.views.items():
+            stmts.append(f"CREATE VIEW IF NOT EXISTS {schema}.{name} AS {body}")
+        for schema, name, _ in self.functions:
+            stmts.append(f"CREATE OR REPLACE FUNCTION {schema}.{name}() RETURNS INT8 LANGUAGE SQL AS 'SELECT 1'")
+        t = self.sample_table()
+        stmts.append(
+            f"INSERT INTO {t.schema}.{t.name} (id, c1) SELECT g, 'valor ' || g::STRING "
+            f"FROM generate_series(1, {self.rows_per_table}) AS g ON CONFLICT (id) DO NOTHING"
+        )
+        return stmts
+
+
+@dataclass
+class WireStats:
+    """
+    Idas y vueltas al "servidor": cada execute, cada FETCH de un cursor del servidor,
+    y cada COMMIT/ROLLBACK con una transacción abierta.
+    """
+    round_trips: int = 0
+    by_label: Counter = field(default_factory=Counter)
+    unknown: Counter = field(default_factory=Counter)
+
+    def add(self, label: str) -> None:
+        self.round_trips += 1
+        self.by_label[label] += 1
+
+    def reset(self) -> None:
+        self.round_trips = 0
+        self.by_label.clear()
+        self.unknown.clear()
+
+
+@dataclass
+class FakeInfo:
+    host: str
+    port: int
+    user: str
+    dbname: str
+    backend_pid: int
+
+
+class FakeCursor:
+    def __init__(self, conn: "FakeConnection", name: Optional[str] = None):
+        self.conn = conn
+        self.name = name
+        self.itersize = 2000
+        self.description = None
+        self.rowcount = -1
+        self._rows: list[tuple] = []
+        self._pos = 0
+        self.closed = False
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def execute(self, sql: str, params=None) -> None:
+        columns, rows = self.conn._run(sql, params)
+        self.description = [(c, None, None, None, None, None, None) for c in columns] if columns is not None else None
+        self._rows = rows
+        self._pos = 0
+        self.rowcount = len(rows)
+
+    def fetchall(self) -> list[tuple]:
+        if self.name:
+            self.conn._round_trip("FETCH ALL")
+        rows, self._pos = self._rows[self._pos:], len(self._rows)
+        return rows
+
+    def fetchmany(self, size: Optional[int] = None) -> list[tuple]:
+        size = size or self.itersize
+        if self.name:
+            self.conn._round_trip("FETCH")
+        rows = self._rows[self._pos:self._pos + size]
+        self._pos += len(rows)
+        return rows
+
+    def fetchone(self) -> Optional[tuple]:
+        if self._pos >= len(self._rows):
+            return None
+        self._pos += 1
+        return self._rows[self._pos - 1]
+
+    def close(self) -> None:
+        if not self.closed and self.name:
+            self.conn._round_trip("CLOSE")
+        self.closed = True
+
+
+class FakeConnection:
+    """
+    Conexión DB-API en memoria con la interfaz que usa el proyecto de psycopg2.
+    Responde las consultas de crdb_system_tables desde un FakeCatalog y simula
+    latency_ms de red por cada ida y vuelta.
+    """
+
+    def __init__(
+        self,
+        catalog: FakeCatalog,
+        latency_ms: float = DEFAULT_LATENCY_MS,
+        stats: Optional[WireStats] = None,
+    ):
+        self.catalog = catalog
+        self.latency = latency_ms / 1000.0
+        self.stats = stats if stats is not None else WireStats()
+        self.info = FakeInfo("fake", 26257, "root", catalog.database, next(_backend_pids))
+        self.autocommit = False
+        self.closed = 0
+        self._status = extensions.TRANSACTION_STATUS_IDLE
+        self._prepared: dict[str, Optional[str]] = {}
+        self._batch: Optional[list[str]] = None
+        self._routes, self._by_text = _routes()
+
+    # --- DB-API ---
+
+    def cursor(self, name: Optional[str] = None) -> FakeCursor:
+        return FakeCursor(self, name)
+
+    def commit(self) -> None:
+        self._end_transaction("COMMIT")
+
+    def rollback(self) -> None:
+        self._end_transaction("ROLLBACK")
+
+    def close(self) -> None:
+        self.closed = 1
+
+    def cancel(self) -> None:
+        pass
+
+    def get_transaction_status(self) -> int:
+        return self._status
+
+    # --- simulación ---
+
+    def _round_trip(self, label: str) -> None:
+        if self._batch is not None:
+            self._batch.append(label)
+            return
+        self.stats.add(label)
+        if self.latency > 0:
+            time.sleep(self.latency)
+
+    def _end_transaction(self, label: str) -> None:
+        # psycopg2 no va al servidor si no hay transacción abierta
+        if self._status != extensions.TRANSACTION_STATUS_IDLE:
+            self._round_trip(label)
+            self._status = extensions.TRANSACTION_STATUS_IDLE
+
+    def _run(self, sql: str, params) -> tuple[Optional[list[str]], list[tuple]]:
+        text = _normalize(sql)
+        params = tuple(params) if params is not None else ()
+        if not self.autocommit:
+            self._status = extensions.TRANSACTION_STATUS_INTRANS
+
+        if "; " in text and self._batch is None:
+            # Varias sentencias en un execute (PREPARE + EXECUTE): una sola ida y vuelta
+            self._batch, result = [], (None, [])
+            try:
+                for part in text.split("; "):
+                    result = self._run(part, params)
+            finally:
+                labels, self._batch = self._batch, None
+            self._round_trip(labels[-1])
+            return result
+
+        m = re.fullmatch(r"PREPARE (\w+) AS (.*)", text, re.DOTALL)
+        if m:
+            self._round_trip("PREPARE")
+            body = m.group(2).replace("%%", "%") if params else m.group(2)
+            self._prepared[m.group(1)] = self._by_text.get(_normalize(body))
+            return None, []
+        m = re.fullmatch(r"EXECUTE (\w+)(?: \(.*\))?", text, re.DOTALL)
+        if m:
+            name = self._prepared.get(m.group(1))
+            self._round_trip(name or "EXECUTE")
+            if name is None:
+                self.stats.unknown[text[:80]] += 1
+                return [], []
+            return getattr(self, f"_q_{name.lower()}")(params)
+
+        for route, name in self._routes:
+            m = route.fullmatch(text)
+            if m:
+                self._round_trip(name)
+                return getattr(self, f"_q_{name.lower()}")(params, **m.groupdict())
+
+        self._round_trip(text.split(" ", 1)[0].upper())
+        if re.match(r"(SAVEPOINT|RELEASE|ROLLBACK TO|SET|BEGIN)\b", text, re.IGNORECASE):
+            return None, []
+        m = re.fullmatch(r"SHOW CREATE (TABLE|VIEW|SEQUENCE) (.+)", text)
+        if m:
+            return self._show_create(m.group(1), m.group(2))
+        m = re.match(r'SELECT (.+?) FROM ("(?:[^"]|"")+"\."(?:[^"]|"")+")(.*)$', text)
+        if m:
+            return self._select_table(m.group(1), m.group(2), m.group(3), params)
+        self.stats.unknown[text[:80]] += 1
+        return [], []
+
+    # --- tablas de usuario ---
+
+    def _table(self, qualified: str) -> FakeTable:
+        return self.catalog.tables[_unquote_qualified(qualified)]
+
+    def _show_create(self, kind: str, qualified: str):
+        schema, name = _unquote_qualified(qualified)
+        if kind == "TABLE":
+            create = self.catalog.tables[(schema, name)].create_statement()
+        elif kind == "VIEW":
+            create = f"CREATE VIEW {schema}.{name} AS {self.catalog.views[(schema, name)]}"
+        else:
+            create = f"CREATE SEQUENCE {schema}.{name} MINVALUE 1 MAXVALUE 9223372036854775807 INCREMENT 1 START 1"
+        return ["table_name", "create_statement"], [(f"{schema}.{name}", create)]
+
+    def _select_table(self, select: str, qualified: str, rest: str, params: tuple):
+        """
+        SELECT [*|columnas] [, clave AS "__keyN"] FROM tabla [WHERE (clave) > (%s)] ... [LIMIT n]:
+        filas generadas; con WHERE empieza después de la clave recibida.
+        """
+        t = self._table(qualified)
+        names = [c[0] for c in t.columns]
+        keys = re.findall(r'AS "(__key\d+)"', select)
+        limit = re.search(r"LIMIT (\d+)", rest)
+        start = 1
+        if "WHERE" in rest and params:
+            start = int(params[0]) + (0 if ">=" in rest or "<=" in rest else 1)
+        stop = t.rows + 1 if limit is None else min(t.rows + 1, start + int(limit.group(1)))
+        rows = [
+            tuple(t.value(i, k) for i in range(len(names))) + (k,) * len(keys)
+            for k in range(start, stop)
+        ]
+        return names + keys, rows
+
+    # --- consultas de catálogo: _q_<constante> ---
+
+    def _q_list_databases(self, params):
+        return ["database_name", "owner"], [(d, "root") for d in ("defaultdb", "postgres", self.catalog.database, "system")]
+
+    def _q_list_schemas(self, params):
+        return ["schema_name"], [(s,) for s in sorted(self.catalog.schemas)]
+
+    def _q_list_view_names(self, params):
+        return ["view_name"], [(n,) for n in sorted({n for _, n in self.catalog.views})]
+
+    def _q_page_relations_by_schema(self, params):
+        schema, relkind, after, pattern, limit = params
+        like = _ilike(pattern)
+        names = [n for n in self.catalog.relations(schema, relkind) if n > after and like.fullmatch(n)]
+        return ["name"], [(n,) for n in names[:limit]]
+
+    def _q_page_types_by_schema(self, params):
+        schema, after, pattern, limit = params
+        like = _ilike(pattern)
+        names = sorted(n for s, n, _ in self.catalog.types if s == schema and n > after and like.fullmatch(n))
+        return ["name"], [(n,) for n in names[:limit]]
+
+    def _q_page_functions_by_schema(self, params):
+        schema, after_name, after_oid, pattern, limit = params
+        like = _ilike(pattern)
+        rows = sorted(
+            (n, oid) for s, n, oid in self.catalog.functions
+            if s == schema and (n, oid) > (after_name, after_oid) and like.fullmatch(n)
+        )
+        return ["name", "oid"], rows[:limit]
+
+    def _q_page_indexes_by_schema(self, params):
+        schema, after_table, after_index, pattern, _, limit = params
+        like = _ilike(pattern)
+        rows = []
+        for t in self.catalog.tables_in(schema):
+            for name, _, _, _ in t.index_definitions(self.catalog.database):
+                if (t.name, name) > (after_table, after_index) and (like.fullmatch(t.name) or like.fullmatch(name)):
+                    rows.append((t.name, name))
+        return ["table_name", "index_name"], sorted(rows)[:limit]
+
+    def _q_describe_table(self, params):
+        schema, table = params
+        t = self.catalog.tables.get((schema, table))
+        rows = []
+        if t is not None:
+            for i, (name, typ, not_null, default) in enumerate(t.columns, 1):
+                rows.append(("column", i, name, typ, str(not_null).lower(), default or None, None))
+            for i, col in enumerate(t.primary_key, 1):
+                rows.append(("constraint", i, f"{t.name}_pkey", "p", col, None, None))
+            for cname, cols in t.uniques:
+                for i, col in enumerate(cols, 1):
+                    rows.append(("constraint", i, cname, "u", col, None, None))
+            for name, primary, unique, definition in t.index_definitions(self.catalog.database):
+                rows.append(("index", 0, name, str(primary).lower(), str(unique).lower(), definition, None))
+            for fk, col, rs, rt, rc in t.foreign_keys:
+                rows.append(("fk", 1, fk, col, rs, rt, rc))
+        return ["kind", "ord", "name", "v1", "v2", "v3", "v4"], rows
+
+    def _q_get_primary_key_columns(self, params):
+        schema, table = params
+        t = self.catalog.tables.get((schema, table))
+        return ["column_name"], [(c,) for c in (t.primary_key if t else [])]
+
+    def _q_snapshot_relations(self, params):
+        (schema,) = params
+        rows = [(t.oid, t.name, "r", None) for t in self.catalog.tables_in(schema)]
+        rows += [(self.catalog._view_oids[(s, n)], n, "v", body) for (s, n), body in self.catalog.views.items() if s == schema]
+        rows += [(self.catalog._seq_oids[(s, n)], n, "S", SEQUENCE_DEFINITION) for s, n in self.catalog.sequences if s == schema]
+        return ["oid", "relation_name", "relkind", "definition"], sorted(rows, key=lambda r: r[1])
+
+    def _q_snapshot_columns(self, params):
+        (schema,) = params
+        rows = [
+            (t.oid, name, typ, not_null, default or None)
+            for t in self.catalog.tables_in(schema) for name, typ, not_null, default in t.columns
+        ]
+        return ["attrelid", "column_name", "data_type", "not_null", "default_expr"], rows
+
+    def _q_snapshot_constraints(self, params):
+        (schema,) = params
+        rows = []
+        for t in self.catalog.tables_in(schema):
+            rows += [(t.oid, f"{t.name}_pkey", "p", c) for c in t.primary_key]
+            rows += [(t.oid, cname, "u", c) for cname, cols in t.uniques for c in cols]
+        return ["conrelid", "constraint_name", "contype", "column_name"], rows
+
+    def _q_snapshot_foreign_keys(self, params):
+        (schema,) = params
+        rows = [(t.oid, *fk) for t in self.catalog.tables_in(schema) for fk in t.foreign_keys]
+        return ["conrelid", "fk_name", "column_name", "ref_schema", "ref_table", "ref_column"], rows
+
+    def _q_snapshot_indexes(self, params):
+        (schema,) = params
+        rows = [
+            (t.oid, *idx) for t in self.catalog.tables_in(schema)
+            for idx in t.index_definitions(self.catalog.database)
+        ]
+        return ["indrelid", "index_name", "is_primary", "is_unique", "index_def"], rows
+
+    def _q_table_row_statistics(self, params):
+        return ["estimated_row_count"], [(self._table(params[0]).rows,)]
+
+    def _q_table_latest_statistics(self, params, table):
+        return ["created", "row_count"], [(datetime(2024, 1, 1), self._table(table).rows)]
+
+    def _q_table_span_stats(self, params, table):
+        t = self._table(table)
+        size = t.rows * 120
+        return ["range_count", "live_bytes", "total_bytes"], [(1 + size // (512 << 20), size, size + size // 10)]
+
+    def _q_table_range_count(self, params, table):
+        return ["range_count"], [(1,)]
+
+    def _q_create_statements_all(self, params):
+        schema = params[0]
+        rows = []
+        for t in sorted(self.catalog.tables.values(), key=lambda t: t.oid):
+            if schema is None or t.schema == schema:
+                validates = [f"ALTER TABLE {t.schema}.{t.name} VALIDATE CONSTRAINT {fk[0]}" for fk in t.foreign_keys]
+                rows.append((t.schema, t.name, "table", t.oid, t.create_statement(),
+                             t.create_statement(with_fks=False), t.fk_alters(), validates))
+        for (s, n), body in self.catalog.views.items():
+            if schema is None or s == schema:
+                rows.append((s, n, "view", self.catalog._view_oids[(s, n)], f"CREATE VIEW {s}.{n} AS {body}", None, [], []))
+        for s, n in self.catalog.sequences:
+            if schema is None or s == schema:
+                rows.append((s, n, "sequence", self.catalog._seq_oids[(s, n)], f"CREATE SEQUENCE {s}.{n}", None, [], []))
+        cols = ["schema_name", "descriptor_name", "descriptor_type", "descriptor_id",
+                "create_statement", "create_nofks", "alter_statements", "validate_statements"]
+        return cols, rows
+
+    def _q_create_type_statements_all(self, params):
+        schema = params[0]
+        rows = [
+            (s, n, oid, f"CREATE TYPE {s}.{n} AS ENUM ('a', 'b')")
+            for s, n, oid in self.catalog.types if schema is None or s == schema
+        ]
+        return ["schema_name", "descriptor_name", "descriptor_id", "create_statement"], rows
+
+    def _q_foreign_key_edges(self, params):
+        rows = [(t.schema, t.name, rs, rt) for t in self.catalog.tables.values() for _, _, rs, rt, _ in t.foreign_keys]
+        return ["schema_name", "table_name", "ref_schema", "ref_table"], rows
+
+
+_ROUTES: Optional[tuple[list[tuple[re.Pattern, str]], dict[str, str]]] = None
+
+
+def _routes() -> tuple[list[tuple[re.Pattern, str]], dict[str, str]]:
+    """
+    Retorna: ([(regex del texto, constante)], {texto de PREPARE: constante}) para las
+    constantes de crdb_system_tables que FakeConnection sabe responder.
+    """
+    global _ROUTES
+    if _ROUTES is None:
+        routes, by_text = [], {}
+        for name, text in vars(crdb_system_tables).items():
+            if not (name.isupper() and isinstance(text, str) and hasattr(FakeConnection, f"_q_{name.lower()}")):
+                continue
+            pattern = re.escape(_normalize(text)).replace(r"\{table\}", r"(?P<table>.+?)")
+            routes.append((re.compile(pattern, re.DOTALL), name))
+            by_text[_normalize(text)] = name
+            by_text[_normalize(to_positional(text)[0])] = name
+        _ROUTES = (routes, by_text)
+    return _ROUTES
+
+
+class CountingConnection:
+    """
+    Envuelve una conexión real de psycopg2 contando las mismas idas y vueltas que FakeConnection
+    (modo --live).
+    """
+
+    def __init__(self, conn, stats: Optional[WireStats] = None):
+        self._conn = conn
+        self.stats = stats if stats is not None else WireStats()
+
+    def cursor(self, *args, **kwargs):
+        return _CountingCursor(self._conn.cursor(*args, **kwargs), self.stats, bool(kwargs.get("name")))
+
+    def commit(self) -> None:
+        if self._conn.get_transaction_status() != extensions.TRANSACTION_STATUS_IDLE:
+            self.stats.add("COMMIT")
+        self._conn.commit()
+
+    def rollback(self) -> None:
+        if self._conn.get_transaction_status() != extensions.TRANSACTION_STATUS_IDLE:
+            self.stats.add("ROLLBACK")
+        self._conn.rollback()
+
+    def __getattr__(self, name):
+        return getattr(self._conn, name)
+
+
+class _CountingCursor:
+    def __init__(self, cur, stats: WireStats, named: bool):
+        self._cur = cur
+        self._stats = stats
+        self._named = named
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def execute(self, sql, params=None):
+        self._stats.add(_normalize(sql).split(" ", 1)[0].upper())
+        return self._cur.execute(sql, params)
+
+    def fetchmany(self, size=None):
+        if self._named:
+            self._stats.add("FETCH")
+        return self._cur.fetchmany(size) if size else self._cur.fetchmany()
+
+    def fetchall(self):
+        if self._named:
+            self._stats.add("FETCH ALL")
+        return self._cur.fetchall()
+
+    def close(self):
+        if self._named and not self._cur.closed:
+            self._stats.add("CLOSE")
+        self._cur.close()
+
+    def __getattr__(self, name):
+        return getattr(self._cur, name)
+
+    def __setattr__(self, name, value):
+        if name.startswith("_"):
+            super().__setattr__(name, value)
+        else:
+            setattr(self._cur, name, value)
+
@@ -0,0 +1,183 @@
+"""
+Idas y vueltas al servidor y tiempo de las operaciones principales de la app.
+
+Uso (desde src/):
+    python -m benchmarks.run                      # offline, contra FakeConnection
+    python -m benchmarks.run --latency-ms 5       # más latencia simulada por ida y vuelta
+    python -m benchmarks.run --update-baseline    # reescribe baseline.json con los valores actuales
+    python -m benchmarks.run --live --seed        # contra un CockroachDB local (crea dmt_bench)
+    python -m benchmarks.run --live --no-prepare  # lo mismo sin PREPARE, para comparar el tiempo de planificación
+
+Cada escenario corre dos veces: "frío" (conexión nueva, sin cachés) y "tibio" (misma conexión,
+sin caché de metadatos pero con las sentencias ya preparadas).
+Offline, sale con código 1 si algún escenario hace más idas y vueltas que baseline.json.
+"""
+import argparse
+import json
+import sys
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from db import objects_repo, prepared
+from db.metadata_cache import metadata_cache
+from db.result_cache import result_cache
+from benchmarks.fake_db import DEFAULT_LATENCY_MS, CountingConnection, FakeCatalog, FakeConnection, WireStats
+from benchmarks.scenarios import SCENARIOS
+
+BASELINE_PATH = Path(__file__).resolve().parent / "baseline.json"
+PHASES = ("cold", "warm")
+
+
+@dataclass
+class ScenarioResult:
+    name: str
+    round_trips: dict[str, int] = field(default_factory=dict)    # fase -> idas y vueltas
+    wall_ms: dict[str, float] = field(default_factory=dict)
+    by_label: dict[str, int] = field(default_factory=dict)       # de la corrida en frío
+    unknown: dict[str, int] = field(default_factory=dict)
+
+
+def _reset_caches() -> None:
+    metadata_cache.clear()
+    result_cache.clear()
+
+
+def run_scenario(name: str, connect, catalog: FakeCatalog) -> ScenarioResult:
+    """
+    connect(stats) -> conexión que cuenta sus idas y vueltas en stats.
+    """
+    result = ScenarioResult(name)
+    scenario = SCENARIOS[name]
+    stats = WireStats()
+    conn = connect(stats)
+    try:
+        for phase in PHASES:
+            _reset_caches()
+            stats.reset()
+            started = time.perf_counter()
+            scenario(conn, catalog)
+            conn.rollback()
+            result.wall_ms[phase] = (time.perf_counter() - started) * 1000
+            result.round_trips[phase] = stats.round_trips
+            if phase == "cold":
+                result.by_label = dict(stats.by_label.most_common())
+                result.unknown = dict(stats.unknown)
+    finally:
+        prepared.forget(conn)
+        conn.close()
+    return result
+
+
+def compare(results: list[ScenarioResult], baseline: dict) -> list[str]:
+    """
+    Retorna: regresiones (más idas y vueltas que el baseline), una por línea.
+    """
+    failures = []
+    expected = baseline.get("scenarios", {})
+    for r in results:
+        for phase in PHASES:
+            limit = expected.get(r.name, {}).get(phase)
+            if limit is not None and r.round_trips[phase] > limit:
+                failures.append(f"{r.name} ({phase}): {r.round_trips[phase]} idas y vueltas, baseline {limit}")
+    return failures
+
+
+def write_baseline(results: list[ScenarioResult], catalog: FakeCatalog, path: Path = BASELINE_PATH) -> None:
+    data = {
+        "catalog": {"schemas": catalog.schemas, "rows_per_table": catalog.rows_per_table},
+        "scenarios": {r.name: dict(r.round_trips) for r in results},
+    }
+    path.write_text(json.dumps(data, indent=2) + "\n", encoding="utf-8")
+
+
+def report(results: list[ScenarioResult], baseline: dict) -> str:
+    expected = baseline.get("scenarios", {})
+    lines = [f"{'escenario':<18} {'idas frío':>10} {'idas tibio':>11} {'ms frío':>9} {'ms tibio':>9}   baseline"]
+    for r in results:
+        base = expected.get(r.name, {})
+        lines.append(
+            f"{r.name:<18} {r.round_trips['cold']:>10} {r.round_trips['warm']:>11} "
+            f"{r.wall_ms['cold']:>9.1f} {r.wall_ms['warm']:>9.1f}   "
+            f"{base.get('cold', '-')}/{base.get('warm', '-')}"
+        )
+        detail = ", ".join(f"{label} x{n}" for label, n in r.by_label.items())
+        lines.append(f"    {detail}")
+        for text, n in r.unknown.items():
+            lines.append(f"    SIN RESPUESTA SIMULADA x{n}: {text}")
+    return "\n".join(lines)
+
+
+def _live_connect(args):
+    from db.connection import get_connection
+
+    def connect(stats: WireStats):
+        conn = get_connection(host=args.host, port=args.port, database=args.database, user=args.user, sslmode="disable")
+        return CountingConnection(conn, stats)
+    return connect
+
+
+def seed(args, catalog: FakeCatalog) -> None:
+    from db.connection import get_connection
+    conn = get_connection(host=args.host, port=args.port, user=args.user, sslmode="disable", default_db=True)
+    conn.autocommit = True
+    try:
+        with conn.cursor() as cur:
+            for stmt in catalog.seed_statements():
+                cur.execute(stmt)
+    finally:
+        conn.close()
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmarks de idas y vueltas al servidor.")
+    parser.add_argument("scenarios", nargs="*", help=f"escenarios a correr: {', '.join(SCENARIOS)} (todos si no se indica)")
+    parser.add_argument("--latency-ms", type=float, default=DEFAULT_LATENCY_MS, help="latencia simulada por ida y vuelta")
+    parser.add_argument("--update-baseline", action="store_true", help="reescribe baseline.json")
+    parser.add_argument("--live", action="store_true", help="usar un CockroachDB real en lugar de FakeConnection")
+    parser.add_argument("--seed", action="store_true", help="con --live: crear la base de prueba antes de medir")
+    parser.add_argument("--no-prepare", action="store_true", help="consultas de catálogo sin PREPARE/EXECUTE")
+    parser.add_argument("--host", default="localhost")
+    parser.add_argument("--port", type=int, default=26257)
+    parser.add_argument("--user", default="root")
+    parser.add_argument("--database", default="dmt_bench")
+    args = parser.parse_args(argv)
+    unknown = [n for n in args.scenarios if n not in SCENARIOS]
+    if unknown:
+        parser.error(f"escenario desconocido: {', '.join(unknown)}")
+
+    objects_repo.PREPARE_CATALOG_QUERIES = not args.no_prepare
+    catalog = FakeCatalog(database=args.database)
+    if args.live:
+        if args.seed:
+            seed(args, catalog)
+        connect = _live_connect(args)
+    else:
+        def connect(stats: WireStats):
+            return FakeConnection(catalog, latency_ms=args.latency_ms, stats=stats)
+
+    names = args.scenarios or list(SCENARIOS)
+    results = [run_scenario(name, connect, catalog) for name in names]
+
+    baseline = json.loads(BASELINE_PATH.read_text(encoding="utf-8")) if BASELINE_PATH.exists() else {}
+    print(report(results, baseline))
+
+    if args.live:
+        # El catálogo real trae objetos del sistema: los números no se comparan con el baseline
+        return 0
+    if args.update_baseline:
+        write_baseline(results, catalog)
+        print(f"Baseline actualizado: {BASELINE_PATH}")
+        return 0
+
+    failures = compare(results, baseline)
+    for f in failures:
+        print(f"REGRESIÓN: {f}")
+    if any(r.unknown for r in results):
+        print("Hay consultas sin respuesta simulada: agregarlas a FakeConnection.")
+        return 1
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,85 @@
+import os
+import tempfile
+
+from db import objects_repo
+from db.ddl_export import export_ddl
+from db.ddl_repo import build_create_table_ddl, get_object_ddl
+from db.execute import run_sql
+from db.table_browser import open_browser, quote_ident
+from db.table_stats import get_table_stats
+from models.db_object import DbObject
+from benchmarks.fake_db import FakeCatalog
+
+# Carpetas que abre el árbol en un schema, en el orden de ObjectTree
+TREE_FOLDER_KINDS = ("table", "view", "index", "function", "sequence", "type")
+RESULT_PAGE_SIZE = 500
+
+
+def tree_expansion(conn, catalog: FakeCatalog) -> None:
+    """
+    Lo que pide ObjectTree al abrir la conexión, la base y cada schema con sus carpetas
+    (solo la primera página de cada una).
+    """
+    objects_repo.list_databases(conn)
+    objects_repo.list_schemas(conn)
+    pattern = objects_repo.like_pattern("")
+    for schema in catalog.schemas:
+        for kind in TREE_FOLDER_KINDS:
+            rows = objects_repo.list_folder_page(
+                conn, schema, kind, objects_repo.FOLDER_START_KEYS[kind], pattern, objects_repo.FOLDER_PAGE_SIZE,
+            )
+            # Igual que ObjectTree._fetch_folder_page: schema chico -> snapshot completo
+            if kind == "table" and len(rows) < objects_repo.FOLDER_PAGE_SIZE:
+                objects_repo.load_schema_snapshot(conn, schema)
+
+
+def table_selection(conn, catalog: FakeCatalog) -> None:
+    """
+    Click en una tabla de un schema grande (sin snapshot): ficha, DDL, datos y estadísticas.
+    """
+    t = catalog.sample_table()
+    desc = objects_repo.describe_table(conn, t.schema, t.name)
+    build_create_table_ddl(desc)
+    browser = open_browser(conn, t.schema, t.name)
+    browser.first_page(conn)
+    browser.next_page(conn)
+    get_table_stats(conn, t.schema, t.name)
+
+
+def ddl_generation(conn, catalog: FakeCatalog) -> None:
+    """
+    DDL de objetos sueltos (panel DDL) y exportación de la base completa.
+    """
+    t = catalog.sample_table()
+    view_schema, view = next(iter(catalog.views))
+    seq_schema, seq = catalog.sequences[0]
+    get_object_ddl(conn, DbObject(obj_type="table", schema=t.schema, name=t.name), {})
+    get_object_ddl(conn, DbObject(obj_type="view", schema=view_schema, name=view), {})
+    get_object_ddl(conn, DbObject(obj_type="sequence", schema=seq_schema, name=seq), {})
+
+    fd, path = tempfile.mkstemp(suffix=".sql")
+    os.close(fd)
+    try:
+        export_ddl(conn, path)
+    finally:
+        os.remove(path)
+
+
+def result_loading(conn, catalog: FakeCatalog) -> None:
+    """
+    SELECT * de una tabla desde el editor SQL, leyendo todas las páginas del cursor.
+    """
+    t = catalog.sample_table()
+    sql = f"SELECT * FROM {quote_ident(t.schema)}.{quote_ident(t.name)}"
+    result = run_sql(conn, sql, stream=True, page_size=RESULT_PAGE_SIZE)
+    stream = result.get("stream")
+    while stream is not None and not stream.exhausted:
+        stream.fetch_page()
+
+
+SCENARIOS = {
+    "tree_expansion": tree_expansion,
+    "table_selection": table_selection,
+    "ddl_generation": ddl_generation,
+    "result_loading": result_loading,
+}
@@ -1,2 +1,2 @@
-from .connection import get_connection
+from .connection import get_connection, get_pool, pooled_connection, close_all_pools
 from .init_db import init_db
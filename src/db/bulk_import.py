@@ -0,0 +1,340 @@
+import csv
+import io
+import json
+import os
+import queue
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import IO, Any, Callable, ContextManager, Iterator, Optional
+
+from db.objects_repo import get_table_columns
+from db.metadata_cache import conn_scope
+from db.result_cache import result_cache
+
+IMPORT_CHUNK_ROWS = 10_000
+IMPORT_WORKERS = 4
+# Líneas JSONL que se leen para armar el encabezado (unión de sus claves)
+JSONL_HEADER_SAMPLE = 1_000
+FORMATS = ("csv", "jsonl")
+
+
+@dataclass
+class ImportProgress:
+    rows_committed: int = 0
+    chunks_committed: int = 0
+    chunks_skipped: int = 0
+    elapsed: float = 0.0
+    done: bool = False
+
+    @property
+    def rows_per_sec(self) -> float:
+        return self.rows_committed / self.elapsed if self.elapsed > 0 else 0.0
+
+
+@dataclass
+class ImportCheckpoint:
+    """
+    Chunks ya confirmados de una importación, guardados junto al archivo
+    para poder reanudar si algo falla a mitad de camino.
+    """
+    path: str
+    signature: dict
+    committed: set = field(default_factory=set)
+
+    @classmethod
+    def load(cls, path: str, signature: dict) -> "ImportCheckpoint":
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            if data.get("signature") == signature:
+                return cls(path, signature, set(data.get("committed", [])))
+        except (OSError, ValueError):
+            pass
+        return cls(path, signature)
+
+    def save(self) -> None:
+        tmp = self.path + ".tmp"
+        try:
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump({"signature": self.signature, "committed": sorted(self.committed)}, f)
+            os.replace(tmp, self.path)
+        except OSError:
+            pass  # sin checkpoint no se puede reanudar, pero la importación sigue
+
+    def remove(self) -> None:
+        try:
+            os.remove(self.path)
+        except OSError:
+            pass
+
+
+def detect_format(path: str) -> str:
+    ext = os.path.splitext(path)[1].lower()
+    return "jsonl" if ext in (".jsonl", ".ndjson", ".json") else "csv"
+
+
+def _json_object(line: str, line_no: int) -> dict:
+    """
+    Retorna: la línea JSONL como dict; ValueError con el número de línea si no es un objeto JSON.
+    """
+    try:
+        obj = json.loads(line)
+    except ValueError as e:
+        raise ValueError(f"Línea {line_no}: JSON inválido ({e}).") from None
+    if not isinstance(obj, dict):
+        raise ValueError(f"Línea {line_no}: se esperaba un objeto JSON, no {type(obj).__name__}.")
+    return obj
+
+
+def _open_rows(
+    path: str,
+    fmt: str,
+    is_wanted: Optional[Callable[[str], bool]] = None,
+) -> tuple[IO[str], list[str], Iterator[list]]:
+    """
+    Retorna: (archivo abierto, encabezado, iterador de filas alineadas al encabezado)
+    En JSONL, una clave que no está en el encabezado y que is_wanted acepta (por defecto,
+    cualquiera) corta la lectura con ValueError. El llamador cierra el archivo.
+    """
+    if fmt == "jsonl":
+        f = open(path, "r", encoding="utf-8")
+        # Encabezado: unión de las claves de las primeras líneas, en orden de aparición
+        sample, header, known = [], [], set()
+        line_no = 0
+        for line in f:
+            line_no += 1
+            if not line.strip():
+                continue
+            obj = _json_object(line, line_no)
+            for k in obj:
+                if k not in known:
+                    known.add(k)
+                    header.append(k)
+            sample.append(obj)
+            if len(sample) >= JSONL_HEADER_SAMPLE:
+                break
+
+        def jsonl_rows():
+            for obj in sample:
+                yield [obj.get(c) for c in header]
+            n = line_no
+            for line in f:
+                n += 1
+                if line.strip():
+                    obj = _json_object(line, n)
+                    extra = [k for k in obj if k not in known and (is_wanted is None or is_wanted(k))]
+                    if extra:
+                        # Descartarlas en silencio perdería datos
+                        raise ValueError(
+                            f"Línea {n}: claves que no aparecen en las primeras {JSONL_HEADER_SAMPLE:,} "
+                            f"líneas: {', '.join(extra)}."
+                        )
+                    yield [obj.get(c) for c in header]
+
+        return f, header, jsonl_rows()
+
+    f = open(path, "r", encoding="utf-8-sig", newline="")
+    reader = csv.reader(f)
+    header = next(reader, [])
+    # En CSV el campo vacío se importa como NULL
+    return f, header, ([v if v != "" else None for v in r] for r in reader)
+
+
+def read_header(path: str, fmt: Optional[str] = None) -> list[str]:
+    f, header, _ = _open_rows(path, fmt or detect_format(path))
+    f.close()
+    return header
+
+
+def _target_column(fcol: str, table_columns: list[str], column_map: Optional[dict[str, str]]) -> Optional[str]:
+    if column_map:
+        target = column_map.get(fcol)
+    else:
+        target = next((c for c in table_columns if c.lower() == fcol.strip().lower()), None)
+    return target if target in table_columns else None
+
+
+def map_columns(
+    file_columns: list[str],
+    table_columns: list[str],
+    column_map: Optional[dict[str, str]] = None,
+) -> list[tuple[int, str]]:
+    """
+    Retorna: [(posición en el archivo, columna de la tabla), ...]
+    Sin column_map se empareja por nombre sin distinguir mayúsculas.
+    """
+    mapping = []
+    for pos, fcol in enumerate(file_columns):
+        target = _target_column(fcol, table_columns, column_map)
+        if target:
+            mapping.append((pos, target))
+    if not mapping:
+        raise ValueError("Ninguna columna del archivo coincide con las columnas de la tabla.")
+    return mapping
+
+
+def _csv_value(v: Any) -> str:
+    if v is None:
+        return ""
+    if isinstance(v, bool):
+        v = "true" if v else "false"
+    elif isinstance(v, (dict, list)):
+        v = json.dumps(v, ensure_ascii=False)
+    else:
+        v = str(v)
+    # Siempre entre comillas: así "" es string vacío y el campo vacío es NULL
+    return '"' + v.replace('"', '""') + '"'
+
+
+def _encode_chunk(rows: list[list], positions: list[int]) -> str:
+    out = []
+    for r in rows:
+        out.append(",".join(_csv_value(r[p] if p < len(r) else None) for p in positions))
+    out.append("")
+    return "\n".join(out)
+
+
+def _quote_ident(name: str) -> str:
+    return '"' + name.replace('"', '""') + '"'
+
+
+def import_file(
+    borrow: Callable[[], ContextManager[Any]],
+    schema: str,
+    table: str,
+    path: str,
+    fmt: Optional[str] = None,
+    column_map: Optional[dict[str, str]] = None,
+    chunk_rows: int = IMPORT_CHUNK_ROWS,
+    workers: int = IMPORT_WORKERS,
+    on_progress: Optional[Callable[[ImportProgress], None]] = None,
+    should_stop: Optional[Callable[[], bool]] = None,
+    resume: bool = True,
+) -> ImportProgress:
+    """
+    Carga un CSV o JSONL en schema.table con COPY ... FROM STDIN por chunks.
+    - borrow(): context manager que presta una conexión (p.ej. del pool); cada chunk
+      se escribe y confirma en su propia conexión, con `workers` chunks en paralelo.
+    - Los chunks confirmados se anotan en un checkpoint: si la importación falla,
+      volver a llamar con resume=True salta esos chunks.
+    on_progress se llama desde los hilos de trabajo.
+    """
+    fmt = fmt or detect_format(path)
+    if fmt not in FORMATS:
+        raise ValueError(f"Formato no soportado: {fmt}")
+
+    st = os.stat(path)
+    signature = {
+        "source": os.path.abspath(path),
+        "size": st.st_size,
+        "mtime": int(st.st_mtime),
+        "table": f"{schema}.{table}",
+        "chunk_rows": chunk_rows,
+    }
+    checkpoint = ImportCheckpoint.load(f"{path}.{schema}.{table}.import.json", signature)
+    if not resume:
+        checkpoint.committed.clear()
+
+    with borrow() as conn:
+        scope = conn_scope(conn)
+        table_columns = [r[0] for r in get_table_columns(conn, schema, table)]
+    if not table_columns:
+        raise ValueError(f"No se encontró la tabla {schema}.{table}.")
+
+    f, header, rows = _open_rows(
+        path, fmt, lambda k: _target_column(k, table_columns, column_map) is not None,
+    )
+    try:
+        mapping = map_columns(header, table_columns, column_map)
+    except ValueError:
+        f.close()
+        raise
+    positions = [p for p, _ in mapping]
+    copy_sql = (
+        f"COPY {_quote_ident(schema)}.{_quote_ident(table)} "
+        f"({', '.join(_quote_ident(c) for _, c in mapping)}) FROM STDIN WITH CSV"
+    )
+
+    progress = ImportProgress()
+    lock = threading.Lock()
+    errors: list[BaseException] = []
+    chunks: "queue.Queue[Optional[tuple[int, list]]]" = queue.Queue(maxsize=max(1, workers) * 2)
+    start = time.monotonic()
+
+    def stopped() -> bool:
+        return bool(errors) or bool(should_stop and should_stop())
+
+    def report():
+        progress.elapsed = time.monotonic() - start
+        if on_progress:
+            on_progress(progress)
+
+    def writer():
+        while True:
+            item = chunks.get()
+            if item is None:
+                return
+            idx, chunk = item
+            if stopped():
+                continue
+            try:
+                data = _encode_chunk(chunk, positions)
+                with borrow() as conn:
+                    with conn.cursor() as cur:
+                        cur.copy_expert(copy_sql, io.StringIO(data))
+                    conn.commit()
+            except BaseException as e:
+                with lock:
+                    errors.append(e)
+                continue
+            with lock:
+                checkpoint.committed.add(idx)
+                checkpoint.save()
+                progress.rows_committed += len(chunk)
+                progress.chunks_committed += 1
+                report()
+
+    threads = [threading.Thread(target=writer, daemon=True) for _ in range(max(1, workers))]
+    for t in threads:
+        t.start()
+
+    try:
+        idx = 0
+        chunk: list = []
+        for r in rows:
+            chunk.append(r)
+            if len(chunk) >= chunk_rows:
+                if stopped():
+                    break
+                if idx in checkpoint.committed:
+                    with lock:
+                        progress.chunks_skipped += 1
+                else:
+                    chunks.put((idx, chunk))
+                idx += 1
+                chunk = []
+        if chunk and not stopped():
+            if idx in checkpoint.committed:
+                with lock:
+                    progress.chunks_skipped += 1
+            else:
+                chunks.put((idx, chunk))
+    finally:
+        f.close()
+        for _ in threads:
+            chunks.put(None)
+        for t in threads:
+            t.join()
+        if progress.chunks_committed:
+            result_cache.invalidate_tables(scope, {table})
+
+    if errors:
+        raise errors[0]
+
+    with lock:
+        progress.done = not (should_stop and should_stop())
+        report()
+    if progress.done:
+        checkpoint.remove()
+    return progress
@@ -1,4 +1,9 @@
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
 import psycopg2
+from psycopg2 import extensions
 from typing import Optional, Dict, Any
 
 DB_HOST = "localhost"
@@ -7,6 +12,12 @@ DB_NAME = "mi_bd"
 DB_USER = "root"
 DB_SSLMODE = "disable"
 
+POOL_MIN_SIZE = 1
+POOL_MAX_SIZE = 4
+POOL_IDLE_TIMEOUT = 300.0        # segundos que una conexión libre puede quedar abierta
+POOL_HEALTH_CHECK_AFTER = 30.0   # se hace ping al sacar una conexión que lleva más de esto sin usarse
+POOL_ACQUIRE_TIMEOUT = 15.0
+
 
 def get_connection(
     host: str = DB_HOST,
@@ -18,7 +29,7 @@ def get_connection(
     default_db: bool = False,
     connect_timeout: int = 5,
 ):
-    
+
     dbname = "defaultdb" if default_db else database
 
     kwargs: Dict[str, Any] = {
@@ -35,3 +46,279 @@ def get_connection(
         kwargs["password"] = password
 
     return psycopg2.connect(**kwargs)
+
+
+class PoolTimeout(RuntimeError):
+    pass
+
+
+@dataclass(frozen=True)
+class PoolKey:
+    host: str
+    port: int
+    database: str
+    user: str
+    sslmode: str
+
+
+@dataclass
+class PoolStats:
+    hits: int = 0
+    misses: int = 0
+    waits: int = 0
+    wait_time: float = 0.0
+    created: int = 0
+    closed: int = 0
+    health_failures: int = 0
+
+
+class ConnectionPool:
+    """
+    Pool de conexiones para un mismo (host, port, database, user, sslmode).
+    - Reutiliza conexiones libres (LIFO) y crea nuevas hasta max_size.
+    - Cierra las libres que superan idle_timeout, conservando min_size.
+    - Al sacar una conexión verifica que siga viva (ping si estuvo inactiva).
+    """
+
+    def __init__(
+        self,
+        key: PoolKey,
+        password: Optional[str] = None,
+        min_size: int = POOL_MIN_SIZE,
+        max_size: int = POOL_MAX_SIZE,
+        idle_timeout: float = POOL_IDLE_TIMEOUT,
+        health_check_after: float = POOL_HEALTH_CHECK_AFTER,
+        acquire_timeout: float = POOL_ACQUIRE_TIMEOUT,
+        connect_timeout: int = 5,
+    ):
+        self.key = key
+        self.password = password
+        self.min_size = min_size
+        self.max_size = max(1, max_size)
+        self.idle_timeout = idle_timeout
+        self.health_check_after = health_check_after
+        self.acquire_timeout = acquire_timeout
+        self.connect_timeout = connect_timeout
+
+        self.stats = PoolStats()
+        self._idle: list[tuple[Any, float]] = []   # (conn, último uso)
+        self._in_use = 0
+        self._cond = threading.Condition()
+
+    def _connect(self):
+        conn = get_connection(
+            host=self.key.host, port=self.key.port, database=self.key.database,
+            user=self.key.user, password=self.password, sslmode=self.key.sslmode,
+            connect_timeout=self.connect_timeout,
+        )
+        with self._cond:
+            self.stats.created += 1
+        return conn
+
+    def _close(self, conn) -> None:
+        from db.prepared import forget as forget_prepared   # evita import circular con db/__init__
+        forget_prepared(conn)
+        try:
+            conn.close()
+        except Exception:
+            pass
+        with self._cond:
+            self.stats.closed += 1
+
+    def _is_healthy(self, conn, last_used: float) -> bool:
+        if conn.closed:
+            return False
+        try:
+            if conn.get_transaction_status() != extensions.TRANSACTION_STATUS_IDLE:
+                conn.rollback()
+            if time.monotonic() - last_used >= self.health_check_after:
+                with conn.cursor() as cur:
+                    cur.execute("SELECT 1;")
+                    cur.fetchone()
+                conn.rollback()
+            return True
+        except Exception:
+            return False
+
+    def _evict_idle_locked(self) -> list:
+        now = time.monotonic()
+        expired = []
+        keep = []
+        # _idle está ordenado del más viejo al más reciente
+        for conn, last_used in self._idle:
+            spare = len(self._idle) - len(expired) > self.min_size
+            if spare and now - last_used >= self.idle_timeout:
+                expired.append(conn)
+            else:
+                keep.append((conn, last_used))
+        self._idle = keep
+        return expired
+
+    def acquire(self, timeout: Optional[float] = None):
+        timeout = self.acquire_timeout if timeout is None else timeout
+        start = time.monotonic()
+
+        while True:
+            conn = None
+            last_used = 0.0
+            with self._cond:
+                expired = self._evict_idle_locked()
+                wait_start = None
+                while not self._idle and self._in_use >= self.max_size:
+                    remaining = timeout - (time.monotonic() - start)
+                    if remaining <= 0:
+                        raise PoolTimeout(
+                            f"No hay conexiones libres para {self.key.database} "
+                            f"(máximo {self.max_size})."
+                        )
+                    if wait_start is None:
+                        wait_start = time.monotonic()
+                        self.stats.waits += 1
+                    self._cond.wait(remaining)
+                if wait_start is not None:
+                    self.stats.wait_time += time.monotonic() - wait_start
+
+                if self._idle:
+                    conn, last_used = self._idle.pop()
+                self._in_use += 1
+
+            for old in expired:
+                self._close(old)
+
+            if conn is None:
+                try:
+                    conn = self._connect()
+                except Exception:
+                    with self._cond:
+                        self._in_use -= 1
+                        self._cond.notify()
+                    raise
+                with self._cond:
+                    self.stats.misses += 1
+                return conn
+
+            if self._is_healthy(conn, last_used):
+                with self._cond:
+                    self.stats.hits += 1
+                return conn
+
+            self._close(conn)
+            with self._cond:
+                self.stats.health_failures += 1
+                self._in_use -= 1
+                self._cond.notify()
+
+    def release(self, conn, discard: bool = False) -> None:
+        if not discard and not conn.closed:
+            try:
+                if conn.get_transaction_status() != extensions.TRANSACTION_STATUS_IDLE:
+                    conn.rollback()
+            except Exception:
+                discard = True
+
+        if discard or conn.closed:
+            self._close(conn)
+            with self._cond:
+                self._in_use -= 1
+                self._cond.notify()
+            return
+
+        with self._cond:
+            self._in_use -= 1
+            self._idle.append((conn, time.monotonic()))
+            self._cond.notify()
+
+    @contextmanager
+    def connection(self, timeout: Optional[float] = None):
+        conn = self.acquire(timeout)
+        try:
+            yield conn
+        finally:
+            self.release(conn)
+
+    def set_password(self, password: Optional[str]) -> None:
+        # Credenciales nuevas: las conexiones libres ya no sirven
+        with self._cond:
+            if password == self.password:
+                return
+            self.password = password
+            idle = [c for c, _ in self._idle]
+            self._idle = []
+        for conn in idle:
+            self._close(conn)
+
+    def ensure_capacity(self, max_size: int) -> None:
+        """
+        Sube max_size si hace falta (p.ej. para escritores en paralelo); nunca lo baja.
+        """
+        with self._cond:
+            if max_size > self.max_size:
+                self.max_size = max_size
+                self._cond.notify_all()
+
+    def close(self) -> None:
+        with self._cond:
+            idle = [c for c, _ in self._idle]
+            self._idle = []
+        for conn in idle:
+            self._close(conn)
+
+    def size(self) -> tuple[int, int]:
+        """
+        Retorna: (en_uso, libres)
+        """
+        with self._cond:
+            return self._in_use, len(self._idle)
+
+
+_pools: Dict[PoolKey, ConnectionPool] = {}
+_pools_lock = threading.Lock()
+
+
+def get_pool(
+    host: str = DB_HOST,
+    port: int = DB_PORT,
+    database: str = DB_NAME,
+    user: str = DB_USER,
+    password: Optional[str] = None,
+    sslmode: str = DB_SSLMODE,
+    **pool_kwargs,
+) -> ConnectionPool:
+    key = PoolKey(host=host, port=int(port), database=database, user=user, sslmode=sslmode)
+    with _pools_lock:
+        pool = _pools.get(key)
+        if pool is None:
+            pool = ConnectionPool(key, password=password, **pool_kwargs)
+            _pools[key] = pool
+            return pool
+    pool.set_password(password)
+    return pool
+
+
+def pooled_connection(
+    host: str = DB_HOST,
+    port: int = DB_PORT,
+    database: str = DB_NAME,
+    user: str = DB_USER,
+    password: Optional[str] = None,
+    sslmode: str = DB_SSLMODE,
+):
+    """
+    Uso: with pooled_connection(host=..., database=...) as conn: ...
+    """
+    pool = get_pool(host=host, port=port, database=database, user=user, password=password, sslmode=sslmode)
+    return pool.connection()
+
+
+def pool_stats() -> Dict[PoolKey, PoolStats]:
+    with _pools_lock:
+        pools = list(_pools.values())
+    return {p.key: p.stats for p in pools}
+
+
+def close_all_pools() -> None:
+    with _pools_lock:
+        pools = list(_pools.values())
+        _pools.clear()
+    for p in pools:
+        p.close()
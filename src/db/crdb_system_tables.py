@@ -132,6 +132,17 @@ WHERE c.relkind = 'v'
 ORDER BY c.relname;
 """
 
+LIST_VIEW_NAMES = """
+SELECT DISTINCT c.relname AS view_name
+FROM pg_catalog.pg_class c
+INNER JOIN pg_catalog.pg_namespace n
+  ON n.oid = c.relnamespace
+WHERE c.relkind = 'v'
+  AND n.nspname NOT LIKE 'pg_%'
+  AND n.nspname <> 'information_schema'
+  AND n.nspname <> 'crdb_internal';
+"""
+
 LIST_INDEXES_BY_SCHEMA = """
 SELECT
   ns.nspname  AS schema_name,
@@ -178,4 +189,403 @@ INNER JOIN pg_catalog.pg_namespace n
   ON n.oid = t.typnamespace
 WHERE n.nspname = %s
 ORDER BY t.typname;
-"""
\ No newline at end of file
+"""
+
+# Una sola consulta con toda la metadata de una tabla; cada fila indica su tipo en "kind":
+#   column:     ord=attnum, name=columna, v1=tipo, v2=not null, v3=default
+#   constraint: ord=posición en la clave, name=constraint, v1=contype (p/u), v2=columna
+#   index:      name=índice, v1=primario, v2=único, v3=definición
+#   fk:         ord=posición en la clave, name=fk, v1=columna, v2=schema ref, v3=tabla ref, v4=columna ref
+DESCRIBE_TABLE = """
+WITH tbl AS (
+    SELECT c.oid
+    FROM pg_catalog.pg_class c
+    INNER JOIN pg_catalog.pg_namespace n
+        ON n.oid = c.relnamespace
+    WHERE n.nspname = %s
+      AND c.relname = %s
+)
+SELECT
+    'column' AS kind,
+    a.attnum::INT8 AS ord,
+    a.attname::STRING AS name,
+    pg_catalog.format_type(a.atttypid, a.atttypmod)::STRING AS v1,
+    a.attnotnull::STRING AS v2,
+    pg_catalog.pg_get_expr(d.adbin, d.adrelid)::STRING AS v3,
+    NULL::STRING AS v4
+FROM tbl
+INNER JOIN pg_catalog.pg_attribute a
+    ON a.attrelid = tbl.oid
+LEFT JOIN pg_catalog.pg_attrdef d
+    ON d.adrelid = a.attrelid
+   AND d.adnum = a.attnum
+WHERE a.attnum > 0
+  AND NOT a.attisdropped
+UNION ALL
+SELECT
+    'constraint',
+    array_position(con.conkey, a.attnum)::INT8,
+    con.conname::STRING,
+    con.contype::STRING,
+    a.attname::STRING,
+    NULL::STRING,
+    NULL::STRING
+FROM tbl
+INNER JOIN pg_catalog.pg_constraint con
+    ON con.conrelid = tbl.oid
+INNER JOIN pg_catalog.pg_attribute a
+    ON a.attrelid = tbl.oid
+   AND a.attnum = ANY(con.conkey)
+WHERE con.contype IN ('p', 'u')
+UNION ALL
+SELECT
+    'index',
+    0::INT8,
+    idx.relname::STRING,
+    ix.indisprimary::STRING,
+    ix.indisunique::STRING,
+    pg_catalog.pg_get_indexdef(ix.indexrelid)::STRING,
+    NULL::STRING
+FROM tbl
+INNER JOIN pg_catalog.pg_index ix
+    ON ix.indrelid = tbl.oid
+INNER JOIN pg_catalog.pg_class idx
+    ON idx.oid = ix.indexrelid
+UNION ALL
+SELECT
+    'fk',
+    array_position(con.conkey, src_col.attnum)::INT8,
+    con.conname::STRING,
+    src_col.attname::STRING,
+    ref_nsp.nspname::STRING,
+    ref_rel.relname::STRING,
+    ref_col.attname::STRING
+FROM tbl
+INNER JOIN pg_catalog.pg_constraint con
+    ON con.conrelid = tbl.oid
+INNER JOIN pg_catalog.pg_class ref_rel
+    ON ref_rel.oid = con.confrelid
+INNER JOIN pg_catalog.pg_namespace ref_nsp
+    ON ref_nsp.oid = ref_rel.relnamespace
+INNER JOIN pg_catalog.pg_attribute src_col
+    ON src_col.attrelid = tbl.oid
+   AND src_col.attnum = ANY(con.conkey)
+INNER JOIN pg_catalog.pg_attribute ref_col
+    ON ref_col.attrelid = ref_rel.oid
+   AND ref_col.attnum = ANY(con.confkey)
+WHERE con.contype = 'f'
+  AND array_position(con.conkey, src_col.attnum) = array_position(con.confkey, ref_col.attnum);
+"""
+
+# Snapshot de un schema completo: unas pocas consultas por conjunto en lugar de una por tabla.
+SNAPSHOT_RELATIONS = """
+SELECT
+    c.oid,
+    c.relname AS relation_name,
+    c.relkind,
+    CASE c.relkind
+        WHEN 'v' THEN pg_catalog.pg_get_viewdef(c.oid)
+        WHEN 'S' THEN 'INCREMENT ' || s.seqincrement::TEXT || ' MINVALUE ' || s.seqmin::TEXT
+            || ' MAXVALUE ' || s.seqmax::TEXT || ' START ' || s.seqstart::TEXT || ' CACHE ' || s.seqcache::TEXT
+    END AS definition
+FROM pg_catalog.pg_class c
+INNER JOIN pg_catalog.pg_namespace n
+    ON n.oid = c.relnamespace
+LEFT JOIN pg_catalog.pg_sequence s
+    ON s.seqrelid = c.oid
+WHERE n.nspname = %s
+  AND c.relkind IN ('r', 'v', 'S')
+ORDER BY c.relname;
+"""
+
+SNAPSHOT_COLUMNS = """
+SELECT
+    a.attrelid,
+    a.attname AS column_name,
+    pg_catalog.format_type(a.atttypid, a.atttypmod) AS data_type,
+    a.attnotnull AS not_null,
+    pg_catalog.pg_get_expr(d.adbin, d.adrelid) AS default_expr
+FROM pg_catalog.pg_attribute a
+INNER JOIN pg_catalog.pg_class c
+    ON c.oid = a.attrelid
+INNER JOIN pg_catalog.pg_namespace n
+    ON n.oid = c.relnamespace
+LEFT JOIN pg_catalog.pg_attrdef d
+    ON d.adrelid = a.attrelid
+   AND d.adnum = a.attnum
+WHERE n.nspname = %s
+  AND c.relkind IN ('r', 'v')
+  AND a.attnum > 0
+  AND NOT a.attisdropped
+ORDER BY a.attrelid, a.attnum;
+"""
+
+SNAPSHOT_CONSTRAINTS = """
+SELECT
+    con.conrelid,
+    con.conname AS constraint_name,
+    con.contype,
+    a.attname AS column_name
+FROM pg_catalog.pg_constraint con
+INNER JOIN pg_catalog.pg_class rel
+    ON rel.oid = con.conrelid
+INNER JOIN pg_catalog.pg_namespace nsp
+    ON nsp.oid = rel.relnamespace
+INNER JOIN pg_catalog.pg_attribute a
+    ON a.attrelid = rel.oid
+   AND a.attnum = ANY(con.conkey)
+WHERE con.contype IN ('p', 'u')
+  AND nsp.nspname = %s
+ORDER BY con.conrelid, con.conname, array_position(con.conkey, a.attnum);
+"""
+
+SNAPSHOT_FOREIGN_KEYS = """
+SELECT
+    con.conrelid,
+    con.conname AS fk_name,
+    src_col.attname AS column_name,
+    ref_nsp.nspname AS ref_schema,
+    ref_rel.relname AS ref_table,
+    ref_col.attname AS ref_column
+FROM pg_catalog.pg_constraint con
+INNER JOIN pg_catalog.pg_class src_rel
+    ON src_rel.oid = con.conrelid
+INNER JOIN pg_catalog.pg_namespace src_nsp
+    ON src_nsp.oid = src_rel.relnamespace
+INNER JOIN pg_catalog.pg_class ref_rel
+    ON ref_rel.oid = con.confrelid
+INNER JOIN pg_catalog.pg_namespace ref_nsp
+    ON ref_nsp.oid = ref_rel.relnamespace
+INNER JOIN pg_catalog.pg_attribute src_col
+    ON src_col.attrelid = src_rel.oid
+   AND src_col.attnum = ANY(con.conkey)
+INNER JOIN pg_catalog.pg_attribute ref_col
+    ON ref_col.attrelid = ref_rel.oid
+   AND ref_col.attnum = ANY(con.confkey)
+WHERE con.contype = 'f'
+  AND src_nsp.nspname = %s
+  AND array_position(con.conkey, src_col.attnum) = array_position(con.confkey, ref_col.attnum)
+ORDER BY con.conrelid, con.conname, array_position(con.conkey, src_col.attnum);
+"""
+
+SNAPSHOT_INDEXES = """
+SELECT
+    ix.indrelid,
+    idx.relname AS index_name,
+    ix.indisprimary AS is_primary,
+    ix.indisunique  AS is_unique,
+    pg_catalog.pg_get_indexdef(ix.indexrelid) AS index_def
+FROM pg_catalog.pg_index ix
+INNER JOIN pg_catalog.pg_class tbl
+    ON tbl.oid = ix.indrelid
+INNER JOIN pg_catalog.pg_namespace nsp
+    ON nsp.oid = tbl.relnamespace
+INNER JOIN pg_catalog.pg_class idx
+    ON idx.oid = ix.indexrelid
+WHERE nsp.nspname = %s
+ORDER BY ix.indrelid, ix.indisprimary DESC, ix.indisunique DESC, idx.relname;
+"""
+
+# Estadísticas de sentencias por fingerprint y bucket de agregación (aggregated_ts).
+# Parámetros: (desde_ts o NULL, ventana_en_segundos si desde_ts es NULL)
+STATEMENT_STATISTICS_SINCE = """
+SELECT
+    encode(fingerprint_id, 'hex') AS fingerprint,
+    max(metadata->>'query') AS query,
+    max(metadata->>'db') AS database_name,
+    aggregated_ts,
+    sum((statistics->'statistics'->>'cnt')::INT8) AS exec_count,
+    sum((statistics->'statistics'->>'cnt')::FLOAT8
+        * (statistics->'statistics'->'svcLat'->>'mean')::FLOAT8) AS total_latency,
+    sum((statistics->'statistics'->>'cnt')::FLOAT8
+        * COALESCE((statistics->'statistics'->'rowsRead'->>'mean')::FLOAT8, 0)) AS rows_read,
+    sum(COALESCE((statistics->'execution_statistics'->>'cnt')::FLOAT8, 0)
+        * COALESCE((statistics->'execution_statistics'->'contentionTime'->>'mean')::FLOAT8, 0)) AS contention_time
+FROM crdb_internal.statement_statistics
+WHERE aggregated_ts >= COALESCE(%s::TIMESTAMPTZ, now() - %s * INTERVAL '1 second')
+GROUP BY fingerprint_id, aggregated_ts;
+"""
+
+# Alternativa para versiones/usuarios sin statement_statistics: acumulados en memoria de cada nodo
+NODE_STATEMENT_STATISTICS = """
+SELECT
+    statement_id AS fingerprint,
+    max(key) AS query,
+    max(database_name) AS database_name,
+    sum(count) AS exec_count,
+    sum(count * service_lat_avg) AS total_latency,
+    sum(count * rows_read_avg) AS rows_read,
+    sum(count * COALESCE(contention_time_avg, 0)) AS contention_time
+FROM crdb_internal.node_statement_statistics
+GROUP BY statement_id;
+"""
+
+# Todos los objetos navegables de la base (para el índice de búsqueda), en una sola consulta.
+# kind: table | view | sequence | index | function | type; parent: tabla del índice
+SEARCH_ALL_OBJECTS = """
+WITH sch AS (
+    SELECT n.oid, n.nspname
+    FROM pg_catalog.pg_namespace n
+    WHERE n.nspname NOT LIKE 'pg_%'
+      AND n.nspname <> 'information_schema'
+      AND n.nspname <> 'crdb_internal'
+)
+SELECT
+    sch.nspname AS schema_name,
+    CASE c.relkind WHEN 'r' THEN 'table' WHEN 'v' THEN 'view' ELSE 'sequence' END AS kind,
+    c.relname::STRING AS name,
+    NULL::STRING AS parent
+FROM pg_catalog.pg_class c
+INNER JOIN sch
+    ON sch.oid = c.relnamespace
+WHERE c.relkind IN ('r', 'v', 'S')
+UNION ALL
+SELECT sch.nspname, 'index', i.relname::STRING, t.relname::STRING
+FROM pg_catalog.pg_index ix
+INNER JOIN pg_catalog.pg_class t
+    ON t.oid = ix.indrelid
+INNER JOIN pg_catalog.pg_class i
+    ON i.oid = ix.indexrelid
+INNER JOIN sch
+    ON sch.oid = t.relnamespace
+UNION ALL
+SELECT sch.nspname, 'function', p.proname::STRING, NULL::STRING
+FROM pg_catalog.pg_proc p
+INNER JOIN sch
+    ON sch.oid = p.pronamespace
+UNION ALL
+SELECT sch.nspname, 'type', ty.typname::STRING, NULL::STRING
+FROM pg_catalog.pg_type ty
+INNER JOIN sch
+    ON sch.oid = ty.typnamespace;
+"""
+
+# Páginas de las carpetas del árbol (keyset por nombre). Parámetros comunes al final:
+#   ... , patrón ILIKE ('%' = sin filtro), límite
+PAGE_RELATIONS_BY_SCHEMA = """
+SELECT c.relname::STRING AS name
+FROM pg_catalog.pg_class c
+INNER JOIN pg_catalog.pg_namespace n
+  ON n.oid = c.relnamespace
+WHERE n.nspname = %s
+  AND c.relkind = %s
+  AND c.relname::STRING > %s
+  AND c.relname::STRING ILIKE %s
+ORDER BY c.relname
+LIMIT %s;
+"""
+
+PAGE_TYPES_BY_SCHEMA = """
+SELECT t.typname::STRING AS name
+FROM pg_catalog.pg_type t
+INNER JOIN pg_catalog.pg_namespace n
+  ON n.oid = t.typnamespace
+WHERE n.nspname = %s
+  AND t.typname::STRING > %s
+  AND t.typname::STRING ILIKE %s
+ORDER BY t.typname
+LIMIT %s;
+"""
+
+# Las funciones pueden repetir nombre (sobrecargas): keyset por (nombre, oid)
+PAGE_FUNCTIONS_BY_SCHEMA = """
+SELECT p.proname::STRING AS name, p.oid::INT8 AS oid
+FROM pg_catalog.pg_proc p
+INNER JOIN pg_catalog.pg_namespace n
+  ON n.oid = p.pronamespace
+WHERE n.nspname = %s
+  AND (p.proname::STRING, p.oid::INT8) > (%s::STRING, %s::INT8)
+  AND p.proname::STRING ILIKE %s
+ORDER BY p.proname, p.oid
+LIMIT %s;
+"""
+
+# Keyset por (tabla, índice); el filtro aplica a cualquiera de los dos nombres
+PAGE_INDEXES_BY_SCHEMA = """
+SELECT t.relname::STRING AS table_name, i.relname::STRING AS index_name
+FROM pg_catalog.pg_index ix
+INNER JOIN pg_catalog.pg_class t
+  ON t.oid = ix.indrelid
+INNER JOIN pg_catalog.pg_class i
+  ON i.oid = ix.indexrelid
+INNER JOIN pg_catalog.pg_namespace ns
+  ON ns.oid = t.relnamespace
+WHERE ns.nspname = %s
+  AND (t.relname::STRING, i.relname::STRING) > (%s::STRING, %s::STRING)
+  AND (t.relname::STRING ILIKE %s OR i.relname::STRING ILIKE %s)
+ORDER BY t.relname, i.relname
+LIMIT %s;
+"""
+
+# Estadísticas baratas de una tabla (sin count(*)). Parámetro: nombre calificado ya entrecomillado
+TABLE_ROW_STATISTICS = """
+SELECT estimated_row_count
+FROM crdb_internal.table_row_statistics
+WHERE table_id = %s::REGCLASS::OID::INT8;
+"""
+
+# SHOW no acepta parámetros: {table} es el nombre calificado ya entrecomillado
+TABLE_LATEST_STATISTICS = """
+SELECT created, row_count
+FROM [SHOW STATISTICS FOR TABLE {table}]
+ORDER BY created DESC
+LIMIT 1;
+"""
+
+# v23.1+: span_stats trae los MVCCStats de cada rango (live_bytes) y range_size el total
+TABLE_SPAN_STATS = """
+SELECT
+    count(*) AS range_count,
+    sum((span_stats->>'live_bytes')::INT8) AS live_bytes,
+    sum(range_size)::INT8 AS total_bytes
+FROM [SHOW RANGES FROM TABLE {table} WITH DETAILS];
+"""
+
+# Versiones anteriores: solo la cantidad de rangos
+TABLE_RANGE_COUNT = """
+SELECT count(*) AS range_count
+FROM [SHOW RANGES FROM TABLE {table}];
+"""
+
+# Lo mismo que SHOW CREATE ALL TABLES, pero filtrable por schema y con las FKs aparte
+# (create_nofks + alter_statements). Parámetros: schema o NULL (dos veces)
+CREATE_STATEMENTS_ALL = """
+SELECT
+    schema_name,
+    descriptor_name,
+    descriptor_type,
+    descriptor_id,
+    create_statement,
+    create_nofks,
+    alter_statements,
+    validate_statements
+FROM crdb_internal.create_statements
+WHERE database_name = current_database()
+  AND (%s::STRING IS NULL OR schema_name = %s)
+  AND schema_name NOT IN ('pg_catalog', 'information_schema', 'crdb_internal', 'pg_extension')
+ORDER BY descriptor_id;
+"""
+
+# Lo mismo que SHOW CREATE ALL TYPES. Parámetros: schema o NULL (dos veces)
+CREATE_TYPE_STATEMENTS_ALL = """
+SELECT schema_name, descriptor_name, descriptor_id, create_statement
+FROM crdb_internal.create_type_statements
+WHERE database_name = current_database()
+  AND (%s::STRING IS NULL OR schema_name = %s)
+ORDER BY descriptor_id;
+"""
+
+# Aristas FK (tabla -> tabla referenciada) de la base actual
+FOREIGN_KEY_EDGES = """
+SELECT
+    n.nspname AS schema_name,
+    c.relname AS table_name,
+    rn.nspname AS ref_schema,
+    rc.relname AS ref_table
+FROM pg_catalog.pg_constraint con
+JOIN pg_catalog.pg_class c ON c.oid = con.conrelid
+JOIN pg_catalog.pg_namespace n ON n.oid = c.relnamespace
+JOIN pg_catalog.pg_class rc ON rc.oid = con.confrelid
+JOIN pg_catalog.pg_namespace rn ON rn.oid = rc.relnamespace
+WHERE con.contype = 'f';
+"""
@@ -0,0 +1,203 @@
+import heapq
+import os
+import time
+from dataclasses import dataclass, field
+from typing import Callable, Iterable, Optional
+from psycopg2.extensions import connection as PGConnection
+from psycopg2 import Error as PsycopgError
+
+from db.execute import fetch_all
+from db.objects_repo import list_schemas
+from db.table_browser import quote_ident
+from db.crdb_system_tables import (
+    CREATE_STATEMENTS_ALL,
+    CREATE_TYPE_STATEMENTS_ALL,
+    FOREIGN_KEY_EDGES,
+)
+
+
+@dataclass
+class DdlObject:
+    schema: str
+    name: str
+    kind: str                     # type | sequence | table | view
+    id: int
+    create: str
+    create_nofks: str = ""
+    alters: list[str] = field(default_factory=list)      # ADD CONSTRAINT ... FOREIGN KEY
+    validates: list[str] = field(default_factory=list)
+
+    @property
+    def key(self) -> tuple[str, str]:
+        return self.schema, self.name
+
+
+@dataclass
+class DdlExportProgress:
+    objects: int = 0
+    total: int = 0
+    elapsed: float = 0.0
+    cancelled: bool = False
+
+
+def fetch_ddl_objects(conn: PGConnection, schema: Optional[str] = None) -> list[DdlObject]:
+    """
+    Todas las definiciones de la base actual (o de un schema) en dos consultas,
+    en lugar de un SHOW CREATE por objeto.
+    """
+    objects = []
+    try:
+        _, rows = fetch_all(conn, CREATE_TYPE_STATEMENTS_ALL, (schema, schema))
+        for sch, name, oid, create in rows:
+            objects.append(DdlObject(sch, name, "type", int(oid), create))
+    except PsycopgError:
+        # Versiones sin tipos definidos por el usuario
+        conn.rollback()
+
+    _, rows = fetch_all(conn, CREATE_STATEMENTS_ALL, (schema, schema))
+    for sch, name, kind, oid, create, nofks, alters, validates in rows:
+        objects.append(DdlObject(
+            sch, name, kind, int(oid), create,
+            create_nofks=nofks or create,
+            alters=list(alters or []),
+            validates=list(validates or []),
+        ))
+    conn.rollback()
+    return objects
+
+
+def fetch_fk_edges(conn: PGConnection) -> list[tuple[tuple[str, str], tuple[str, str]]]:
+    """
+    Retorna: [((schema, tabla), (schema_ref, tabla_ref)), ...]
+    """
+    _, rows = fetch_all(conn, FOREIGN_KEY_EDGES)
+    conn.rollback()
+    return [((s, t), (rs, rt)) for s, t, rs, rt in rows]
+
+
+def order_tables(tables: list[DdlObject], edges) -> tuple[list[DdlObject], set[tuple[str, str]]]:
+    """
+    Orden topológico por FKs: cada tabla después de las que referencia (a igualdad, por id).
+    Retorna: (tablas ordenadas, claves de las tablas que necesitan las FKs al final)
+    Van al final las FKs de ciclos y las que referencian tablas fuera de la exportación.
+    """
+    by_key = {t.key: t for t in tables}
+    deps: dict[tuple, set] = {k: set() for k in by_key}
+    deferred: set = set()
+    for src, ref in edges:
+        if src not in by_key or src == ref:
+            continue
+        if ref not in by_key:
+            deferred.add(src)
+            continue
+        deps[src].add(ref)
+
+    users: dict[tuple, list] = {k: [] for k in by_key}
+    for k, refs in deps.items():
+        for r in refs:
+            users[r].append(k)
+
+    pending = {k: len(refs) for k, refs in deps.items()}
+    ready = [(by_key[k].id, k) for k, n in pending.items() if n == 0]
+    heapq.heapify(ready)
+    ordered = []
+    while ready:
+        _, k = heapq.heappop(ready)
+        ordered.append(k)
+        for u in users[k]:
+            pending[u] -= 1
+            if pending[u] == 0:
+                heapq.heappush(ready, (by_key[u].id, u))
+
+    # Lo que quedó sin ordenar está en un ciclo (o depende de uno): se crean sin FKs
+    done = set(ordered)
+    cyclic = sorted((k for k in by_key if k not in done), key=lambda k: by_key[k].id)
+    deferred.update(cyclic)
+    return [by_key[k] for k in ordered + cyclic], deferred
+
+
+def build_ddl_script(objects: list[DdlObject], edges, schemas: Iterable[str] = ()) -> list[tuple[str, str]]:
+    """
+    Retorna: [(comentario, sentencia), ...] en un orden que se puede ejecutar tal cual:
+    schemas, tipos, secuencias, tablas por FKs, vistas (por id: una vista solo puede usar
+    objetos que ya existían), y al final las FKs diferidas con sus VALIDATE.
+    schemas: se crean además de los que tienen objetos (p.ej. schemas vacíos).
+    """
+    kinds: dict[str, list[DdlObject]] = {"type": [], "sequence": [], "table": [], "view": []}
+    for o in objects:
+        kinds.setdefault(o.kind, []).append(o)
+
+    script = []
+    for sch in sorted(({o.schema for o in objects} | set(schemas)) - {"public"}):
+        script.append((f"schema {sch}", f"CREATE SCHEMA IF NOT EXISTS {quote_ident(sch)}"))
+    for o in kinds["type"] + kinds["sequence"]:
+        script.append((f"{o.kind} {o.schema}.{o.name}", o.create))
+
+    tables, deferred = order_tables(kinds["table"], edges)
+    late = []
+    for o in tables:
+        if o.key in deferred:
+            script.append((f"table {o.schema}.{o.name} (FKs al final)", o.create_nofks))
+            late.append(o)
+        else:
+            script.append((f"table {o.schema}.{o.name}", o.create))
+
+    for o in sorted(kinds["view"], key=lambda v: v.id):
+        script.append((f"view {o.schema}.{o.name}", o.create))
+
+    for o in late:
+        for stmt in o.alters:
+            script.append(("", stmt))
+    for o in late:
+        for stmt in o.validates:
+            script.append(("", stmt))
+    return script
+
+
+def export_ddl(
+    conn: PGConnection,
+    path: str,
+    schema: Optional[str] = None,
+    on_progress: Optional[Callable[[DdlExportProgress], None]] = None,
+    should_stop: Optional[Callable[[], bool]] = None,
+) -> DdlExportProgress:
+    """
+    Escribe en path el DDL de la base actual (o de un schema) ordenado por dependencias.
+    Son tres consultas en total, sin importar cuántos objetos haya.
+    Si se cancela (should_stop) el archivo parcial se borra.
+    """
+    progress = DdlExportProgress()
+    start = time.monotonic()
+
+    objects = fetch_ddl_objects(conn, schema)
+    # Antes de fetch_fk_edges, para compartir su transacción (incluye los schemas vacíos)
+    schemas = [schema] if schema else list_schemas(conn)
+    script = build_ddl_script(objects, fetch_fk_edges(conn), schemas)
+    progress.total = sum(1 for comment, _ in script if comment)
+
+    ok = False
+    try:
+        with open(path, "w", encoding="utf-8") as f:
+            scope = f"schema {schema}" if schema else "base completa"
+            f.write(f"-- DDL exportado ({scope}): {len(objects)} objetos\n\n")
+            for comment, stmt in script:
+                if should_stop and should_stop():
+                    progress.cancelled = True
+                    break
+                if comment:
+                    f.write(f"-- {comment}\n")
+                    progress.objects += 1
+                f.write(stmt.rstrip().rstrip(";") + ";\n\n")
+                progress.elapsed = time.monotonic() - start
+                if on_progress:
+                    on_progress(progress)
+        ok = not progress.cancelled
+    finally:
+        if not ok:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+    progress.elapsed = time.monotonic() - start
+    return progress
@@ -1,36 +1,39 @@
 from psycopg2.extensions import connection as PGConnection
-from db.objects_repo import get_table_columns, get_primary_key_columns, get_unique_constraints, get_foreign_keys
+from db.objects_repo import describe_table
+from models.table_descriptor import TableDescriptor
 from db.execute import fetch_all
 
 def get_create_table_ddl(conn: PGConnection, schema: str, table: str) -> str:
-    columns = get_table_columns(conn, schema, table)
-    pk_cols = get_primary_key_columns(conn, schema, table)
-    uniques = get_unique_constraints(conn, schema, table)
+    return build_create_table_ddl(describe_table(conn, schema, table))
 
-    if not columns:
+def build_create_table_ddl(desc: TableDescriptor) -> str:
+    schema = desc.schema
+    table = desc.name
+
+    if not desc.columns:
         return f"-- No se encontraron columnas para {schema}.{table}"
 
     lines = []
-    for name, dtype, notnull in columns:
-        line = f'    "{name}" {dtype}'
-        if notnull:
+    for col in desc.columns:
+        line = f'    "{col.name}" {col.data_type}'
+        if col.not_null:
             line += " NOT NULL"
         lines.append(line)
 
-    if pk_cols:
-        pk_list = ", ".join([f'"{c}"' for c in pk_cols])
+    if desc.primary_key:
+        pk_list = ", ".join([f'"{c}"' for c in desc.primary_key])
         lines.append(f"    PRIMARY KEY ({pk_list})")
 
-    for cname, ucols in uniques:
+    for cname, ucols in desc.uniques:
         col_list = ", ".join([f'"{c}"' for c in ucols])
         lines.append(f'    CONSTRAINT "{cname}" UNIQUE ({col_list})')
 
-    fks = get_foreign_keys(conn, schema, table)
-
-    for fk_name, col, ref_schema, ref_table, ref_col in fks:
+    for fname, (fcols, ref_schema, ref_table, ref_cols) in desc.grouped_foreign_keys().items():
+        col_list = ", ".join([f'"{c}"' for c in fcols])
+        ref_list = ", ".join([f'"{c}"' for c in ref_cols])
         lines.append(
-            f'    CONSTRAINT "{fk_name}" FOREIGN KEY ("{col}") '
-            f'REFERENCES "{ref_schema}"."{ref_table}" ("{ref_col}")'
+            f'    CONSTRAINT "{fname}" FOREIGN KEY ({col_list}) '
+            f'REFERENCES "{ref_schema}"."{ref_table}" ({ref_list})'
         )
 
     columns_sql = ",\n".join(lines)
@@ -1,24 +1,180 @@
-from typing import Any, Iterable, Optional, Tuple, List, Dict
+import itertools
+import re
+import time
+from typing import Any, Callable, Iterable, Iterator, Optional, Tuple, List, Dict
 from psycopg2.extensions import connection as PGConnection
 from psycopg2 import Error as PsycopgError
 
+from db.metadata_cache import invalidate_for_sql, strip_leading_comments
+from db.script_runner import split_statements, run_script
+from db.instrumentation import query_label, record_call
+from db.prepared import execute_prepared
+from db.result_cache import (
+    RESULT_CACHE_TTL,
+    RESULT_MAX_ENTRY_SHARE,
+    result_cache,
+    result_size,
+    is_cacheable,
+    referenced_tables,
+    invalidate_results_for_sql,
+)
+
+
+# Consultas que se leen con un cursor del servidor (DECLARE ... CURSOR FOR)
+_QUERY_RE = re.compile(r"^[(\s]*(SELECT|WITH|VALUES|TABLE|SHOW)\b", re.IGNORECASE)
+
 
 def is_select(sql: str) -> bool:
-    s = (sql or "").strip().lower()
-    return s.startswith("select") or s.startswith("with")
+    """
+    Ignora los comentarios y espacios del principio ("-- reporte\nSELECT ..." también es consulta).
+    """
+    return bool(_QUERY_RE.match(strip_leading_comments(sql)))
+
+
+def _cursor_sql(sql: str) -> str:
+    """
+    Retorna: el texto para DECLARE; los SHOW van como fuente de datos de un SELECT,
+    porque DECLARE solo acepta consultas.
+    """
+    text = strip_leading_comments(sql).rstrip().rstrip(";")
+    m = _QUERY_RE.match(text)
+    if m and m.group(1).upper() == "SHOW":
+        # El salto de línea deja el ] fuera de un posible comentario final
+        return f"SELECT * FROM [{text}\n]"
+    return text
+
+
+STREAM_PAGE_SIZE = 500
+
+_stream_ids = itertools.count(1)
+
+
+class QueryStream:
+    """
+    Resultado de una consulta leído por páginas desde un cursor del servidor
+    (DECLARE ... CURSOR + FETCH), sin traer todo a memoria.
+    Mantiene abierta la transacción de la conexión hasta agotarse o cerrarse.
+    """
+
+    def __init__(
+        self,
+        conn: PGConnection,
+        sql: str,
+        params: Optional[Iterable[Any]] = None,
+        page_size: int = STREAM_PAGE_SIZE,
+    ):
+        self.conn = conn
+        self.page_size = page_size
+        self.columns: List[str] = []
+        self.description: Optional[list] = None    # cursor.description (tipos del servidor)
+        self.fetched = 0
+        self.exhausted = False
+        self.label = "FETCH " + query_label(sql)
+        self._collected: Optional[List[tuple]] = None
+        self._collect_limit = 0
+        self._collected_bytes = 0
+        self._on_complete: Optional[Callable[[List[str], List[tuple]], None]] = None
+
+        self._cur = conn.cursor(name=f"dmt_stream_{next(_stream_ids)}")
+        self._cur.itersize = page_size
+        try:
+            self._cur.execute(_cursor_sql(sql), params)
+        except PsycopgError:
+            self._cur = None
+            self.exhausted = True
+            conn.rollback()
+            raise
+
+    def fetch_page(self) -> List[tuple]:
+        if self.exhausted:
+            return []
+        started = time.monotonic()
+        try:
+            rows = self._cur.fetchmany(self.page_size)
+        except PsycopgError as e:
+            record_call("fetch_page", self.label, started, self.conn, error=e)
+            self.close(failed=True)
+            raise
+        record_call("fetch_page", self.label, started, self.conn, rows=rows)
+
+        if not self.columns and self._cur.description:
+            self.description = list(self._cur.description)
+            self.columns = [d[0] for d in self.description]
+        self.fetched += len(rows)
+        self._collect_page(rows)
+
+        if len(rows) < self.page_size:
+            # Se leyó todo el resultado
+            if self._on_complete is not None and self._collected is not None:
+                self._on_complete(self.columns, self._collected)
+            self.close()
+        return rows
+
+    def collect(self, on_complete: Callable[[List[str], List[tuple]], None], max_bytes: int, first_page: List[tuple] = ()) -> None:
+        """
+        Guarda las páginas leídas (hasta max_bytes estimados) y, si el cursor llega al final,
+        llama on_complete(columns, rows) con el resultado completo. Lo usa la caché de resultados.
+        """
+        self._collected = []
+        self._collect_limit = max_bytes
+        self._collected_bytes = 0
+        self._on_complete = on_complete
+        self._collect_page(list(first_page))
+
+    def _collect_page(self, rows: List[tuple]) -> None:
+        if self._collected is None:
+            return
+        self._collected_bytes += result_size(rows)
+        if self._collected_bytes > self._collect_limit:
+            self._collected = None   # demasiado grande para cachear
+        else:
+            self._collected.extend(rows)
+
+    def __iter__(self) -> Iterator[tuple]:
+        while not self.exhausted:
+            yield from self.fetch_page()
+
+    def close(self, failed: bool = False) -> None:
+        cur, self._cur = self._cur, None
+        self.exhausted = True
+        if cur is None:
+            return
+        try:
+            cur.close()
+        except PsycopgError:
+            failed = True
+        try:
+            if failed:
+                self.conn.rollback()
+            else:
+                self.conn.commit()
+        except PsycopgError:
+            pass
 
 
 def fetch_all(
     conn: PGConnection,
     sql: str,
     params: Optional[Iterable[Any]] = None,
+    prepare: bool = False,
 ) -> Tuple[List[str], List[tuple]]:
-
-    with conn.cursor() as cur:
-        cur.execute(sql, params)
-        rows = cur.fetchall()
-        columns = [d[0] for d in (cur.description or [])]
-        return columns, rows
+    """
+    prepare=True: PREPARE una vez por conexión y luego EXECUTE (para consultas fijas, p.ej. de catálogo).
+    """
+    started = time.monotonic()
+    try:
+        with conn.cursor() as cur:
+            if prepare:
+                execute_prepared(conn, cur, sql, params)
+            else:
+                cur.execute(sql, params)
+            rows = cur.fetchall()
+            columns = [d[0] for d in (cur.description or [])]
+    except PsycopgError as e:
+        record_call("fetch_all", query_label(sql), started, conn, error=e)
+        raise
+    record_call("fetch_all", query_label(sql), started, conn, rows=rows)
+    return columns, rows
 
 
 def execute(
@@ -26,38 +182,162 @@ def execute(
     sql: str,
     params: Optional[Iterable[Any]] = None,
 ) -> int:
-    
+    started = time.monotonic()
     try:
         with conn.cursor() as cur:
             cur.execute(sql, params)
             affected = cur.rowcount
         conn.commit()
-        return affected
-    except PsycopgError:
+    except PsycopgError as e:
+        record_call("execute", query_label(sql), started, conn, error=e)
         conn.rollback()
         raise
+    record_call("execute", query_label(sql), started, conn, rowcount=affected)
+    invalidate_results_for_sql(conn, sql)
+    return affected
+
+
+def cancel_query(conn: PGConnection) -> None:
+    """
+    Pide al servidor cancelar la sentencia en curso de conn.
+    Se puede llamar desde otro hilo mientras la consulta se ejecuta.
+    """
+    try:
+        conn.cancel()
+    except PsycopgError:
+        pass
+
+
+def _reads_views(conn: PGConnection, sql: str) -> bool:
+    from db.objects_repo import list_view_names   # objects_repo importa este módulo
+    return bool(referenced_tables(sql) & list_view_names(conn))
 
 
 def run_sql(
     conn: PGConnection,
     sql: str,
     params: Optional[Iterable[Any]] = None,
+    stream: bool = False,
+    page_size: int = STREAM_PAGE_SIZE,
+    single_transaction: bool = False,
+    stop_on_error: bool = True,
+    should_stop=None,
+    cache: bool = False,
+    cache_ttl: Optional[float] = RESULT_CACHE_TTL,
+) -> Dict[str, Any]:
+    """
+    Con stream=True las consultas devuelven solo la primera página en "rows"
+    y un QueryStream en "stream" (None si ya no quedan filas).
+    Si el texto tiene varias sentencias se ejecuta como script (type "script").
+    Con cache=True los SELECT de solo lectura se sirven desde result_cache si están;
+    el resultado trae entonces "cached": True y "cache_age" en segundos.
+    """
+    started = time.monotonic()
+    try:
+        result = _run_sql(
+            conn, sql, params, stream, page_size, single_transaction, stop_on_error, should_stop,
+            cache, cache_ttl,
+        )
+    except PsycopgError as e:
+        record_call("run_sql", query_label(sql), started, conn, error=e)
+        raise
+    record_call(
+        "run_sql", query_label(sql), started, conn,
+        rows=result.get("rows"), rowcount=result.get("affected") or 0,
+    )
+    return result
+
+
+def _run_sql(
+    conn: PGConnection,
+    sql: str,
+    params: Optional[Iterable[Any]] = None,
+    stream: bool = False,
+    page_size: int = STREAM_PAGE_SIZE,
+    single_transaction: bool = False,
+    stop_on_error: bool = True,
+    should_stop=None,
+    cache: bool = False,
+    cache_ttl: Optional[float] = RESULT_CACHE_TTL,
 ) -> Dict[str, Any]:
-    
     sql = (sql or "").strip()
     if not sql:
         return {"type": "command", "message": "SQL vacío."}
 
-    if is_select(sql):
-        cols, rows = fetch_all(conn, sql, params)
+    if params is None:
+        statements = split_statements(sql)
+        if not statements:
+            return {"type": "command", "message": "SQL vacío."}
+        if len(statements) > 1:
+            script = run_script(
+                conn, sql,
+                single_transaction=single_transaction,
+                stop_on_error=stop_on_error,
+                should_stop=should_stop,
+            )
+            return {"type": "script", "script": script, "message": script.summary()}
+
+    cache_key = None
+    if cache and is_cacheable(sql):
+        cache_key = result_cache.key(conn, sql, params)
+        hit = result_cache.get(cache_key)
+        if hit is not None:
+            return {
+                "type": "query",
+                "columns": hit.columns,
+                "rows": hit.rows,
+                "cached": True,
+                "cache_age": hit.age,
+                "message": f"{len(hit.rows)} fila(s).",
+            }
+        if _reads_views(conn, sql):
+            # Una escritura en las tablas base no invalidaría el resultado de la vista
+            cache_key = None
+
+    if is_select(sql) and stream:
+        qs = QueryStream(conn, sql, params, page_size=page_size)
+        rows = qs.fetch_page()
+        if cache_key is not None:
+            if qs.exhausted:
+                result_cache.put(cache_key, sql, qs.columns, rows, cache_ttl)
+            else:
+                # Se cachea si el usuario termina de leer el cursor y el resultado no es muy grande
+                qs.collect(
+                    lambda cols, all_rows: result_cache.put(cache_key, sql, cols, all_rows, cache_ttl),
+                    int(result_cache.max_bytes * RESULT_MAX_ENTRY_SHARE),
+                    first_page=rows,
+                )
+        return {
+            "type": "query",
+            "columns": qs.columns,
+            "rows": rows,
+            "stream": None if qs.exhausted else qs,
+            "message": f"{len(rows)} fila(s)." if qs.exhausted else f"Primeras {len(rows)} fila(s); hay más.",
+        }
+
+    # EXPLAIN, ... RETURNING y el resto: se reconoce por cursor.description
+    try:
+        with conn.cursor() as cur:
+            cur.execute(sql, params)
+            affected = cur.rowcount
+            cols = [d[0] for d in cur.description] if cur.description else None
+            rows = cur.fetchall() if cols is not None else None
+        conn.commit()
+    except PsycopgError:
+        conn.rollback()
+        raise
+    invalidate_for_sql(conn, sql)
+    invalidate_results_for_sql(conn, sql)
+
+    if cols is not None:
+        if cache_key is not None:
+            result_cache.put(cache_key, sql, cols, rows, cache_ttl)
         return {
             "type": "query",
             "columns": cols,
             "rows": rows,
             "message": f"{len(rows)} fila(s).",
         }
-
-    affected = execute(conn, sql, params)
     return {
         "type": "command",
         "affected": affected,
@@ -0,0 +1,164 @@
+import re
+from typing import Iterable, Optional
+from psycopg2.extensions import connection as PGConnection
+
+from db.execute import fetch_all
+from db.objects_repo import list_schemas, list_tables_by_schema
+from models.explain_plan import PlanNode, ExplainPlan
+
+EXPLAIN_MODES = ("plain", "analyze", "debug")
+HOT_TOP_N = 3
+HOT_MIN_SHARE = 0.2     # un nodo "caliente" cuesta al menos 20% del más caro
+SYSTEM_SCHEMAS = ("pg_catalog", "information_schema", "crdb_internal", "pg_extension")
+
+_TREE_CHARS = " │├└─"
+_DURATION_RE = re.compile(r"(\d+(?:\.\d+)?)(ns|µs|μs|us|ms|s|m|h)")
+_SIZE_RE = re.compile(r"([\d.,]+)\s*(B|KiB|MiB|GiB|TiB)\b")
+_COUNT_RE = re.compile(r"[\d,]+")
+
+_DURATION_UNITS = {"ns": 1e-9, "µs": 1e-6, "μs": 1e-6, "us": 1e-6, "ms": 1e-3, "s": 1.0, "m": 60.0, "h": 3600.0}
+_SIZE_UNITS = {"B": 1, "KiB": 1 << 10, "MiB": 1 << 20, "GiB": 1 << 30, "TiB": 1 << 40}
+
+
+def parse_duration(text: str) -> Optional[float]:
+    """
+    Duraciones estilo Go que imprime CockroachDB: 12µs, 1.5ms, 1m2.5s...
+    """
+    parts = _DURATION_RE.findall(text or "")
+    if not parts:
+        return None
+    return sum(float(n) * _DURATION_UNITS[u] for n, u in parts)
+
+
+def parse_size(text: str) -> Optional[int]:
+    m = _SIZE_RE.search(text or "")
+    if not m:
+        return None
+    return int(float(m.group(1).replace(",", "")) * _SIZE_UNITS[m.group(2)])
+
+
+def parse_count(text: str) -> Optional[int]:
+    m = _COUNT_RE.search(text or "")
+    if not m or not m.group(0).strip(","):
+        return None
+    return int(m.group(0).replace(",", ""))
+
+
+def _apply_attr(node: PlanNode, key: str, value: str) -> None:
+    k = key.lower()
+    if k == "actual row count":
+        node.rows = parse_count(value)
+    elif k == "estimated row count":
+        node.estimated_rows = parse_count(value)
+    elif k in ("execution time", "kv time"):
+        t = parse_duration(value)
+        if t is not None:
+            node.time = t if node.time is None else max(node.time, t)
+    elif k in ("estimated max memory allocated", "max memory allocated"):
+        node.memory = parse_size(value)
+    elif k in ("estimated max sql temp disk usage", "max sql temp disk usage"):
+        node.spill = parse_size(value)
+    elif k == "table":
+        table, _, index = value.partition("@")
+        node.table = table.strip()
+        node.index = index.strip() or None
+    elif k == "spans" and "FULL SCAN" in value.upper():
+        node.full_scan = True
+
+
+def parse_explain(lines: Iterable[str]) -> ExplainPlan:
+    """
+    Arma el árbol de operadores a partir de la salida de EXPLAIN [ANALYZE] (una línea por fila).
+    La profundidad sale de la columna donde aparece el "•" de cada operador;
+    las líneas "clave: valor" pertenecen al último operador visto
+    (o a la cabecera del plan si todavía no apareció ninguno).
+    """
+    lines = list(lines)
+    plan = ExplainPlan(text="\n".join(lines))
+    stack: list[tuple[int, PlanNode]] = []
+    current: Optional[PlanNode] = None
+
+    for line in lines:
+        col = line.find("•")
+        if col >= 0:
+            node = PlanNode(name=line[col + 1:].strip())
+            while stack and stack[-1][0] >= col:
+                stack.pop()
+            node.depth = len(stack)
+            if stack:
+                stack[-1][1].children.append(node)
+            else:
+                plan.roots.append(node)
+            stack.append((col, node))
+            current = node
+            continue
+
+        body = line.lstrip(_TREE_CHARS)
+        key, sep, value = body.partition(":")
+        if not sep or not key.strip():
+            continue
+        key, value = key.strip(), value.strip()
+        if current is None:
+            plan.header.append((key, value))
+        else:
+            current.attrs.append((key, value))
+            _apply_attr(current, key, value)
+
+    plan.analyzed = any(n.rows is not None for n in plan.nodes())
+    mark_hot(plan)
+    return plan
+
+
+def mark_hot(plan: ExplainPlan, top: int = HOT_TOP_N, min_share: float = HOT_MIN_SHARE) -> None:
+    nodes = plan.nodes()
+    if not nodes:
+        return
+    max_cost = max(n.cost for n in nodes)
+    if max_cost <= 0:
+        return
+    for n in plan.hottest(top):
+        if n.cost > 0 and n.cost >= max_cost * min_share:
+            n.hot = True
+
+
+def explain_statement(sql: str, mode: str = "analyze") -> str:
+    if mode not in EXPLAIN_MODES:
+        raise ValueError(f"Modo de EXPLAIN no soportado: {mode}")
+    sql = sql.strip().rstrip(";")
+    if mode == "debug":
+        return f"EXPLAIN ANALYZE (DEBUG) {sql}"
+    if mode == "analyze":
+        return f"EXPLAIN ANALYZE (VERBOSE) {sql}"
+    return f"EXPLAIN (VERBOSE) {sql}"
+
+
+def run_explain(conn: PGConnection, sql: str, mode: str = "analyze") -> ExplainPlan:
+    """
+    EXPLAIN ANALYZE ejecuta la sentencia de verdad: se hace dentro de una transacción
+    que siempre se revierte, así un INSERT/UPDATE/DELETE analizado no deja cambios.
+    """
+    try:
+        _, rows = fetch_all(conn, explain_statement(sql, mode))
+    finally:
+        conn.rollback()
+    return parse_explain(str(r[0]) for r in rows)
+
+
+def flag_known_tables(conn: PGConnection, plan: ExplainPlan) -> None:
+    """
+    Completa known_table en los nodos con tabla, buscando el nombre en los schemas
+    de la base (listas cacheadas de objects_repo).
+    """
+    wanted = {n.table for n in plan.nodes() if n.table}
+    if not wanted:
+        return
+    found: dict[str, list[str]] = {}
+    for schema in list_schemas(conn):
+        if schema in SYSTEM_SCHEMAS:
+            continue
+        for t in list_tables_by_schema(conn, schema):
+            if t.name in wanted:
+                found.setdefault(t.name, []).append(f"{schema}.{t.name}")
+    for n in plan.nodes():
+        if n.table in found:
+            n.known_table = ", ".join(found[n.table])
@@ -0,0 +1,219 @@
+import csv
+import json
+import os
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Iterable, List, Optional
+from psycopg2.extensions import connection as PGConnection
+
+from db.execute import QueryStream
+
+EXPORT_FORMATS = ("csv", "jsonl", "parquet")
+EXPORT_PAGE_SIZE = 5_000
+
+
+@dataclass
+class ExportProgress:
+    rows: int = 0
+    elapsed: float = 0.0
+    cancelled: bool = False
+
+    @property
+    def rows_per_sec(self) -> float:
+        return self.rows / self.elapsed if self.elapsed > 0 else 0.0
+
+
+def format_for_path(path: str) -> str:
+    ext = os.path.splitext(path)[1].lower().lstrip(".")
+    if ext in ("jsonl", "ndjson"):
+        return "jsonl"
+    if ext in ("parquet", "pq"):
+        return "parquet"
+    return "csv"
+
+
+class _CsvWriter:
+    def __init__(self, path: str):
+        self._f = open(path, "w", encoding="utf-8", newline="")
+        self._w = csv.writer(self._f)
+        self._header = False
+
+    def write(self, columns: List[str], rows: List[tuple], description=None) -> None:
+        if not self._header:
+            self._w.writerow(columns)
+            self._header = True
+        # None se escribe como campo vacío
+        self._w.writerows(rows)
+
+    def close(self) -> None:
+        self._f.close()
+
+
+class _JsonlWriter:
+    def __init__(self, path: str):
+        self._f = open(path, "w", encoding="utf-8")
+
+    def write(self, columns: List[str], rows: List[tuple], description=None) -> None:
+        # default=str cubre Decimal, fechas, UUID, intervalos...
+        self._f.writelines(
+            json.dumps(dict(zip(columns, r)), ensure_ascii=False, default=str) + "\n"
+            for r in rows
+        )
+
+    def close(self) -> None:
+        self._f.close()
+
+
+# OIDs de pg_type -> tipo de Arrow (lo que no está va como string)
+_ARROW_TYPES = {
+    16: lambda pa: pa.bool_(),
+    17: lambda pa: pa.binary(),
+    20: lambda pa: pa.int64(),
+    21: lambda pa: pa.int16(),
+    23: lambda pa: pa.int32(),
+    700: lambda pa: pa.float32(),
+    701: lambda pa: pa.float64(),
+    1082: lambda pa: pa.date32(),
+    1083: lambda pa: pa.time64("us"),
+    1114: lambda pa: pa.timestamp("us"),
+    1184: lambda pa: pa.timestamp("us", tz="UTC"),
+}
+NUMERIC_OID = 1700
+DECIMAL128_MAX_PRECISION = 38
+
+
+def _as_text(v: Any) -> Optional[str]:
+    if v is None or isinstance(v, str):
+        return v
+    if isinstance(v, (dict, list)):
+        # JSONB llega como dict/list: se guarda como JSON, no como repr de Python
+        return json.dumps(v, ensure_ascii=False, default=str)
+    return str(v)
+
+
+class _ParquetWriter:
+    """
+    Escribe un row group por página. El schema sale de cursor.description (tipos del servidor),
+    no de los valores: una página posterior no puede traer un tipo o una escala distinta.
+    NUMERIC con escala declarada va como decimal128(38, escala); sin escala, como string.
+    """
+
+    def __init__(self, path: str):
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError:
+            raise RuntimeError("Para exportar a Parquet hay que instalar pyarrow (pip install pyarrow).")
+        self._pa = pa
+        self._pq = pq
+        self._path = path
+        self._schema = None
+        self._writer = None
+
+    def _arrow_type(self, column):
+        pa = self._pa
+        type_code, precision, scale = column[1], column[4], column[5]
+        if type_code == NUMERIC_OID:
+            if scale is not None and scale >= 0 and precision is not None and 0 < precision <= DECIMAL128_MAX_PRECISION:
+                return pa.decimal128(DECIMAL128_MAX_PRECISION, scale)
+            return pa.string()
+        make = _ARROW_TYPES.get(type_code)
+        return make(pa) if make else pa.string()
+
+    def write(self, columns: List[str], rows: List[tuple], description=None) -> None:
+        pa = self._pa
+        if self._schema is None:
+            if description is None:
+                return
+            self._schema = pa.schema([pa.field(name, self._arrow_type(col)) for name, col in zip(columns, description)])
+            self._writer = self._pq.ParquetWriter(self._path, self._schema)
+            if not rows:
+                # Resultado vacío: un row group sin filas, así el archivo tiene el schema
+                self._writer.write_table(self._schema.empty_table())
+        if not rows:
+            return
+
+        values = zip(*rows)
+        arrays = [
+            pa.array(self._coerce(list(col), f.type), type=f.type)
+            for col, f in zip(values, self._schema)
+        ]
+        self._writer.write_table(pa.Table.from_arrays(arrays, schema=self._schema))
+
+    def _coerce(self, col: list, typ) -> list:
+        types = self._pa.types
+        if types.is_string(typ):
+            return [_as_text(v) for v in col]
+        if types.is_binary(typ):
+            return [None if v is None else bytes(v) for v in col]
+        return col
+
+    def close(self) -> None:
+        if self._writer is not None:
+            self._writer.close()
+
+
+_WRITERS = {"csv": _CsvWriter, "jsonl": _JsonlWriter, "parquet": _ParquetWriter}
+
+
+def export_query(
+    conn: PGConnection,
+    sql: str,
+    path: str,
+    fmt: Optional[str] = None,
+    params: Optional[Iterable[Any]] = None,
+    page_size: int = EXPORT_PAGE_SIZE,
+    on_progress: Optional[Callable[[ExportProgress], None]] = None,
+    should_stop: Optional[Callable[[], bool]] = None,
+) -> ExportProgress:
+    """
+    Escribe el resultado de sql en path leyendo página por página de un cursor
+    del servidor, así la memoria usada no depende del total de filas.
+    Si se cancela (should_stop) el archivo parcial se borra.
+    """
+    fmt = fmt or format_for_path(path)
+    if fmt not in _WRITERS:
+        raise ValueError(f"Formato no soportado: {fmt}")
+
+    writer = _WRITERS[fmt](path)
+    progress = ExportProgress()
+    start = time.monotonic()
+    stream = None
+    ok = False
+    try:
+        stream = QueryStream(conn, sql, params, page_size=page_size)
+        while not stream.exhausted:
+            if should_stop and should_stop():
+                progress.cancelled = True
+                break
+            rows = stream.fetch_page()
+            writer.write(stream.columns, rows, stream.description)
+            progress.rows += len(rows)
+            progress.elapsed = time.monotonic() - start
+            if on_progress:
+                on_progress(progress)
+        ok = not progress.cancelled
+    finally:
+        if stream is not None:
+            stream.close()
+        writer.close()
+        if not ok:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+    progress.elapsed = time.monotonic() - start
+    return progress
+
+
+def export_table(
+    conn: PGConnection,
+    schema: str,
+    table: str,
+    path: str,
+    fmt: Optional[str] = None,
+    **kwargs,
+) -> ExportProgress:
+    sql = 'SELECT * FROM "{}"."{}"'.format(schema.replace('"', '""'), table.replace('"', '""'))
+    return export_query(conn, sql, path, fmt=fmt, **kwargs)
@@ -0,0 +1,220 @@
+import json
+import math
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from dataclasses import dataclass, asdict
+from typing import Any, Dict, List, Optional
+
+from db import crdb_system_tables
+
+RING_SIZE = 2_000
+BYTES_SAMPLE_ROWS = 100
+
+# Buckets exponenciales: el bucket i cubre hasta HIST_BASE * HIST_FACTOR**i segundos
+HIST_BASE = 0.0001
+HIST_FACTOR = 2.0
+HIST_BUCKETS = 24   # 0.1 ms ... ~14 min
+
+# Texto de cada consulta de catálogo -> nombre de la constante (p.ej. "LIST_TABLES_BY_SCHEMA")
+_CATALOG_LABELS = {
+    value: name
+    for name, value in vars(crdb_system_tables).items()
+    if name.isupper() and isinstance(value, str)
+}
+
+
+@dataclass
+class CallRecord:
+    label: str
+    kind: str           # fetch_all, execute, run_sql, fetch_page, script, ui
+    started: float      # time.time()
+    elapsed: float
+    rows: int = 0
+    bytes: int = 0
+    conn_id: Optional[int] = None
+    error: Optional[str] = None
+
+
+class Histogram:
+    def __init__(self):
+        self.buckets = [0] * (HIST_BUCKETS + 1)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def add(self, seconds: float) -> None:
+        if seconds <= HIST_BASE:
+            idx = 0
+        else:
+            idx = min(HIST_BUCKETS, int(math.ceil(math.log(seconds / HIST_BASE, HIST_FACTOR))))
+        self.buckets[idx] += 1
+        self.count += 1
+        self.total += seconds
+        self.max = max(self.max, seconds)
+
+    def percentile(self, p: float) -> float:
+        """
+        Límite superior del bucket donde cae el percentil p (0-100), acotado por el máximo visto.
+        """
+        if not self.count:
+            return 0.0
+        rank = math.ceil(self.count * p / 100.0)
+        seen = 0
+        for idx, n in enumerate(self.buckets):
+            seen += n
+            if seen >= rank:
+                return min(self.max, HIST_BASE * HIST_FACTOR ** idx)
+        return self.max
+
+    def as_dict(self) -> Dict[str, float]:
+        return {
+            "count": self.count,
+            "mean": self.total / self.count if self.count else 0.0,
+            "p50": self.percentile(50),
+            "p95": self.percentile(95),
+            "p99": self.percentile(99),
+            "max": self.max,
+        }
+
+
+class Instrumentation:
+    """
+    Registro en memoria de las llamadas a la base (y de tiempos de UI):
+    - ring buffer con las últimas RING_SIZE llamadas
+    - histograma de latencia por etiqueta
+    """
+
+    def __init__(self, size: int = RING_SIZE):
+        self._lock = threading.Lock()
+        self._recent: "deque[CallRecord]" = deque(maxlen=size)
+        self._hist: Dict[str, Histogram] = {}
+        self.enabled = True
+
+    def record(self, rec: CallRecord) -> None:
+        if not self.enabled:
+            return
+        with self._lock:
+            self._recent.append(rec)
+            h = self._hist.get(rec.label)
+            if h is None:
+                h = self._hist[rec.label] = Histogram()
+            h.add(rec.elapsed)
+
+    def recent(self) -> List[CallRecord]:
+        with self._lock:
+            return list(self._recent)
+
+    def slowest(self, n: int = 50) -> List[CallRecord]:
+        return sorted(self.recent(), key=lambda r: r.elapsed, reverse=True)[:n]
+
+    def histograms(self) -> Dict[str, Dict[str, float]]:
+        with self._lock:
+            return {label: h.as_dict() for label, h in self._hist.items()}
+
+    def clear(self) -> None:
+        with self._lock:
+            self._recent.clear()
+            self._hist.clear()
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "generated_at": time.time(),
+            "histograms": self.histograms(),
+            "recent": [asdict(r) for r in self.recent()],
+        }
+
+    def dump_json(self, path: Optional[str] = None) -> str:
+        text = json.dumps(self.snapshot(), indent=2, default=str)
+        if path:
+            with open(path, "w", encoding="utf-8") as f:
+                f.write(text)
+        return text
+
+
+instrumentation = Instrumentation()
+
+
+def query_label(sql: str) -> str:
+    """
+    Nombre de la constante para consultas de catálogo; para el resto,
+    el inicio de la sentencia con espacios normalizados.
+    """
+    name = _CATALOG_LABELS.get(sql)
+    if name:
+        return name
+    return " ".join((sql or "").split())[:80]
+
+
+def connection_id(conn) -> Optional[int]:
+    # backend_pid no hace round-trip; si no está disponible se usa la identidad del objeto
+    try:
+        return conn.info.backend_pid
+    except Exception:
+        return id(conn) if conn is not None else None
+
+
+def estimate_bytes(rows) -> int:
+    """
+    Tamaño aproximado del resultado (texto de los valores), muestreando hasta BYTES_SAMPLE_ROWS filas.
+    """
+    if not rows:
+        return 0
+    sample = rows[:BYTES_SAMPLE_ROWS]
+    size = 0
+    for r in sample:
+        for v in r:
+            if v is None:
+                continue
+            if isinstance(v, (bytes, bytearray, memoryview)):
+                size += len(v)
+            elif isinstance(v, str):
+                size += len(v)
+            else:
+                size += len(str(v))
+    return size * len(rows) // len(sample)
+
+
+def record_call(
+    kind: str,
+    label: str,
+    started: float,
+    conn=None,
+    rows: Optional[list] = None,
+    rowcount: int = 0,
+    error: Any = None,
+) -> None:
+    """
+    started: time.monotonic() al inicio de la llamada.
+    error: excepción o mensaje, si la llamada falló.
+    """
+    if not instrumentation.enabled:
+        return
+    elapsed = time.monotonic() - started
+    instrumentation.record(CallRecord(
+        label=label,
+        kind=kind,
+        started=time.time() - elapsed,
+        elapsed=elapsed,
+        rows=len(rows) if rows is not None else max(rowcount, 0),
+        bytes=estimate_bytes(rows),
+        conn_id=connection_id(conn) if conn is not None else None,
+        error=str(error).strip() if error else None,
+    ))
+
+
+@contextmanager
+def timed(label: str, kind: str = "ui"):
+    """
+    Uso: with timed("ui:preview"): ...  (p.ej. para medir el pintado en Tk)
+    """
+    started = time.monotonic()
+    err = None
+    try:
+        yield
+    except BaseException as e:
+        err = e
+        raise
+    finally:
+        record_call(kind, label, started, error=err)
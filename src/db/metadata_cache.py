@@ -0,0 +1,210 @@
+import re
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from functools import wraps
+from typing import Any, Callable, Hashable, Optional
+
+CACHE_MAX_ENTRIES = 512
+CACHE_TTL = 60.0
+
+
+@dataclass
+class CacheStats:
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    invalidations: int = 0
+
+
+def conn_scope(conn) -> tuple:
+    """
+    Identifica servidor + base de una conexión: (host, port, user, database).
+    """
+    try:
+        info = conn.info
+        return (info.host, info.port, info.user, info.dbname)
+    except AttributeError:
+        return ("?", id(conn), "?", "?")
+
+
+class MetadataCache:
+    """
+    Caché LRU con TTL para la metadata del catálogo.
+    Clave: (scope, schema, función, argumentos); scope = conn_scope(conn).
+    """
+
+    def __init__(self, max_entries: int = CACHE_MAX_ENTRIES, ttl: float = CACHE_TTL):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.enabled = True
+        self.stats = CacheStats()
+        self._data: "OrderedDict[Hashable, tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key) -> tuple[bool, Any]:
+        with self._lock:
+            item = self._data.get(key)
+            if item is None or not self.enabled:
+                self.stats.misses += 1
+                return False, None
+            expires_at, value = item
+            if time.monotonic() >= expires_at:
+                del self._data[key]
+                self.stats.misses += 1
+                return False, None
+            self._data.move_to_end(key)
+            self.stats.hits += 1
+            return True, value
+
+    def peek(self, key) -> Any:
+        """
+        Como get() pero sin contar estadísticas ni reordenar; None si no está vigente.
+        """
+        with self._lock:
+            item = self._data.get(key)
+            if item is None or time.monotonic() >= item[0]:
+                return None
+            return item[1]
+
+    def put(self, key, value, ttl: Optional[float] = None) -> None:
+        if not self.enabled:
+            return
+        ttl = self.ttl if ttl is None else ttl
+        with self._lock:
+            self._data[key] = (time.monotonic() + ttl, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_entries:
+                self._data.popitem(last=False)
+                self.stats.evictions += 1
+
+    def _drop(self, match: Callable[[tuple], bool]) -> int:
+        with self._lock:
+            keys = [k for k in self._data if match(k)]
+            for k in keys:
+                del self._data[k]
+            self.stats.invalidations += len(keys)
+            return len(keys)
+
+    def invalidate_schema(self, scope: tuple, schema: str) -> int:
+        return self._drop(lambda k: k[0] == scope and k[1] in (schema, None))
+
+    def invalidate_database(self, scope: tuple) -> int:
+        return self._drop(lambda k: k[0] == scope)
+
+    def invalidate_server(self, scope: tuple) -> int:
+        return self._drop(lambda k: k[0][:3] == scope[:3])
+
+    def clear(self) -> None:
+        with self._lock:
+            self.stats.invalidations += len(self._data)
+            self._data.clear()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._data)
+
+
+metadata_cache = MetadataCache()
+
+
+def cached(fn=None, *, ttl: Optional[float] = None):
+    """
+    Decorador para funciones fn(conn, schema?, ...) de objects_repo.
+    El primer argumento después de conn se toma como schema para la invalidación.
+    """
+    def decorate(f):
+        name = f.__qualname__
+
+        @wraps(f)
+        def wrapper(conn, *args):
+            schema = args[0] if args else None
+            key = (conn_scope(conn), schema, name, args)
+            found, value = metadata_cache.get(key)
+            if found:
+                return value
+            value = f(conn, *args)
+            metadata_cache.put(key, value, ttl)
+            return value
+
+        return wrapper
+
+    return decorate(fn) if fn is not None else decorate
+
+
+_DDL_RE = re.compile(r"^(CREATE|ALTER|DROP)\b", re.IGNORECASE)
+_DATABASE_RE = re.compile(r"^\w+\s+DATABASE\b", re.IGNORECASE)
+_LEADING_COMMENTS_RE = re.compile(r"^\s*(?:(?:--[^\n]*(?:\n|$)|/\*.*?\*/)\s*)*", re.DOTALL)
+_IDENT = r'(?:"(?:[^"]|"")+"|[A-Za-z_][A-Za-z0-9_$]*)'
+_QNAME = rf"{_IDENT}(?:\s*\.\s*{_IDENT}){{0,2}}"
+_QNAME_RE = re.compile(_QNAME)
+# El nombre del objeto va justo después de la clase de objeto (o después de ON en CREATE INDEX)
+_OBJECT_RE = re.compile(
+    rf"^(?:CREATE|ALTER|DROP)\s+(?:OR\s+REPLACE\s+)?(?:(?:UNIQUE|INVERTED|MATERIALIZED|TEMP|TEMPORARY)\s+)*"
+    rf"(?:TABLE|VIEW|SEQUENCE|TYPE|FUNCTION|INDEX)\s+(?:CONCURRENTLY\s+)?(?:IF\s+(?:NOT\s+)?EXISTS\s+)?"
+    rf"({_QNAME}(?:\s*,\s*{_QNAME})*)",
+    re.IGNORECASE,
+)
+_CREATE_INDEX_RE = re.compile(
+    rf"^CREATE\s+(?:(?:UNIQUE|INVERTED)\s+)*INDEX\s+(?:CONCURRENTLY\s+)?(?:IF\s+NOT\s+EXISTS\s+)?"
+    rf"(?:{_IDENT}\s+)?ON\s+({_QNAME})",
+    re.IGNORECASE,
+)
+_SET_SCHEMA_RE = re.compile(rf"\bSET\s+SCHEMA\s+({_IDENT})", re.IGNORECASE)
+
+
+def _unquote(ident: str) -> str:
+    if ident.startswith('"'):
+        return ident[1:-1].replace('""', '"')
+    return ident.lower()
+
+
+def strip_leading_comments(sql: str) -> str:
+    return _LEADING_COMMENTS_RE.sub("", sql or "", count=1)
+
+
+def is_ddl(sql: str) -> bool:
+    return bool(_DDL_RE.match(strip_leading_comments(sql)))
+
+
+def ddl_schemas(sql: str) -> Optional[set[str]]:
+    """
+    Schemas de los objetos que crea/modifica/borra una sentencia DDL, tomados solo de la
+    posición del nombre (no de referencias como t.columna en el cuerpo de una vista).
+    Retorna: None si algún nombre no trae schema o no se reconoce la sentencia.
+    """
+    sql = strip_leading_comments(sql)
+    m = _CREATE_INDEX_RE.match(sql) or _OBJECT_RE.match(sql)
+    if m is None:
+        return None
+    schemas = set()
+    for qname in _QNAME_RE.findall(m.group(1)):
+        parts = re.findall(_IDENT, qname)
+        if len(parts) < 2:
+            return None
+        schemas.add(_unquote(parts[-2]))
+    for target in _SET_SCHEMA_RE.findall(sql[m.end():]):
+        schemas.add(_unquote(target))
+    return schemas
+
+
+def invalidate_for_sql(conn, sql: str) -> None:
+    """
+    Invalida la metadata afectada por una sentencia DDL ejecutada en conn.
+    Si no se puede deducir el schema se invalida toda la base.
+    """
+    if not is_ddl(sql):
+        return
+    scope = conn_scope(conn)
+
+    if _DATABASE_RE.match(strip_leading_comments(sql)):
+        metadata_cache.invalidate_server(scope)
+        return
+
+    schemas = ddl_schemas(sql)
+    if not schemas:
+        metadata_cache.invalidate_database(scope)
+        return
+    for schema in schemas:
+        metadata_cache.invalidate_schema(scope, schema)
@@ -1,99 +1,285 @@
 from typing import List
 from psycopg2.extensions import connection as PGConnection
-import re
 
 from db.execute import fetch_all
-from db.crdb_system_tables import (LIST_DATABASES, LIST_SCHEMAS, LIST_TABLES_BY_SCHEMA, LIST_VIEWS_BY_SCHEMA,
+from db.metadata_cache import cached, conn_scope, metadata_cache
+from db.crdb_system_tables import (LIST_DATABASES, LIST_SCHEMAS, LIST_TABLES_BY_SCHEMA, LIST_VIEWS_BY_SCHEMA, LIST_VIEW_NAMES,
     LIST_INDEXES_BY_SCHEMA, LIST_FUNCTIONS_BY_SCHEMA, LIST_SEQUENCES_BY_SCHEMA, LIST_TYPES_BY_SCHEMA, GET_TABLE_COLUMNS, GET_COLUMN_DEFAULTS,
-    GET_PRIMARY_KEY_COLUMNS, GET_UNIQUE_CONSTRAINTS, GET_TABLE_INDEXES, GET_FOREIGN_KEYS,)
+    GET_PRIMARY_KEY_COLUMNS, GET_UNIQUE_CONSTRAINTS, GET_TABLE_INDEXES, GET_FOREIGN_KEYS, DESCRIBE_TABLE,
+    SNAPSHOT_RELATIONS, SNAPSHOT_COLUMNS, SNAPSHOT_CONSTRAINTS, SNAPSHOT_FOREIGN_KEYS, SNAPSHOT_INDEXES,
+    SEARCH_ALL_OBJECTS, PAGE_RELATIONS_BY_SCHEMA, PAGE_TYPES_BY_SCHEMA, PAGE_FUNCTIONS_BY_SCHEMA,
+    PAGE_INDEXES_BY_SCHEMA,)
 from models.db_object import DbObject
+from models.table_descriptor import ColumnInfo, IndexInfo, ForeignKeyInfo, TableDescriptor
+from models.schema_snapshot import SchemaSnapshot
 
+SNAPSHOT_TTL = 300.0
+# Las consultas de catálogo se preparan una vez por conexión del pool
+PREPARE_CATALOG_QUERIES = True
+FOLDER_PAGE_SIZE = 500
+
+# Clave keyset inicial (menor que cualquier fila) por tipo de objeto
+FOLDER_START_KEYS = {
+    "table": ("",),
+    "view": ("",),
+    "sequence": ("",),
+    "type": ("",),
+    "function": ("", -1),
+    "index": ("", ""),
+}
+_RELKINDS = {"table": "r", "view": "v", "sequence": "S"}
+
+@cached
 def list_databases(conn: PGConnection) -> list[str]:
-    _, rows = fetch_all(conn, LIST_DATABASES)
+    _, rows = fetch_all(conn, LIST_DATABASES, prepare=PREPARE_CATALOG_QUERIES)
     return [r[0] for r in rows]
 
+@cached
 def list_schemas(conn: PGConnection) -> list[str]:
-    _, rows = fetch_all(conn, LIST_SCHEMAS)
+    _, rows = fetch_all(conn, LIST_SCHEMAS, prepare=PREPARE_CATALOG_QUERIES)
     return [r[0] for r in rows]
 
+@cached
 def list_tables_by_schema(conn: PGConnection, schema: str) -> List[DbObject]:
-    _, rows = fetch_all(conn, LIST_TABLES_BY_SCHEMA, (schema,))
+    snap = get_cached_snapshot(conn, schema)
+    if snap is not None:
+        return [DbObject(obj_type="table", schema=schema, name=n) for n in snap.tables()]
+    _, rows = fetch_all(conn, LIST_TABLES_BY_SCHEMA, (schema,), prepare=PREPARE_CATALOG_QUERIES)
     return [DbObject(obj_type="table", schema=r[0], name=r[1]) for r in rows]
 
+@cached
 def list_views_by_schema(conn: PGConnection, schema: str) -> List[DbObject]:
-    _, rows = fetch_all(conn, LIST_VIEWS_BY_SCHEMA, (schema,))
+    snap = get_cached_snapshot(conn, schema)
+    if snap is not None:
+        return [DbObject(obj_type="view", schema=schema, name=n) for n in snap.views()]
+    _, rows = fetch_all(conn, LIST_VIEWS_BY_SCHEMA, (schema,), prepare=PREPARE_CATALOG_QUERIES)
     return [DbObject(obj_type="view", schema=r[0], name=r[1]) for r in rows]
 
+@cached
+def list_view_names(conn: PGConnection) -> frozenset[str]:
+    """
+    Nombres de las vistas de la base (de todos los schemas de usuario).
+    """
+    _, rows = fetch_all(conn, LIST_VIEW_NAMES, prepare=PREPARE_CATALOG_QUERIES)
+    return frozenset(r[0] for r in rows)
+
+@cached
 def list_indexes_by_schema(conn: PGConnection, schema: str) -> list[tuple[str, str, str]]:
     """
     Retorna: [(schema, table, index), ...]
     """
-    _, rows = fetch_all(conn, LIST_INDEXES_BY_SCHEMA, (schema,))
+    _, rows = fetch_all(conn, LIST_INDEXES_BY_SCHEMA, (schema,), prepare=PREPARE_CATALOG_QUERIES)
     return rows
 
+@cached
 def list_functions_by_schema(conn: PGConnection, schema: str) -> list[tuple[str, str]]:
     """
     Retorna: [(schema, function_name), ...]
     """
-    _, rows = fetch_all(conn, LIST_FUNCTIONS_BY_SCHEMA, (schema,))
+    _, rows = fetch_all(conn, LIST_FUNCTIONS_BY_SCHEMA, (schema,), prepare=PREPARE_CATALOG_QUERIES)
     return rows
 
+@cached
 def list_sequences_by_schema(conn: PGConnection, schema: str) -> list[tuple[str, str]]:
     """
     Retorna: [(schema, sequence_name), ...]
     """
-    _, rows = fetch_all(conn, LIST_SEQUENCES_BY_SCHEMA, (schema,))
+    snap = get_cached_snapshot(conn, schema)
+    if snap is not None:
+        return [(schema, n) for n in snap.sequences()]
+    _, rows = fetch_all(conn, LIST_SEQUENCES_BY_SCHEMA, (schema,), prepare=PREPARE_CATALOG_QUERIES)
     return rows
 
+@cached
 def list_types_by_schema(conn: PGConnection, schema: str) -> list[tuple[str, str]]:
     """
     Retorna: [(schema, type_name), ...]
     """
-    _, rows = fetch_all(conn, LIST_TYPES_BY_SCHEMA, (schema,))
+    _, rows = fetch_all(conn, LIST_TYPES_BY_SCHEMA, (schema,), prepare=PREPARE_CATALOG_QUERIES)
     return rows
 
+@cached
 def get_table_columns(conn, schema: str, table: str):
-    _, rows = fetch_all(conn, GET_TABLE_COLUMNS, (table, schema))
+    desc = _describe_from_snapshot(conn, schema, table)
+    if desc is not None:
+        return [(c.name, c.data_type, c.not_null) for c in desc.columns]
+    _, rows = fetch_all(conn, GET_TABLE_COLUMNS, (table, schema), prepare=PREPARE_CATALOG_QUERIES)
     return rows
 
 
+@cached
 def get_primary_key_columns(conn, schema: str, table: str) -> list[str]:
-    _, rows = fetch_all(conn, GET_PRIMARY_KEY_COLUMNS, (schema, table))
+    desc = _describe_from_snapshot(conn, schema, table)
+    if desc is not None:
+        return desc.primary_key
+    _, rows = fetch_all(conn, GET_PRIMARY_KEY_COLUMNS, (schema, table), prepare=PREPARE_CATALOG_QUERIES)
     return [r[0] for r in rows]
 
 
+@cached
 def get_column_defaults(conn, schema: str, table: str) -> dict[str, str]:
-    _, rows = fetch_all(conn, GET_COLUMN_DEFAULTS, (schema, table))
+    desc = _describe_from_snapshot(conn, schema, table)
+    if desc is not None:
+        return {c.name: c.default or "" for c in desc.columns}
+    _, rows = fetch_all(conn, GET_COLUMN_DEFAULTS, (schema, table), prepare=PREPARE_CATALOG_QUERIES)
     return {r[0]: (r[1] or "") for r in rows}
 
 
+@cached
 def get_unique_constraints(conn, schema: str, table: str) -> list[tuple[str, list[str]]]:
-    _, rows = fetch_all(conn, GET_UNIQUE_CONSTRAINTS, (schema, table))
+    desc = _describe_from_snapshot(conn, schema, table)
+    if desc is not None:
+        return desc.uniques
+    _, rows = fetch_all(conn, GET_UNIQUE_CONSTRAINTS, (schema, table), prepare=PREPARE_CATALOG_QUERIES)
     grouped: dict[str, list[str]] = {}
     for cname, col in rows:
         grouped.setdefault(cname, []).append(col)
     return [(cname, cols) for cname, cols in grouped.items()]
 
+@cached
 def get_table_indexes(conn, schema: str, table: str) -> list[tuple[str, str, str, str]]:
-    _, rows = fetch_all(conn, GET_TABLE_INDEXES, (schema, table))
+    desc = _describe_from_snapshot(conn, schema, table)
+    if desc is not None:
+        return desc.index_rows()
+    _, rows = fetch_all(conn, GET_TABLE_INDEXES, (schema, table), prepare=PREPARE_CATALOG_QUERIES)
+    return [IndexInfo(name, bool(is_primary), bool(is_unique), index_def).as_row()
+            for name, is_primary, is_unique, index_def in rows]
+
+@cached
+def get_foreign_keys(conn, schema: str, table: str) -> list[tuple[str, str, str, str, str]]:
+    desc = _describe_from_snapshot(conn, schema, table)
+    if desc is not None:
+        return desc.foreign_key_rows()
+    _, rows = fetch_all(conn, GET_FOREIGN_KEYS, (schema, table), prepare=PREPARE_CATALOG_QUERIES)
+    return rows
 
-    result = []
-    for index_name, is_primary, is_unique, index_def in rows:
-        idx_type = "PRIMARY KEY" if is_primary else ("UNIQUE" if is_unique else "BTREE")
+@cached
+def describe_table(conn, schema: str, table: str) -> TableDescriptor:
+    """
+    Columnas, defaults, PK, uniques, índices y FKs de la tabla en una sola consulta
+    (o sin consultas si el schema ya tiene snapshot cargado).
+    """
+    desc = _describe_from_snapshot(conn, schema, table)
+    if desc is not None:
+        return desc
+    _, rows = fetch_all(conn, DESCRIBE_TABLE, (schema, table), prepare=PREPARE_CATALOG_QUERIES)
+
+    columns = []
+    constraints: dict[tuple[str, str], list[tuple[int, str]]] = {}
+    indexes = []
+    fks = []
+    for kind, ord_, name, v1, v2, v3, v4 in rows:
+        if kind == "column":
+            columns.append((ord_, ColumnInfo(name, v1, v2 == "true", v3 or "")))
+        elif kind == "constraint":
+            constraints.setdefault((v1, name), []).append((ord_, v2))
+        elif kind == "index":
+            indexes.append(IndexInfo(name, v1 == "true", v2 == "true", v3 or ""))
+        elif kind == "fk":
+            fks.append((name, ord_, ForeignKeyInfo(name, v1, v2, v3, v4)))
+
+    desc = TableDescriptor(schema=schema, name=table)
+    desc.columns = [c for _, c in sorted(columns, key=lambda x: x[0])]
+    for (contype, cname), cols in sorted(constraints.items(), key=lambda x: x[0][1]):
+        col_names = [c for _, c in sorted(cols)]
+        if contype == "p":
+            desc.primary_key = col_names
+        else:
+            desc.uniques.append((cname, col_names))
+    desc.indexes = sorted(indexes, key=lambda i: (not i.is_primary, not i.is_unique, i.name))
+    desc.foreign_keys = [fk for _, _, fk in sorted(fks, key=lambda x: (x[0], x[1]))]
+    return desc
 
-        cols = ""
-        m = re.search(r"\((.*)\)", index_def)
-        if m:
-            cols = m.group(1).strip().replace(" ASC", "").replace(" DESC", "")
+@cached(ttl=SNAPSHOT_TTL)
+def load_schema_snapshot(conn, schema: str) -> SchemaSnapshot:
+    """
+    Carga columnas, constraints, índices y FKs de todas las relaciones del schema
+    con 5 consultas por conjunto. Las funciones get_* y describe_table lo usan mientras esté vigente.
+    """
+    snap = SchemaSnapshot(schema=schema)
 
-        unique_str = "" if is_primary else ("UNIQUE" if is_unique else "")
-        result.append((index_name, idx_type, cols, unique_str))
+    _, rows = fetch_all(conn, SNAPSHOT_RELATIONS, (schema,), prepare=PREPARE_CATALOG_QUERIES)
+    for oid, name, relkind, definition in rows:
+        snap.relations[oid] = (name, relkind)
+        snap.oid_by_name[name] = oid
+        if definition and relkind == "v":
+            snap.view_definitions[oid] = definition
+        elif definition and relkind == "S":
+            snap.sequence_definitions[oid] = definition
 
-    return result
+    _, rows = fetch_all(conn, SNAPSHOT_COLUMNS, (schema,), prepare=PREPARE_CATALOG_QUERIES)
+    for oid, name, dtype, notnull, default in rows:
+        snap.columns.setdefault(oid, []).append(ColumnInfo(name, dtype, bool(notnull), default or ""))
 
-def get_foreign_keys(conn, schema: str, table: str) -> list[tuple[str, str, str, str, str]]:
-    _, rows = fetch_all(conn, GET_FOREIGN_KEYS, (schema, table))
-    return rows
+    _, rows = fetch_all(conn, SNAPSHOT_CONSTRAINTS, (schema,), prepare=PREPARE_CATALOG_QUERIES)
+    uniques: dict[int, dict[str, list[str]]] = {}
+    for oid, cname, contype, col in rows:
+        if contype == "p":
+            snap.primary_keys.setdefault(oid, []).append(col)
+        else:
+            uniques.setdefault(oid, {}).setdefault(cname, []).append(col)
+    snap.uniques = {oid: list(by_name.items()) for oid, by_name in uniques.items()}
+
+    _, rows = fetch_all(conn, SNAPSHOT_FOREIGN_KEYS, (schema,), prepare=PREPARE_CATALOG_QUERIES)
+    for oid, fk_name, col, ref_schema, ref_table, ref_col in rows:
+        snap.foreign_keys.setdefault(oid, []).append(ForeignKeyInfo(fk_name, col, ref_schema, ref_table, ref_col))
+
+    _, rows = fetch_all(conn, SNAPSHOT_INDEXES, (schema,), prepare=PREPARE_CATALOG_QUERIES)
+    for oid, index_name, is_primary, is_unique, index_def in rows:
+        snap.indexes.setdefault(oid, []).append(IndexInfo(index_name, bool(is_primary), bool(is_unique), index_def or ""))
+
+    return snap
+
+def like_pattern(text: str) -> str:
+    """
+    Retorna: patrón ILIKE que busca text en cualquier parte ('%' si text está vacío).
+    """
+    if not text:
+        return "%"
+    escaped = text.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    return f"%{escaped}%"
+
+@cached
+def list_folder_page(conn: PGConnection, schema: str, kind: str, after: tuple, pattern: str, limit: int) -> list[tuple]:
+    """
+    Una página de la carpeta `kind` del árbol, ordenada por nombre.
+    after: claves de la última fila de la página anterior (FOLDER_START_KEYS para la primera).
+    Retorna: filas (name,) — (name, oid) para funciones, (tabla, índice) para índices;
+    la última fila sirve como `after` de la siguiente página.
+    """
+    if kind in _RELKINDS:
+        sql, params = PAGE_RELATIONS_BY_SCHEMA, (schema, _RELKINDS[kind], *after, pattern, limit)
+    elif kind == "type":
+        sql, params = PAGE_TYPES_BY_SCHEMA, (schema, *after, pattern, limit)
+    elif kind == "function":
+        sql, params = PAGE_FUNCTIONS_BY_SCHEMA, (schema, *after, pattern, limit)
+    elif kind == "index":
+        sql, params = PAGE_INDEXES_BY_SCHEMA, (schema, *after, pattern, pattern, limit)
+    else:
+        raise ValueError(f"Tipo de carpeta desconocido: {kind}")
+    _, rows = fetch_all(conn, sql, params, prepare=PREPARE_CATALOG_QUERIES)
+    return [tuple(r) for r in rows]
+
+def list_all_objects(conn: PGConnection) -> list[tuple[str, str, str, str]]:
+    """
+    Sin caché: lo usa el índice de búsqueda, que guarda su propia copia.
+    Retorna: [(schema, kind, name, tabla del índice o None)]
+    """
+    _, rows = fetch_all(conn, SEARCH_ALL_OBJECTS)
+    return [tuple(r) for r in rows]
+
+def get_cached_snapshot(conn, schema: str):
+    """
+    Snapshot vigente del schema o None; nunca consulta al servidor.
+    """
+    key = (conn_scope(conn), schema, load_schema_snapshot.__qualname__, (schema,))
+    return metadata_cache.peek(key)
+
+def _describe_from_snapshot(conn, schema: str, table: str):
+    snap = get_cached_snapshot(conn, schema)
+    if snap is None:
+        return None
+    return snap.describe(table)
 
 def list_tables(conn, schema: str = "public"):
     return list_tables_by_schema(conn, schema)
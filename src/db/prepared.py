@@ -0,0 +1,180 @@
+import hashlib
+import re
+import threading
+from dataclasses import dataclass
+from typing import Any, Iterable, Optional
+from psycopg2 import Error as PsycopgError
+from psycopg2 import extensions
+
+from db.instrumentation import query_label
+
+SAVEPOINT = "dmt_prepare"
+INVALID_SQL_STATEMENT_NAME = "26000"
+
+_PLACEHOLDER_RE = re.compile(r"%s|%%")
+
+
+@dataclass
+class PreparedStats:
+    prepares: int = 0
+    executes: int = 0
+    failures: int = 0
+
+
+stats = PreparedStats()
+
+# id(conn) -> (backend_pid, nombres preparados). backend_pid detecta si id() se reutilizó
+_prepared: dict[int, tuple[Optional[int], set[str]]] = {}
+# Sentencias que el servidor no pudo preparar: se ejecutan siempre sin PREPARE
+_unpreparable: set[str] = set()
+_lock = threading.Lock()
+
+
+def _backend_pid(conn) -> Optional[int]:
+    try:
+        return conn.info.backend_pid
+    except Exception:
+        return None
+
+
+def statement_name(sql: str) -> str:
+    label = query_label(sql)
+    if label.isupper() and label.replace("_", "").isalnum():
+        return "dmt_" + label.lower()
+    return "dmt_" + hashlib.sha1(sql.encode("utf-8")).hexdigest()[:12]
+
+
+def to_positional(sql: str) -> tuple[str, int]:
+    """
+    Pasa los %s de psycopg2 a $1, $2, ... (y %% a %) para PREPARE.
+    Retorna: (texto, cantidad de parámetros)
+    """
+    n = 0
+
+    def repl(m):
+        nonlocal n
+        if m.group(0) == "%%":
+            return "%"
+        n += 1
+        return f"${n}"
+
+    return _PLACEHOLDER_RE.sub(repl, sql.strip().rstrip(";")), n
+
+
+def prepared_names(conn) -> set[str]:
+    with _lock:
+        entry = _prepared.get(id(conn))
+        if entry is None or entry[0] != _backend_pid(conn):
+            return set()
+        return set(entry[1])
+
+
+def _mark(conn, name: str) -> None:
+    pid = _backend_pid(conn)
+    with _lock:
+        entry = _prepared.get(id(conn))
+        if entry is None or entry[0] != pid:
+            entry = _prepared[id(conn)] = (pid, set())
+        entry[1].add(name)
+
+
+def forget(conn) -> None:
+    """
+    Olvida lo preparado en conn (llamar al cerrarla).
+    """
+    with _lock:
+        _prepared.pop(id(conn), None)
+
+
+def _execute_sql(name: str, n_params: int) -> str:
+    if n_params:
+        return f"EXECUTE {name} ({', '.join(['%s'] * n_params)})"
+    return f"EXECUTE {name}"
+
+
+def _rollback_to_savepoint(cur) -> bool:
+    """
+    Retorna: False si el savepoint ya no existe (el lote falló después del RELEASE, en el EXECUTE)
+    """
+    try:
+        cur.execute(f"ROLLBACK TO SAVEPOINT {SAVEPOINT}")
+    except PsycopgError:
+        return False
+    return True
+
+
+def _prepare_and_execute(conn, cur, name: str, sql: str, params: tuple) -> bool:
+    """
+    Primer uso en la conexión: PREPARE y EXECUTE en un solo lote (una ida y vuelta, igual
+    que sin preparar). El PREPARE va dentro de un savepoint para que, si el servidor no
+    puede prepararla, no se aborte la transacción.
+    Retorna: False si no se pudo preparar (hay que ejecutar sql sin PREPARE)
+    """
+    text = to_positional(sql)[0] if params else sql.strip().rstrip(";")
+    if params:
+        # El lote entero pasa por la interpolación de psycopg2
+        text = text.replace("%", "%%")
+    prepare = f"PREPARE {name} AS {text}"
+    execute = _execute_sql(name, len(params))
+    # En autocommit no hay transacción que proteger (ni se pueden usar savepoints)
+    guarded = not conn.autocommit
+    if guarded:
+        batch = f"SAVEPOINT {SAVEPOINT}; {prepare}; RELEASE SAVEPOINT {SAVEPOINT}; {execute}"
+    else:
+        batch = f"{prepare}; {execute}"
+    try:
+        cur.execute(batch, params or None)
+    except PsycopgError:
+        if guarded and not _rollback_to_savepoint(cur):
+            # Falló la consulta, no el PREPARE: el mismo error que sin preparar
+            _mark(conn, name)
+            raise
+        with _lock:
+            _unpreparable.add(sql)
+            stats.failures += 1
+        return False
+    _mark(conn, name)
+    with _lock:
+        stats.prepares += 1
+        stats.executes += 1
+    return True
+
+
+def _is_missing_statement(e: PsycopgError) -> bool:
+    # invalid_sql_statement_name: DEALLOCATE / DISCARD ALL desde el editor, sesión reiniciada
+    return getattr(e, "pgcode", None) == INVALID_SQL_STATEMENT_NAME
+
+
+def execute_prepared(conn, cur, sql: str, params: Optional[Iterable[Any]] = None) -> None:
+    """
+    Ejecuta sql en cur usando PREPARE (una vez por conexión) + EXECUTE.
+    Si no se puede preparar, la ejecuta normalmente.
+    """
+    if sql in _unpreparable:
+        cur.execute(sql, params)
+        return
+
+    name = statement_name(sql)
+    params = tuple(params) if params is not None else ()
+    if name not in prepared_names(conn):
+        if not _prepare_and_execute(conn, cur, name, sql, params):
+            cur.execute(sql, params or None)
+        return
+
+    idle = conn.get_transaction_status() == extensions.TRANSACTION_STATUS_IDLE
+    try:
+        cur.execute(_execute_sql(name, len(params)), params or None)
+    except PsycopgError as e:
+        if not _is_missing_statement(e):
+            raise
+        # El servidor ya no tiene lo preparado en esta conexión
+        forget(conn)
+        if not idle:
+            # La transacción no es nuestra: no se deshace; la próxima llamada vuelve a preparar
+            raise
+        conn.rollback()
+        if not _prepare_and_execute(conn, cur, name, sql, params):
+            cur.execute(sql, params or None)
+        return
+    with _lock:
+        stats.executes += 1
@@ -0,0 +1,237 @@
+import re
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Hashable, Iterable, List, Optional
+
+from db.metadata_cache import conn_scope
+from db.instrumentation import estimate_bytes
+
+RESULT_CACHE_MAX_BYTES = 64 * 1024 * 1024
+RESULT_CACHE_TTL = 300.0
+# Un solo resultado no puede ocupar más de esta fracción de la caché
+RESULT_MAX_ENTRY_SHARE = 0.25
+ROW_OVERHEAD = 64   # bytes aproximados por tupla además de los valores
+
+_QUOTED_RE = re.compile(r"('(?:[^']|'')*'|\"(?:[^\"]|\"\")*\")")
+_IDENT = r'(?:"(?:[^"]|"")+"|[A-Za-z_][A-Za-z0-9_$]*)'
+_QNAME = rf"{_IDENT}(?:\s*\.\s*{_IDENT}){{0,2}}"
+_FROM_RE = re.compile(rf"\b(?:FROM|JOIN)\s+({_QNAME})", re.IGNORECASE)
+_MORE_FROM_RE = re.compile(rf"\s*(?:(?:AS\s+)?{_IDENT}\s*)?,\s*({_QNAME})", re.IGNORECASE)
+_WRITE_TARGET_RE = re.compile(
+    rf"\b(?:INSERT\s+INTO|UPSERT\s+INTO|UPDATE|DELETE\s+FROM|TRUNCATE(?:\s+TABLE)?|"
+    rf"(?:ALTER|DROP)\s+TABLE(?:\s+IF\s+EXISTS)?|COPY|IMPORT\s+INTO)\s+({_QNAME})",
+    re.IGNORECASE,
+)
+_NOT_CACHEABLE_RE = re.compile(
+    r"\b(INSERT|UPDATE|DELETE|UPSERT|FOR\s+(?:UPDATE|SHARE)|"
+    r"current_date|current_time|current_timestamp|localtime|localtimestamp)\b",
+    re.IGNORECASE,
+)
+_CALL_RE = re.compile(rf"({_IDENT})\s*\(")
+# Un SELECT se cachea solo si todas las funciones que llama son deterministas (están acá):
+# cualquier otra (now, clock_timestamp, unique_rowid, uuid_generate_v4, ...) lo deja fuera
+CACHEABLE_FUNCTIONS = frozenset({
+    "abs", "array_agg", "array_length", "array_position", "array_to_string", "avg", "bit_and", "bit_or",
+    "bool_and", "bool_or", "btrim", "cardinality", "cast", "ceil", "ceiling", "char_length", "coalesce",
+    "concat", "concat_ws", "count", "cume_dist", "date_part", "date_trunc", "dense_rank", "div", "every",
+    "exp", "extract", "first_value", "floor", "format", "greatest", "initcap", "json_agg",
+    "json_build_object", "jsonb_agg", "jsonb_array_elements", "jsonb_array_length", "jsonb_build_object",
+    "jsonb_extract_path", "jsonb_extract_path_text", "jsonb_object_agg", "lag", "last_value", "lead",
+    "least", "left", "length", "ln", "log", "lower", "lpad", "ltrim", "max", "md5", "min", "mod",
+    "nth_value", "ntile", "nullif", "octet_length", "percent_rank", "percentile_cont", "percentile_disc",
+    "position", "pow", "power", "rank", "regexp_replace", "repeat", "replace", "reverse", "right", "round",
+    "row_number", "rpad", "rtrim", "sha256", "sign", "split_part", "sqrt", "starts_with", "stddev",
+    "string_agg", "strpos", "substr", "substring", "sum", "to_char", "to_json", "to_jsonb", "trim", "trunc",
+    "unnest", "upper", "variance",
+})
+# Palabras clave y tipos que pueden ir antes de "(" sin ser una llamada
+_PAREN_KEYWORDS = frozenset({
+    "all", "and", "any", "array", "as", "between", "by", "case", "distinct", "else", "except", "exists",
+    "filter", "from", "having", "ilike", "in", "intersect", "is", "join", "lateral", "like", "limit", "not",
+    "offset", "on", "or", "over", "row", "select", "some", "then", "union", "using", "values", "when",
+    "where", "with", "within",
+    "bit", "char", "character", "decimal", "float", "interval", "numeric", "string", "time", "timestamp",
+    "timestamptz", "varbit", "varchar",
+})
+
+
+def _split_quoted(sql: str) -> List[str]:
+    # Alterna: fuera de comillas, entre comillas, fuera, ...
+    return _QUOTED_RE.split(sql)
+
+
+def normalize_sql(sql: str) -> str:
+    """
+    Colapsa espacios fuera de strings/identificadores entre comillas y quita el ';' final.
+    """
+    parts = _split_quoted((sql or "").strip().rstrip(";"))
+    return "".join(p if i % 2 else re.sub(r"\s+", " ", p) for i, p in enumerate(parts)).strip()
+
+
+def _code_only(sql: str) -> str:
+    # Texto sin el contenido de los strings, para buscar palabras clave
+    return " ".join(p for i, p in enumerate(_split_quoted(sql)) if i % 2 == 0 or p.startswith('"'))
+
+
+def _bare_name(qname: str) -> str:
+    last = re.findall(_IDENT, qname)[-1]
+    if last.startswith('"'):
+        return last[1:-1].replace('""', '"')
+    return last.lower()
+
+
+def referenced_tables(sql: str) -> set[str]:
+    """
+    Tablas de FROM/JOIN (incluye listas "FROM a, b"), sin schema.
+    """
+    code = _code_only(sql)
+    names = set()
+    for m in _FROM_RE.finditer(code):
+        names.add(_bare_name(m.group(1)))
+        pos = m.end()
+        while True:
+            more = _MORE_FROM_RE.match(code, pos)
+            if not more:
+                break
+            names.add(_bare_name(more.group(1)))
+            pos = more.end()
+    return names
+
+
+def written_tables(sql: str) -> Optional[set[str]]:
+    """
+    Tablas que modifica una sentencia; None si no se pudo deducir (invalidar todo).
+    """
+    names = {_bare_name(m.group(1)) for m in _WRITE_TARGET_RE.finditer(_code_only(sql))}
+    return names or None
+
+
+def called_functions(sql: str) -> set[str]:
+    """
+    Nombres (sin schema) seguidos de "(" que no son palabras clave.
+    """
+    code = _code_only(sql)
+    return {_bare_name(m.group(1)) for m in _CALL_RE.finditer(code)} - _PAREN_KEYWORDS
+
+
+def is_cacheable(sql: str) -> bool:
+    s = (sql or "").strip().lower()
+    if not (s.startswith("select") or s.startswith("with")):
+        return False
+    if _NOT_CACHEABLE_RE.search(_code_only(sql)):
+        return False
+    return called_functions(sql) <= CACHEABLE_FUNCTIONS
+
+
+@dataclass
+class CachedResult:
+    columns: List[str]
+    rows: List[tuple]
+    tables: set
+    size: int
+    created: float = field(default_factory=time.monotonic)
+    expires_at: Optional[float] = None
+
+    @property
+    def age(self) -> float:
+        return time.monotonic() - self.created
+
+
+def result_size(rows: List[tuple]) -> int:
+    return estimate_bytes(rows) + ROW_OVERHEAD * len(rows)
+
+
+class ResultCache:
+    """
+    Caché LRU de resultados de SELECT, limitada por bytes (estimados) y con TTL opcional.
+    Clave: (scope de la conexión, SQL normalizado, parámetros).
+    """
+
+    def __init__(self, max_bytes: int = RESULT_CACHE_MAX_BYTES):
+        self.max_bytes = max_bytes
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self._data: "OrderedDict[Hashable, CachedResult]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key(conn, sql: str, params: Optional[Iterable[Any]] = None) -> tuple:
+        return (conn_scope(conn), normalize_sql(sql), tuple(params) if params is not None else None)
+
+    def get(self, key) -> Optional[CachedResult]:
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is not None and entry.expires_at is not None and time.monotonic() >= entry.expires_at:
+                self._remove(key)
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return None
+            self._data.move_to_end(key)
+            self.hits += 1
+            return entry
+
+    def put(self, key, sql: str, columns: List[str], rows: List[tuple], ttl: Optional[float] = None) -> bool:
+        size = result_size(rows)
+        if size > self.max_bytes * RESULT_MAX_ENTRY_SHARE:
+            return False
+        entry = CachedResult(
+            columns=list(columns),
+            rows=list(rows),
+            tables=referenced_tables(sql),
+            size=size,
+        )
+        if ttl is not None:
+            entry.expires_at = entry.created + ttl
+        with self._lock:
+            if key in self._data:
+                self._remove(key)
+            self._data[key] = entry
+            self.bytes += size
+            while self.bytes > self.max_bytes and self._data:
+                self._remove(next(iter(self._data)))
+        return True
+
+    def _remove(self, key) -> None:
+        entry = self._data.pop(key)
+        self.bytes -= entry.size
+
+    def invalidate_tables(self, scope: tuple, tables: Optional[set]) -> int:
+        """
+        tables=None invalida todos los resultados de la base (scope).
+        """
+        with self._lock:
+            keys = [
+                k for k, e in self._data.items()
+                if k[0] == scope and (tables is None or not e.tables or e.tables & tables)
+            ]
+            for k in keys:
+                self._remove(k)
+            return len(keys)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+            self.bytes = 0
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._data)
+
+
+result_cache = ResultCache()
+
+
+def invalidate_results_for_sql(conn, sql: str) -> None:
+    """
+    Después de una escritura en conn, descarta los resultados que leen las tablas afectadas.
+    """
+    if not len(result_cache) or is_cacheable(sql):
+        return
+    s = (sql or "").strip().lower()
+    if s.startswith(("select", "show", "explain", "set", "begin", "commit", "rollback", "savepoint", "release")):
+        return
+    result_cache.invalidate_tables(conn_scope(conn), written_tables(sql))
@@ -0,0 +1,354 @@
+import hashlib
+import re
+from dataclasses import dataclass, field, replace
+from typing import Iterable, Optional
+from psycopg2.extensions import connection as PGConnection
+
+from db.objects_repo import list_schemas, load_schema_snapshot
+from models.schema_diff import DiffItem, SchemaDiff
+from models.schema_snapshot import SchemaSnapshot
+from models.table_descriptor import ColumnInfo, TableDescriptor
+
+# "CREATE INDEX x ON db.schema.tabla USING ..." -> la tabla se saca para comparar entre bases
+_IDENT = r'(?:"(?:[^"]|"")+"|[^\s."]+)'
+_INDEX_ON_RE = re.compile(rf"\s+ON\s+{_IDENT}(?:\.{_IDENT})*\s+")
+_TABLE = "<tabla>"
+_BARE_IDENT_RE = re.compile(r"[a-z_][a-z0-9_$]*")
+# Columna oculta que CockroachDB agrega a las tablas sin PK declarada
+HIDDEN_ROWID = ColumnInfo("rowid", "INT8", True, "unique_rowid()")
+
+
+def quote_ident(name: str) -> str:
+    return '"' + name.replace('"', '""') + '"'
+
+
+def _qualified(schema: str, name: str) -> str:
+    return f"{quote_ident(schema)}.{quote_ident(name)}"
+
+
+def _cols(names: Iterable[str]) -> str:
+    return ", ".join(quote_ident(c) for c in names)
+
+
+def unqualify_database(sql: str, database: str) -> str:
+    """
+    Quita "base." de los nombres de tres partes (base.schema.objeto).
+    CockroachDB guarda las vistas con la base incluida; sin esto, la misma vista en
+    staging y en producción se ve distinta y el CREATE VIEW apunta a la base de origen.
+    """
+    if not database:
+        return sql
+    names = [re.escape(quote_ident(database))]
+    if _BARE_IDENT_RE.fullmatch(database):
+        names.append(re.escape(database))
+    pattern = rf'(?<![\w$."])(?:{"|".join(names)})\.(?={_IDENT}\.{_IDENT})'
+    return re.sub(pattern, "", sql)
+
+
+def without_hidden_rowid(desc: TableDescriptor) -> TableDescriptor:
+    """
+    Retorna: desc sin la columna rowid implícita (ni la PK sobre ella), como la declaró el usuario.
+    """
+    if HIDDEN_ROWID not in desc.columns or desc.primary_key not in ([], ["rowid"]):
+        return desc
+    return replace(desc, columns=[c for c in desc.columns if c != HIDDEN_ROWID], primary_key=[])
+
+
+def fingerprint(value) -> str:
+    """
+    Retorna: hash estable de una estructura de tuplas/strings (repr canónico).
+    """
+    return hashlib.blake2b(repr(value).encode("utf-8"), digest_size=16).hexdigest()
+
+
+@dataclass
+class TableShape:
+    """
+    Una tabla descompuesta en partes comparables por nombre, cada una con su definición canónica.
+    """
+    desc: TableDescriptor
+    columns: dict[str, ColumnInfo] = field(default_factory=dict)
+    uniques: dict[str, tuple] = field(default_factory=dict)                 # nombre -> columnas
+    indexes: dict[str, str] = field(default_factory=dict)                   # nombre -> definición sin tabla
+    foreign_keys: dict[str, tuple] = field(default_factory=dict)            # nombre -> (cols, schema, tabla, cols ref)
+    fingerprint: str = ""
+
+    @classmethod
+    def from_descriptor(cls, desc: TableDescriptor) -> "TableShape":
+        desc = without_hidden_rowid(desc)
+        shape = cls(desc=desc)
+        shape.columns = {c.name: c for c in desc.columns}
+        shape.uniques = {name: tuple(cols) for name, cols in desc.uniques}
+        for idx in desc.indexes:
+            # El índice primario va con la PK y los UNIQUE ya están como constraint
+            if idx.is_primary or idx.name in shape.uniques:
+                continue
+            shape.indexes[idx.name] = _INDEX_ON_RE.sub(f" ON {_TABLE} ", idx.definition, count=1)
+        shape.foreign_keys = desc.grouped_foreign_keys()
+        # El orden de las columnas no se compara: no hay DDL que lo cambie
+        shape.fingerprint = fingerprint((
+            sorted(shape.columns.items()),
+            tuple(desc.primary_key),
+            sorted(shape.uniques.items()),
+            sorted(shape.indexes.items()),
+            sorted(shape.foreign_keys.items()),
+        ))
+        return shape
+
+
+@dataclass
+class Catalog:
+    """
+    Fingerprints de una base: (kind, schema, nombre) -> fingerprint, más las formas de las tablas.
+    """
+    schemas: set[str] = field(default_factory=set)
+    objects: dict[tuple[str, str, str], str] = field(default_factory=dict)
+    tables: dict[tuple[str, str], TableShape] = field(default_factory=dict)
+    views: dict[tuple[str, str], str] = field(default_factory=dict)
+    sequences: dict[tuple[str, str], str] = field(default_factory=dict)     # -> "INCREMENT 1 MINVALUE 1 ..."
+
+
+def build_catalog(snapshots: Iterable[SchemaSnapshot], database: str = "") -> Catalog:
+    """
+    database: base de los snapshots; se saca de las definiciones de las vistas.
+    """
+    catalog = Catalog()
+    for snap in snapshots:
+        catalog.schemas.add(snap.schema)
+        for name in snap.tables():
+            shape = TableShape.from_descriptor(snap.describe(name))
+            catalog.tables[(snap.schema, name)] = shape
+            catalog.objects[("table", snap.schema, name)] = shape.fingerprint
+        for name in snap.views():
+            definition = snap.view_definitions.get(snap.oid_by_name[name], "").strip().rstrip(";")
+            definition = unqualify_database(definition, database)
+            catalog.views[(snap.schema, name)] = definition
+            catalog.objects[("view", snap.schema, name)] = fingerprint(definition)
+        for name in snap.sequences():
+            definition = snap.sequence_definitions.get(snap.oid_by_name[name], "")
+            catalog.sequences[(snap.schema, name)] = definition
+            catalog.objects[("sequence", snap.schema, name)] = fingerprint(definition)
+    return catalog
+
+
+def take_catalog(conn: PGConnection, schemas: Optional[list[str]] = None) -> Catalog:
+    """
+    Lee el catálogo sin pasar por el caché (se compara el estado actual):
+    5 consultas por schema, sin importar cuántas tablas tenga.
+    """
+    if schemas is None:
+        schemas = list_schemas.__wrapped__(conn)
+    load = load_schema_snapshot.__wrapped__
+    catalog = build_catalog((load(conn, schema) for schema in schemas), conn.info.dbname)
+    conn.rollback()
+    return catalog
+
+
+def _column_def(c: ColumnInfo) -> str:
+    sql = f"{quote_ident(c.name)} {c.data_type}"
+    if c.not_null:
+        sql += " NOT NULL"
+    if c.default:
+        sql += f" DEFAULT {c.default}"
+    return sql
+
+
+def _create_table(schema: str, shape: TableShape) -> str:
+    """
+    CREATE TABLE con columnas, defaults, PK y UNIQUE; las FKs se agregan después.
+    """
+    lines = [f"    {_column_def(c)}" for c in shape.desc.columns]
+    if shape.desc.primary_key:
+        lines.append(f"    PRIMARY KEY ({_cols(shape.desc.primary_key)})")
+    for name, cols in sorted(shape.uniques.items()):
+        lines.append(f"    CONSTRAINT {quote_ident(name)} UNIQUE ({_cols(cols)})")
+    body = ",\n".join(lines)
+    return f"CREATE TABLE {_qualified(schema, shape.desc.name)} (\n{body}\n)"
+
+
+def _add_fk(schema: str, table: str, name: str, fk: tuple) -> str:
+    cols, ref_schema, ref_table, ref_cols = fk
+    return (
+        f"ALTER TABLE {_qualified(schema, table)} ADD CONSTRAINT {quote_ident(name)} "
+        f"FOREIGN KEY ({_cols(cols)}) REFERENCES {_qualified(ref_schema, ref_table)} ({_cols(ref_cols)})"
+    )
+
+
+def _drop_index(schema: str, table: str, name: str) -> str:
+    return f"DROP INDEX {_qualified(schema, table)}@{quote_ident(name)} CASCADE"
+
+
+def _changed(old: dict, new: dict):
+    """
+    Retorna: (agregados, quitados, cambiados) entre dos dicts nombre -> definición.
+    """
+    added = sorted(k for k in new if k not in old)
+    removed = sorted(k for k in old if k not in new)
+    changed = sorted(k for k in new if k in old and new[k] != old[k])
+    return added, removed, changed
+
+
+class _Migration:
+    """
+    Acumula sentencias por fase para que el script se pueda ejecutar de corrido:
+    primero se quita lo que sobra (vistas, FKs, índices, tablas), después se crea lo nuevo.
+    """
+    PHASES = (
+        "drop_view", "drop_fk", "drop_index", "drop_table", "drop_sequence", "drop_schema",
+        "create_schema", "create_sequence", "alter_sequence", "create_table", "alter_column",
+        "primary_key", "add_unique", "create_index", "add_fk", "create_view",
+    )
+
+    def __init__(self):
+        self.phases: dict[str, list[str]] = {p: [] for p in self.PHASES}
+
+    def add(self, phase: str, sql: str) -> None:
+        self.phases[phase].append(sql)
+
+    def statements(self) -> list[str]:
+        return [s for p in self.PHASES for s in self.phases[p]]
+
+
+def _diff_columns(schema: str, table: str, old: TableShape, new: TableShape, items: list, mig: _Migration):
+    qname = _qualified(schema, table)
+    added, removed, changed = _changed(old.columns, new.columns)
+    for name in added:
+        items.append(DiffItem("added", "column", schema, f"{table}.{name}", new.columns[name].data_type))
+        mig.add("alter_column", f"ALTER TABLE {qname} ADD COLUMN {_column_def(new.columns[name])}")
+    for name in removed:
+        items.append(DiffItem("removed", "column", schema, f"{table}.{name}"))
+        mig.add("alter_column", f"ALTER TABLE {qname} DROP COLUMN {quote_ident(name)}")
+    for name in changed:
+        a, b = old.columns[name], new.columns[name]
+        col = f"ALTER TABLE {qname} ALTER COLUMN {quote_ident(name)}"
+        details = []
+        if a.data_type != b.data_type:
+            details.append(f"{a.data_type} -> {b.data_type}")
+            mig.add("alter_column", f"{col} TYPE {b.data_type}")
+        if a.default != b.default:
+            details.append(f"default {a.default or '(ninguno)'} -> {b.default or '(ninguno)'}")
+            mig.add("alter_column", f"{col} SET DEFAULT {b.default}" if b.default else f"{col} DROP DEFAULT")
+        if a.not_null != b.not_null:
+            details.append("NOT NULL" if b.not_null else "NULL")
+            mig.add("alter_column", f"{col} {'SET' if b.not_null else 'DROP'} NOT NULL")
+        items.append(DiffItem("changed", "column", schema, f"{table}.{name}", ", ".join(details)))
+
+
+def _diff_table(schema: str, table: str, old: TableShape, new: TableShape, items: list, mig: _Migration):
+    qname = _qualified(schema, table)
+    _diff_columns(schema, table, old, new, items, mig)
+
+    if list(old.desc.primary_key) != list(new.desc.primary_key):
+        items.append(DiffItem("changed", "primary_key", schema, table,
+                              f"({', '.join(old.desc.primary_key)}) -> ({', '.join(new.desc.primary_key)})"))
+        mig.add("primary_key", f"ALTER TABLE {qname} ALTER PRIMARY KEY USING COLUMNS ({_cols(new.desc.primary_key)})")
+
+    added, removed, changed = _changed(old.uniques, new.uniques)
+    for name in removed + changed:
+        mig.add("drop_index", _drop_index(schema, table, name))
+    for name in added + changed:
+        mig.add("add_unique", f"ALTER TABLE {qname} ADD CONSTRAINT {quote_ident(name)} UNIQUE ({_cols(new.uniques[name])})")
+    _report(items, "unique", schema, table, added, removed, changed)
+
+    added, removed, changed = _changed(old.indexes, new.indexes)
+    for name in removed + changed:
+        mig.add("drop_index", _drop_index(schema, table, name))
+    for name in added + changed:
+        mig.add("create_index", new.indexes[name].replace(_TABLE, qname, 1))
+    _report(items, "index", schema, table, added, removed, changed)
+
+    added, removed, changed = _changed(old.foreign_keys, new.foreign_keys)
+    for name in removed + changed:
+        mig.add("drop_fk", f"ALTER TABLE {qname} DROP CONSTRAINT {quote_ident(name)}")
+    for name in added + changed:
+        mig.add("add_fk", _add_fk(schema, table, name, new.foreign_keys[name]))
+    _report(items, "foreign_key", schema, table, added, removed, changed)
+
+
+def _report(items: list, kind: str, schema: str, table: str, added, removed, changed):
+    for change, names in (("added", added), ("removed", removed), ("changed", changed)):
+        for name in names:
+            items.append(DiffItem(change, kind, schema, f"{table}.{name}"))
+
+
+def diff_catalogs(source: Catalog, target: Catalog) -> SchemaDiff:
+    """
+    Qué hay que cambiar en target para que quede como source.
+    Los objetos con el mismo fingerprint se saltean sin mirar su contenido.
+    """
+    diff = SchemaDiff()
+    mig = _Migration()
+    items = diff.items
+
+    for schema in sorted(source.schemas - target.schemas):
+        items.append(DiffItem("added", "schema", schema, ""))
+        mig.add("create_schema", f"CREATE SCHEMA IF NOT EXISTS {quote_ident(schema)}")
+
+    for schema in sorted(target.schemas - source.schemas):
+        items.append(DiffItem("removed", "schema", schema, ""))
+        mig.add("drop_schema", f"DROP SCHEMA {quote_ident(schema)}")
+
+    keys = source.objects.keys() | target.objects.keys()
+    diff.compared = len(keys)
+    for key in sorted(keys):
+        kind, schema, name = key
+        new_fp = source.objects.get(key)
+        old_fp = target.objects.get(key)
+        if new_fp == old_fp:
+            diff.unchanged += 1
+            continue
+
+        qname = _qualified(schema, name)
+        if kind == "table":
+            new, old = source.tables.get((schema, name)), target.tables.get((schema, name))
+            if old is None:
+                items.append(DiffItem("added", "table", schema, name, f"{len(new.columns)} columnas"))
+                mig.add("create_table", _create_table(schema, new))
+                for idx_name, definition in sorted(new.indexes.items()):
+                    mig.add("create_index", definition.replace(_TABLE, qname, 1))
+                for fk_name, fk in sorted(new.foreign_keys.items()):
+                    mig.add("add_fk", _add_fk(schema, name, fk_name, fk))
+            elif new is None:
+                items.append(DiffItem("removed", "table", schema, name))
+                # Las FKs salen antes, así el orden de los DROP TABLE no importa
+                for fk_name in sorted(old.foreign_keys):
+                    mig.add("drop_fk", f"ALTER TABLE {qname} DROP CONSTRAINT {quote_ident(fk_name)}")
+                mig.add("drop_table", f"DROP TABLE {qname}")
+            else:
+                items.append(DiffItem("changed", "table", schema, name))
+                _diff_table(schema, name, old, new, items, mig)
+
+        elif kind == "view":
+            if old_fp is not None:
+                mig.add("drop_view", f"DROP VIEW {qname}")
+            if new_fp is not None:
+                mig.add("create_view", f"CREATE VIEW {qname} AS {source.views[(schema, name)]}")
+            change = "changed" if new_fp is not None and old_fp is not None else ("added" if old_fp is None else "removed")
+            items.append(DiffItem(change, "view", schema, name))
+
+        elif kind == "sequence":
+            new, old = source.sequences.get((schema, name)), target.sequences.get((schema, name))
+            if old is None:
+                items.append(DiffItem("added", "sequence", schema, name, new))
+                mig.add("create_sequence", f"CREATE SEQUENCE {qname} {new}".rstrip())
+            elif new is None:
+                items.append(DiffItem("removed", "sequence", schema, name))
+                mig.add("drop_sequence", f"DROP SEQUENCE {qname}")
+            else:
+                items.append(DiffItem("changed", "sequence", schema, name, f"{old} -> {new}"))
+                mig.add("alter_sequence", f"ALTER SEQUENCE {qname} {new}")
+
+    diff.statements = mig.statements()
+    return diff
+
+
+def compare_databases(
+    source_conn: PGConnection,
+    target_conn: PGConnection,
+    schemas: Optional[list[str]] = None,
+) -> SchemaDiff:
+    """
+    Diff entre dos bases (pueden estar en servidores distintos).
+    schemas: None = todos los schemas de usuario de las dos bases.
+    """
+    return diff_catalogs(take_catalog(source_conn, schemas), take_catalog(target_conn, schemas))
@@ -0,0 +1,248 @@
+import time
+from dataclasses import dataclass, field
+from typing import Callable, List, Optional
+from psycopg2.extensions import connection as PGConnection
+from psycopg2 import Error as PsycopgError
+
+from db.metadata_cache import invalidate_for_sql
+from db.instrumentation import query_label, record_call
+from db.result_cache import invalidate_results_for_sql
+
+SCRIPT_MAX_ROWS = 10_000
+SAVEPOINT = "dmt_script_stmt"
+
+
+@dataclass
+class StatementResult:
+    index: int
+    sql: str
+    elapsed: float = 0.0
+    rowcount: int = -1
+    columns: List[str] = field(default_factory=list)
+    rows: List[tuple] = field(default_factory=list)
+    truncated: bool = False
+    error: Optional[str] = None
+
+    @property
+    def returns_rows(self) -> bool:
+        return bool(self.columns)
+
+
+@dataclass
+class ScriptResult:
+    statements: List[StatementResult] = field(default_factory=list)
+    total: int = 0
+    elapsed: float = 0.0
+    committed: bool = True
+    stopped: bool = False
+
+    @property
+    def errors(self) -> List[StatementResult]:
+        return [s for s in self.statements if s.error]
+
+    def summary(self) -> str:
+        ran = len(self.statements)
+        msg = f"{ran} de {self.total} sentencia(s) en {self.elapsed:.2f} s; {len(self.errors)} con error."
+        if not self.committed:
+            msg += " Transacción revertida."
+        elif self.stopped:
+            msg += " Detenido."
+        return msg
+
+
+def _is_ident_char(ch: str) -> bool:
+    return ch.isalnum() or ch in "_$"
+
+
+def split_statements(sql: str) -> List[str]:
+    """
+    Separa un script por ';' respetando strings ('...', E'...'), identificadores "..",
+    dollar quotes ($tag$...$tag$) y comentarios (-- y /* */ anidados).
+    Omite sentencias vacías o que solo tienen comentarios.
+    """
+    statements = []
+    n = len(sql)
+    i = 0
+    start = 0
+    has_code = False
+
+    def flush(end: int):
+        nonlocal start, has_code
+        if has_code:
+            statements.append(sql[start:end].strip())
+        start = end + 1
+        has_code = False
+
+    while i < n:
+        ch = sql[i]
+        nxt = sql[i + 1] if i + 1 < n else ""
+
+        if ch == "-" and nxt == "-":
+            j = sql.find("\n", i)
+            i = n if j < 0 else j + 1
+            continue
+
+        if ch == "/" and nxt == "*":
+            depth = 1
+            i += 2
+            while i < n and depth:
+                if sql.startswith("/*", i):
+                    depth += 1
+                    i += 2
+                elif sql.startswith("*/", i):
+                    depth -= 1
+                    i += 2
+                else:
+                    i += 1
+            continue
+
+        if ch == "'":
+            prev = sql[i - 1] if i > 0 else ""
+            prev2 = sql[i - 2] if i > 1 else ""
+            backslash = prev in "eE" and not _is_ident_char(prev2)
+            has_code = True
+            i += 1
+            while i < n:
+                if backslash and sql[i] == "\\":
+                    i += 2
+                    continue
+                if sql[i] == "'":
+                    if i + 1 < n and sql[i + 1] == "'":
+                        i += 2
+                        continue
+                    break
+                i += 1
+            i += 1
+            continue
+
+        if ch == '"':
+            has_code = True
+            i += 1
+            while i < n:
+                if sql[i] == '"':
+                    if i + 1 < n and sql[i + 1] == '"':
+                        i += 2
+                        continue
+                    break
+                i += 1
+            i += 1
+            continue
+
+        if ch == "$" and (i == 0 or not _is_ident_char(sql[i - 1])):
+            j = i + 1
+            while j < n and (sql[j].isalnum() or sql[j] == "_"):
+                j += 1
+            tag_name = sql[i + 1:j]
+            if j < n and sql[j] == "$" and not tag_name[:1].isdigit():
+                tag = sql[i:j + 1]
+                end = sql.find(tag, j + 1)
+                has_code = True
+                i = n if end < 0 else end + len(tag)
+                continue
+
+        if ch == ";":
+            flush(i)
+            i += 1
+            continue
+
+        if not ch.isspace():
+            has_code = True
+        i += 1
+
+    flush(n)
+    return statements
+
+
+def run_script(
+    conn: PGConnection,
+    sql: str,
+    single_transaction: bool = False,
+    stop_on_error: bool = True,
+    max_rows: int = SCRIPT_MAX_ROWS,
+    on_statement: Optional[Callable[[StatementResult], None]] = None,
+    should_stop: Optional[Callable[[], bool]] = None,
+) -> ScriptResult:
+    """
+    Ejecuta las sentencias del script en orden.
+    - single_transaction: todo en una transacción; con stop_on_error=False cada sentencia
+      va dentro de un SAVEPOINT para poder seguir después de un error.
+    - Sin single_transaction cada sentencia se confirma por separado.
+    Las sentencias que devuelven filas (según cursor.description) guardan hasta max_rows filas.
+    """
+    statements = split_statements(sql)
+    result = ScriptResult(total=len(statements))
+    use_savepoint = single_transaction and not stop_on_error
+    script_start = time.monotonic()
+
+    for idx, stmt in enumerate(statements, start=1):
+        if should_stop and should_stop():
+            result.stopped = True
+            if single_transaction:
+                result.committed = False
+            break
+
+        res = StatementResult(index=idx, sql=stmt)
+        t0 = time.monotonic()
+        try:
+            with conn.cursor() as cur:
+                if use_savepoint:
+                    cur.execute(f"SAVEPOINT {SAVEPOINT}")
+                cur.execute(stmt)
+                res.rowcount = cur.rowcount
+                if cur.description:
+                    res.columns = [d[0] for d in cur.description]
+                    res.rows = cur.fetchmany(max_rows)
+                    res.truncated = cur.fetchone() is not None
+                if use_savepoint:
+                    cur.execute(f"RELEASE SAVEPOINT {SAVEPOINT}")
+            if not single_transaction:
+                conn.commit()
+                invalidate_for_sql(conn, stmt)
+                invalidate_results_for_sql(conn, stmt)
+        except PsycopgError as e:
+            res.error = str(e).strip()
+            if use_savepoint:
+                try:
+                    with conn.cursor() as cur:
+                        cur.execute(f"ROLLBACK TO SAVEPOINT {SAVEPOINT}")
+                except PsycopgError:
+                    conn.rollback()
+                    result.committed = False
+            else:
+                conn.rollback()
+                if single_transaction:
+                    result.committed = False
+
+        res.elapsed = time.monotonic() - t0
+        record_call(
+            "script", query_label(stmt), t0, conn,
+            rows=res.rows if res.returns_rows else None, rowcount=res.rowcount,
+            error=res.error,
+        )
+        result.statements.append(res)
+        if on_statement:
+            on_statement(res)
+
+        if res.error and (stop_on_error or not result.committed):
+            result.stopped = True
+            break
+
+    if single_transaction:
+        if result.committed:
+            try:
+                conn.commit()
+            except PsycopgError as e:
+                conn.rollback()
+                result.committed = False
+                if result.statements:
+                    result.statements[-1].error = result.statements[-1].error or str(e).strip()
+        else:
+            conn.rollback()
+        if result.committed:
+            for res in result.statements:
+                if not res.error:
+                    invalidate_for_sql(conn, res.sql)
+                    invalidate_results_for_sql(conn, res.sql)
+
+    result.elapsed = time.monotonic() - script_start
+    return result
@@ -0,0 +1,108 @@
+import threading
+from typing import Optional
+from psycopg2.extensions import connection as PGConnection
+from psycopg2 import Error as PsycopgError
+
+from db.execute import fetch_all
+from db.crdb_system_tables import STATEMENT_STATISTICS_SINCE, NODE_STATEMENT_STATISTICS
+from models.statement_stat import StatementStat
+
+STATS_WINDOW = 3600         # segundos hacia atrás en la primera lectura
+STATS_TOP_N = 50
+ORDER_KEYS = {
+    "total_latency": lambda s: s.total_latency,
+    "mean_latency": lambda s: s.mean_latency,
+    "rows_read": lambda s: s.rows_read,
+    "contention": lambda s: s.contention,
+}
+
+
+class StatementStatsCollector:
+    """
+    Lee crdb_internal.statement_statistics de forma incremental.
+    Las filas vienen por bucket de agregación (aggregated_ts) y solo el bucket más reciente
+    sigue cambiando, así que cada poll trae únicamente los buckets >= al último visto
+    y reemplaza su aporte. Si la tabla no está disponible se usa node_statement_statistics
+    (acumulados por nodo, sin buckets: se lee completa en cada poll).
+    poll() corre en segundo plano y stats()/top() en el hilo de Tk: el estado va bajo _lock.
+    """
+
+    def __init__(self, window: int = STATS_WINDOW):
+        self.window = window
+        self.source: Optional[str] = None           # "cluster" | "node"
+        self._watermark = None                      # último aggregated_ts visto
+        self._buckets: dict[tuple[str, object], tuple] = {}
+        self._meta: dict[str, tuple[str, str]] = {} # fingerprint -> (query, database)
+        self._node: dict[str, StatementStat] = {}
+        self._lock = threading.Lock()
+
+    def reset(self) -> None:
+        with self._lock:
+            self.source = None
+            self._watermark = None
+            self._buckets.clear()
+            self._meta.clear()
+            self._node.clear()
+
+    def poll(self, conn: PGConnection) -> int:
+        """
+        Retorna: cantidad de filas leídas en este poll.
+        """
+        if self.source != "node":
+            try:
+                _, rows = fetch_all(conn, STATEMENT_STATISTICS_SINCE, (self._watermark, self.window))
+                conn.rollback()
+                with self._lock:
+                    self.source = "cluster"
+                    self._merge_buckets(rows)
+                return len(rows)
+            except PsycopgError:
+                conn.rollback()
+                if self.source == "cluster":
+                    raise
+                with self._lock:
+                    self.source = "node"
+
+        _, rows = fetch_all(conn, NODE_STATEMENT_STATISTICS)
+        conn.rollback()
+        node = {
+            r[0]: StatementStat(
+                fingerprint=r[0], query=r[1] or "", database=r[2] or "",
+                count=int(r[3] or 0), total_latency=float(r[4] or 0),
+                rows_read=float(r[5] or 0), contention=float(r[6] or 0),
+            )
+            for r in rows
+        }
+        with self._lock:
+            self._node = node
+        return len(rows)
+
+    def _merge_buckets(self, rows) -> None:
+        for fp, query, database, ts, cnt, total, rows_read, contention in rows:
+            self._buckets[(fp, ts)] = (int(cnt or 0), float(total or 0), float(rows_read or 0), float(contention or 0))
+            self._meta[fp] = (query or "", database or "")
+            if self._watermark is None or ts > self._watermark:
+                self._watermark = ts
+
+    def stats(self) -> list[StatementStat]:
+        with self._lock:
+            if self.source == "node":
+                return list(self._node.values())
+            buckets = list(self._buckets.items())
+            meta = dict(self._meta)
+
+        out: dict[str, StatementStat] = {}
+        for (fp, _), (cnt, total, rows_read, contention) in buckets:
+            s = out.get(fp)
+            if s is None:
+                query, database = meta.get(fp, ("", ""))
+                s = out[fp] = StatementStat(fingerprint=fp, query=query, database=database)
+            s.count += cnt
+            s.total_latency += total
+            s.rows_read += rows_read
+            s.contention += contention
+        return list(out.values())
+
+    def top(self, n: int = STATS_TOP_N, order_by: str = "total_latency") -> list[StatementStat]:
+        key = ORDER_KEYS[order_by]
+        return sorted(self.stats(), key=key, reverse=True)[:n]
@@ -0,0 +1,154 @@
+from dataclasses import dataclass, field
+from typing import Any, Optional, Sequence
+from psycopg2.extensions import connection as PGConnection
+
+from db.execute import fetch_all
+from db.objects_repo import describe_table, get_primary_key_columns
+
+BROWSE_PAGE_SIZE = 200
+ROWID = "rowid"   # columna oculta de CockroachDB en tablas sin primary key explícita
+
+
+def quote_ident(name: str) -> str:
+    return '"' + name.replace('"', '""') + '"'
+
+
+@dataclass
+class BrowsePage:
+    columns: list[str]
+    rows: list[tuple]
+    has_prev: bool
+    has_next: bool
+    first_key: Optional[tuple] = None
+    last_key: Optional[tuple] = None
+
+
+@dataclass
+class TableBrowser:
+    """
+    Paginación keyset de una tabla: cada página es "WHERE (orden) > (última clave) LIMIT n"
+    sobre un índice, así que cuesta lo mismo en la página 1 que en la 10.000 (sin OFFSET).
+    El orden es la columna elegida (si hay) seguida de la primary key, para que sea único.
+    """
+    schema: str
+    table: str
+    key_columns: list[str]
+    sortable: list[str] = field(default_factory=list)
+    sort_column: Optional[str] = None
+    descending: bool = False
+    page_size: int = BROWSE_PAGE_SIZE
+    page: Optional[BrowsePage] = None
+    page_no: Optional[int] = None   # None después de saltar a una clave
+
+    @property
+    def order_columns(self) -> list[str]:
+        cols = [self.sort_column] if self.sort_column else []
+        return cols + [c for c in self.key_columns if c not in cols]
+
+    def set_sort(self, column: Optional[str], descending: bool = False) -> None:
+        if column is not None and column not in self.sortable:
+            raise ValueError(f"La columna {column} no tiene índice: no se puede ordenar sin recorrer la tabla.")
+        self.sort_column = column
+        self.descending = descending
+        self.page = None
+        self.page_no = None
+
+    def _select(self, where: str, backwards: bool) -> str:
+        order = self.order_columns
+        # Las columnas de orden van al final con alias propio: SELECT * no incluye rowid
+        keys = ", ".join(f"{quote_ident(c)} AS {quote_ident(f'__key{i}')}" for i, c in enumerate(order))
+        desc = self.descending != backwards
+        direction = " DESC" if desc else ""
+        order_by = ", ".join(quote_ident(c) + direction for c in order)
+        return (
+            f"SELECT *, {keys} FROM {quote_ident(self.schema)}.{quote_ident(self.table)}"
+            f"{where} ORDER BY {order_by} LIMIT {self.page_size + 1}"
+        )
+
+    def _where(self, key: Sequence[Any], op: str) -> str:
+        cols = ", ".join(quote_ident(c) for c in self.order_columns[:len(key)])
+        marks = ", ".join(["%s"] * len(key))
+        return f" WHERE ({cols}) {op} ({marks})"
+
+    def _fetch(self, conn: PGConnection, key: Optional[Sequence[Any]], op: str, backwards: bool) -> BrowsePage:
+        where = self._where(key, op) if key else ""
+        columns, rows = fetch_all(conn, self._select(where, backwards), tuple(key) if key else None)
+        conn.rollback()
+
+        more = len(rows) > self.page_size
+        rows = rows[:self.page_size]
+        if backwards:
+            rows.reverse()
+
+        nkeys = len(self.order_columns)
+        visible = columns[:-nkeys]
+        data = [tuple(r[:-nkeys]) for r in rows]
+        first_key = tuple(rows[0][-nkeys:]) if rows else None
+        last_key = tuple(rows[-1][-nkeys:]) if rows else None
+        if backwards:
+            return BrowsePage(visible, data, has_prev=more, has_next=True, first_key=first_key, last_key=last_key)
+        return BrowsePage(visible, data, has_prev=False, has_next=more, first_key=first_key, last_key=last_key)
+
+    def _forward_op(self) -> str:
+        return "<" if self.descending else ">"
+
+    def first_page(self, conn: PGConnection) -> BrowsePage:
+        self.page = self._fetch(conn, None, ">", backwards=False)
+        self.page_no = 1
+        return self.page
+
+    def next_page(self, conn: PGConnection) -> BrowsePage:
+        if self.page is None or self.page.last_key is None:
+            return self.first_page(conn)
+        page = self._fetch(conn, self.page.last_key, self._forward_op(), backwards=False)
+        if not page.rows:
+            self.page.has_next = False
+            return self.page
+        page.has_prev = True
+        self.page = page
+        self.page_no = self.page_no + 1 if self.page_no is not None else None
+        return page
+
+    def prev_page(self, conn: PGConnection) -> BrowsePage:
+        if self.page is None or self.page.first_key is None:
+            return self.first_page(conn)
+        back_op = ">" if self.descending else "<"
+        page = self._fetch(conn, self.page.first_key, back_op, backwards=True)
+        if not page.has_prev:
+            # Llegamos al principio: mejor una primera página completa que una corta
+            return self.first_page(conn)
+        self.page = page
+        self.page_no = self.page_no - 1 if self.page_no is not None else None
+        return page
+
+    def seek(self, conn: PGConnection, values: Sequence[Any]) -> BrowsePage:
+        """
+        Salta a la primera fila con (columnas de orden) >= values (<= si es descendente).
+        values puede ser un prefijo de las columnas de orden.
+        """
+        values = list(values)[:len(self.order_columns)]
+        if not values:
+            return self.first_page(conn)
+        page = self._fetch(conn, values, "<=" if self.descending else ">=", backwards=False)
+        page.has_prev = True
+        self.page = page
+        self.page_no = None
+        return page
+
+
+def open_browser(conn: PGConnection, schema: str, table: str, page_size: int = BROWSE_PAGE_SIZE) -> TableBrowser:
+    """
+    Arma el TableBrowser de una tabla: clave = primary key (o rowid si no tiene) y
+    columnas ordenables = primera columna NOT NULL de cada índice.
+    """
+    key = get_primary_key_columns(conn, schema, table) or [ROWID]
+    desc = describe_table(conn, schema, table)
+    not_null = {c.name for c in desc.columns if c.not_null}
+
+    sortable = []
+    for idx in desc.indexes:
+        first = idx.columns.split(",")[0].strip().strip('"')
+        # Con NULLs la comparación por tupla los saltearía: solo columnas NOT NULL
+        if first and first in not_null and first not in sortable:
+            sortable.append(first)
+    return TableBrowser(schema=schema, table=table, key_columns=list(key), sortable=sortable, page_size=page_size)
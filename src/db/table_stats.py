@@ -0,0 +1,59 @@
+from psycopg2.extensions import connection as PGConnection
+from psycopg2 import Error as PsycopgError
+
+from db.execute import fetch_all
+from db.metadata_cache import cached
+from db.crdb_system_tables import (
+    TABLE_ROW_STATISTICS,
+    TABLE_LATEST_STATISTICS,
+    TABLE_SPAN_STATS,
+    TABLE_RANGE_COUNT,
+)
+from db.table_browser import quote_ident
+from models.table_stats import TableStats
+
+# Los números cambian con la carga: se guardan poco tiempo
+TABLE_STATS_TTL = 30.0
+
+
+def _first_row(conn: PGConnection, sql: str, params=None):
+    """
+    Retorna: la primera fila, o None si la consulta falla (fuente no disponible en esta versión).
+    """
+    try:
+        _, rows = fetch_all(conn, sql, params)
+        conn.rollback()
+        return rows[0] if rows else None
+    except PsycopgError:
+        conn.rollback()
+        return None
+
+
+@cached(ttl=TABLE_STATS_TTL)
+def get_table_stats(conn: PGConnection, schema: str, table: str) -> TableStats:
+    """
+    Filas aproximadas, bytes y rangos sin recorrer la tabla.
+    """
+    qname = f"{quote_ident(schema)}.{quote_ident(table)}"
+    stats = TableStats(schema=schema, name=table)
+
+    row = _first_row(conn, TABLE_ROW_STATISTICS, (qname,))
+    if row is not None and row[0] is not None:
+        stats.estimated_rows = int(row[0])
+
+    row = _first_row(conn, TABLE_LATEST_STATISTICS.format(table=qname))
+    if row is not None:
+        stats.stats_created = row[0]
+        stats.stats_rows = int(row[1]) if row[1] is not None else None
+
+    row = _first_row(conn, TABLE_SPAN_STATS.format(table=qname))
+    if row is not None:
+        stats.range_count = int(row[0])
+        stats.live_bytes = int(row[1]) if row[1] is not None else None
+        stats.total_bytes = int(row[2]) if row[2] is not None else None
+    else:
+        row = _first_row(conn, TABLE_RANGE_COUNT.format(table=qname))
+        if row is not None:
+            stats.range_count = int(row[0])
+
+    return stats
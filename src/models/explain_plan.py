@@ -0,0 +1,61 @@
+from dataclasses import dataclass, field
+from typing import Iterator, Optional
+
+
+@dataclass
+class PlanNode:
+    """
+    Un operador del plan (• scan, • hash join, ...) con sus atributos tal como
+    los imprime EXPLAIN y las métricas ya convertidas.
+    """
+    name: str
+    depth: int = 0
+    attrs: list[tuple[str, str]] = field(default_factory=list)
+    children: list["PlanNode"] = field(default_factory=list)
+
+    rows: Optional[int] = None          # actual row count (solo con ANALYZE)
+    estimated_rows: Optional[int] = None
+    time: Optional[float] = None        # segundos (execution time o KV time)
+    memory: Optional[int] = None        # bytes
+    spill: Optional[int] = None         # bytes en disco temporal
+    table: Optional[str] = None         # tabla sin índice (t de "t@t_pkey")
+    index: Optional[str] = None
+    full_scan: bool = False
+
+    hot: bool = False
+    known_table: Optional[str] = None   # schema.tabla si la tabla existe en el catálogo
+
+    def attr(self, key: str) -> Optional[str]:
+        for k, v in self.attrs:
+            if k == key:
+                return v
+        return None
+
+    def walk(self) -> Iterator["PlanNode"]:
+        yield self
+        for ch in self.children:
+            yield from ch.walk()
+
+    @property
+    def cost(self) -> float:
+        # Sin tiempos (EXPLAIN sin ANALYZE) se usan las filas como aproximación
+        if self.time is not None:
+            return self.time
+        return float(self.rows if self.rows is not None else (self.estimated_rows or 0))
+
+
+@dataclass
+class ExplainPlan:
+    header: list[tuple[str, str]] = field(default_factory=list)   # planning time, execution time, ...
+    roots: list[PlanNode] = field(default_factory=list)
+    text: str = ""
+    analyzed: bool = False
+
+    def nodes(self) -> list[PlanNode]:
+        return [n for r in self.roots for n in r.walk()]
+
+    def full_scans(self) -> list[PlanNode]:
+        return [n for n in self.nodes() if n.full_scan]
+
+    def hottest(self, n: int = 3) -> list[PlanNode]:
+        return sorted(self.nodes(), key=lambda x: x.cost, reverse=True)[:n]
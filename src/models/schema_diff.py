@@ -0,0 +1,37 @@
+from dataclasses import dataclass, field
+
+
+@dataclass(frozen=True)
+class DiffItem:
+    change: str       # added | removed | changed
+    kind: str         # schema | table | view | sequence | column | primary_key | unique | index | foreign_key
+    schema: str
+    name: str         # "tabla" o "tabla.objeto"
+    detail: str = ""
+
+    def as_row(self) -> tuple[str, str, str, str]:
+        """
+        Retorna: (cambio, tipo, objeto, detalle) como lo muestra el diálogo.
+        """
+        return (self.change, self.kind, f"{self.schema}.{self.name}", self.detail)
+
+
+@dataclass
+class SchemaDiff:
+    """
+    Diferencias para llevar el destino al estado del origen, con el DDL que lo hace.
+    """
+    items: list[DiffItem] = field(default_factory=list)
+    statements: list[str] = field(default_factory=list)
+    compared: int = 0      # objetos de primer nivel (tablas, vistas, secuencias)
+    unchanged: int = 0     # de esos, cuántos se saltearon por fingerprint
+
+    @property
+    def is_empty(self) -> bool:
+        return not self.items
+
+    def count(self, change: str) -> int:
+        return sum(1 for i in self.items if i.change == change)
+
+    def script(self) -> str:
+        return "\n".join(s.rstrip().rstrip(";") + ";" for s in self.statements)
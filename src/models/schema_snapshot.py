@@ -0,0 +1,50 @@
+from dataclasses import dataclass, field
+from typing import Optional
+
+from models.table_descriptor import ColumnInfo, IndexInfo, ForeignKeyInfo, TableDescriptor
+
+
+@dataclass
+class SchemaSnapshot:
+    """
+    Catálogo en memoria de un schema completo, indexado por OID de la relación.
+    """
+    schema: str
+    relations: dict[int, tuple[str, str]] = field(default_factory=dict)   # oid -> (nombre, relkind)
+    oid_by_name: dict[str, int] = field(default_factory=dict)
+    columns: dict[int, list[ColumnInfo]] = field(default_factory=dict)
+    primary_keys: dict[int, list[str]] = field(default_factory=dict)
+    uniques: dict[int, list[tuple[str, list[str]]]] = field(default_factory=dict)
+    indexes: dict[int, list[IndexInfo]] = field(default_factory=dict)
+    foreign_keys: dict[int, list[ForeignKeyInfo]] = field(default_factory=dict)
+    view_definitions: dict[int, str] = field(default_factory=dict)
+    sequence_definitions: dict[int, str] = field(default_factory=dict)    # "INCREMENT 1 MINVALUE 1 ..."
+
+    def names(self, relkind: str) -> list[str]:
+        return sorted(name for name, kind in self.relations.values() if kind == relkind)
+
+    def tables(self) -> list[str]:
+        return self.names("r")
+
+    def views(self) -> list[str]:
+        return self.names("v")
+
+    def sequences(self) -> list[str]:
+        return self.names("S")
+
+    def has(self, name: str) -> bool:
+        return name in self.oid_by_name
+
+    def describe(self, name: str) -> Optional[TableDescriptor]:
+        oid = self.oid_by_name.get(name)
+        if oid is None:
+            return None
+        return TableDescriptor(
+            schema=self.schema,
+            name=name,
+            columns=list(self.columns.get(oid, [])),
+            primary_key=list(self.primary_keys.get(oid, [])),
+            uniques=list(self.uniques.get(oid, [])),
+            indexes=list(self.indexes.get(oid, [])),
+            foreign_keys=list(self.foreign_keys.get(oid, [])),
+        )
@@ -0,0 +1,27 @@
+import re
+from dataclasses import dataclass
+
+# En el fingerprint las constantes quedan como "_" y los parámetros como $1, $2, ...
+_PLACEHOLDER_RE = re.compile(r"\$\d+|(?<![\w'])_(?![\w'])")
+
+
+@dataclass
+class StatementStat:
+    """
+    Estadísticas acumuladas de un fingerprint de sentencia. Tiempos en segundos.
+    """
+    fingerprint: str
+    query: str
+    database: str = ""
+    count: int = 0
+    total_latency: float = 0.0
+    rows_read: float = 0.0
+    contention: float = 0.0
+
+    @property
+    def mean_latency(self) -> float:
+        return self.total_latency / self.count if self.count else 0.0
+
+    @property
+    def has_placeholders(self) -> bool:
+        return bool(_PLACEHOLDER_RE.search(self.query))
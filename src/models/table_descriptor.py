@@ -0,0 +1,87 @@
+import re
+from dataclasses import dataclass, field
+
+
+@dataclass(frozen=True)
+class ColumnInfo:
+    name: str
+    data_type: str
+    not_null: bool
+    default: str = ""
+
+
+@dataclass(frozen=True)
+class IndexInfo:
+    name: str
+    is_primary: bool
+    is_unique: bool
+    definition: str
+
+    @property
+    def columns(self) -> str:
+        m = re.search(r"\((.*)\)", self.definition or "")
+        if not m:
+            return ""
+        return m.group(1).strip().replace(" ASC", "").replace(" DESC", "")
+
+    def as_row(self) -> tuple[str, str, str, str]:
+        """
+        Retorna: (index, tipo, columnas, único) como lo muestra TableDetails.
+        """
+        idx_type = "PRIMARY KEY" if self.is_primary else ("UNIQUE" if self.is_unique else "BTREE")
+        unique_str = "" if self.is_primary else ("UNIQUE" if self.is_unique else "")
+        return (self.name, idx_type, self.columns, unique_str)
+
+
+@dataclass(frozen=True)
+class ForeignKeyInfo:
+    name: str
+    column: str
+    ref_schema: str
+    ref_table: str
+    ref_column: str
+
+    def as_row(self) -> tuple[str, str, str, str, str]:
+        return (self.name, self.column, self.ref_schema, self.ref_table, self.ref_column)
+
+
+@dataclass
+class TableDescriptor:
+    """
+    Toda la metadata de una tabla que usan el panel de detalles y la generación de DDL.
+    """
+    schema: str
+    name: str
+    columns: list[ColumnInfo] = field(default_factory=list)
+    primary_key: list[str] = field(default_factory=list)
+    uniques: list[tuple[str, list[str]]] = field(default_factory=list)
+    indexes: list[IndexInfo] = field(default_factory=list)
+    foreign_keys: list[ForeignKeyInfo] = field(default_factory=list)
+
+    def column_rows(self) -> list[tuple[str, str, str, str, str]]:
+        """
+        Retorna: [(nombre, tipo, nullable, default, pk), ...]
+        """
+        pk = set(self.primary_key)
+        return [
+            (c.name, c.data_type, "NO" if c.not_null else "YES", c.default, "PK" if c.name in pk else "")
+            for c in self.columns
+        ]
+
+    def index_rows(self) -> list[tuple[str, str, str, str]]:
+        return [i.as_row() for i in self.indexes]
+
+    def grouped_foreign_keys(self) -> dict[str, tuple[tuple[str, ...], str, str, tuple[str, ...]]]:
+        """
+        Una FK compuesta llega como una fila por par de columnas.
+        Retorna: {nombre: ((columnas), ref_schema, ref_table, (columnas referenciadas))}, en orden.
+        """
+        fks: dict[str, tuple[list, str, str, list]] = {}
+        for fk in self.foreign_keys:
+            cols, _, _, ref_cols = fks.setdefault(fk.name, ([], fk.ref_schema, fk.ref_table, []))
+            cols.append(fk.column)
+            ref_cols.append(fk.ref_column)
+        return {n: (tuple(c), rs, rt, tuple(rc)) for n, (c, rs, rt, rc) in fks.items()}
+
+    def foreign_key_rows(self) -> list[tuple[str, str, str, str, str]]:
+        return [fk.as_row() for fk in self.foreign_keys]
@@ -0,0 +1,22 @@
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Optional
+
+
+@dataclass
+class TableStats:
+    """
+    Tamaño aproximado de una tabla; cada campo es None si la fuente no estaba disponible.
+    """
+    schema: str
+    name: str
+    estimated_rows: Optional[int] = None      # crdb_internal.table_row_statistics
+    stats_rows: Optional[int] = None          # última SHOW STATISTICS
+    stats_created: Optional[datetime] = None
+    range_count: Optional[int] = None
+    live_bytes: Optional[int] = None
+    total_bytes: Optional[int] = None
+
+    @property
+    def approx_rows(self) -> Optional[int]:
+        return self.estimated_rows if self.estimated_rows is not None else self.stats_rows
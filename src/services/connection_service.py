@@ -1,11 +1,17 @@
 import json
+import time
 from pathlib import Path
+from contextlib import contextmanager
 from dataclasses import dataclass
 from typing import Optional, Tuple
 from psycopg2 import Error as PsycopgError
-from db.connection import get_connection
+from psycopg2 import extensions
+from db.connection import PoolTimeout, get_pool
 from db.objects_repo import list_databases, list_schemas
 
+# Segundos que una sesión que no es la actual puede quedar abierta sin usarse
+SESSION_IDLE_TIMEOUT = 600.0
+
 @dataclass
 class ConnectionInfo:
     id: str
@@ -18,6 +24,29 @@ class ConnectionInfo:
     sslmode: str = "disable"
 
 
+@dataclass
+class Session:
+    """
+    Sesión principal de una (conexión, base): se conserva al cambiar de base,
+    junto con su estado (SET, transacciones abiertas del editor, etc.).
+    """
+    info: ConnectionInfo
+    pool: object
+    conn: object
+    last_used: float
+
+    @property
+    def busy(self) -> bool:
+        """
+        Con una consulta en curso o una transacción abierta (p.ej. del editor SQL,
+        que sigue corriendo después de cambiar de base): no se puede cerrar.
+        """
+        conn = self.conn
+        if conn.closed:
+            return False
+        return conn.isexecuting() or conn.get_transaction_status() != extensions.TRANSACTION_STATUS_IDLE
+
+
 class ConnectionService:
     def __init__(self, json_path: str = "connections.json"):
             p = Path(json_path)
@@ -28,8 +57,8 @@ class ConnectionService:
                     p = alt
 
             self.json_path = p
-            self._current_info = None
-            self._conn = None
+            self._sessions: dict[tuple[str, str], Session] = {}
+            self._current: Optional[Session] = None
 
     def load_all(self) -> tuple[list[ConnectionInfo], Optional[str]]:
         data = json.loads(self.json_path.read_text(encoding="utf-8"))
@@ -50,59 +79,124 @@ class ConnectionService:
 
     def test_connection(self, info: ConnectionInfo) -> Tuple[bool, str]:
         try:
-            conn = get_connection(
-                host=info.host, port=info.port, database=info.database,
-                user=info.user, password=info.password, sslmode=info.sslmode
-            )
-            with conn.cursor() as cur:
-                cur.execute("SELECT 1;")
-                cur.fetchone()
-            conn.close()
+            with self.open_temp_conn(info, info.database) as conn:
+                with conn.cursor() as cur:
+                    cur.execute("SELECT 1;")
+                    cur.fetchone()
             return True, "Conexión exitosa."
-        except PsycopgError as e:
+        except (PsycopgError, PoolTimeout) as e:
             return False, str(e).strip()
 
     def connect(self, info: ConnectionInfo) -> None:
-        self.disconnect()
-        self._conn = get_connection(
-            host=info.host, port=info.port, database=info.database,
-            user=info.user, password=info.password, sslmode=info.sslmode
-        )
-        self._current_info = info
+        """
+        Hace actual la sesión de (info, info.database): la reutiliza si ya estaba abierta,
+        sin cerrar la anterior (queda disponible para volver).
+        """
+        key = (info.id, info.database)
+        session = self._sessions.get(key)
+        if session is not None and (session.info != info or session.conn.closed):
+            # Cambiaron las credenciales o se cortó la conexión
+            self._close_session(key)
+            session = None
+
+        if session is None:
+            pool = self._pool(info, info.database)
+            session = Session(info=info, pool=pool, conn=pool.acquire(), last_used=time.monotonic())
+            self._sessions[key] = session
+
+        if self._current is not None:
+            self._current.last_used = time.monotonic()
+        session.last_used = time.monotonic()
+        self._current = session
+        self.close_idle_sessions()
 
     def disconnect(self) -> None:
-        try:
-            if self._conn is not None:
-                self._conn.close()
-        finally:
-            self._conn = None
-            self._current_info = None
+        """
+        Cierra la sesión actual; las de otras bases siguen abiertas hasta close_all().
+        """
+        current = self._current
+        self._current = None
+        if current is not None:
+            self._close_session((current.info.id, current.info.database))
+
+    def close_all(self) -> None:
+        self._current = None
+        for key in list(self._sessions):
+            self._close_session(key)
+
+    def close_idle_sessions(self, timeout: float = SESSION_IDLE_TIMEOUT) -> int:
+        """
+        Cierra las sesiones que no son la actual y llevan más de timeout sin usarse.
+        Las ocupadas se saltean y cuentan como usadas ahora.
+        Retorna: cuántas se cerraron
+        """
+        now = time.monotonic()
+        idle = []
+        for key, s in self._sessions.items():
+            if s is self._current or now - s.last_used < timeout:
+                continue
+            if s.busy:
+                s.last_used = now
+                continue
+            idle.append(key)
+        for key in idle:
+            self._close_session(key)
+        return len(idle)
+
+    def open_sessions(self) -> list[ConnectionInfo]:
+        return [s.info for s in self._sessions.values()]
+
+    def _close_session(self, key: tuple[str, str]) -> None:
+        session = self._sessions.pop(key, None)
+        if session is not None:
+            # La sesión puede tener estado (SET, etc.): no se devuelve al pool
+            session.pool.release(session.conn, discard=True)
 
     def get_conn(self):
-        return self._conn
+        if self._current is None:
+            return None
+        self._current.last_used = time.monotonic()
+        return self._current.conn
 
     def get_current_info(self) -> Optional[ConnectionInfo]:
-        return self._current_info
+        return self._current.info if self._current is not None else None
 
-    def open_temp_conn(self, info: ConnectionInfo, database: str):
-        return get_connection(
+    def _pool(self, info: ConnectionInfo, database: str):
+        return get_pool(
             host=info.host, port=info.port, database=database,
             user=info.user, password=info.password, sslmode=info.sslmode
         )
 
+    @contextmanager
+    def open_temp_conn(self, info: ConnectionInfo, database: str):
+        """
+        Conexión prestada del pool de (info, database); se devuelve al salir del with.
+        """
+        with self._pool(info, database).connection() as conn:
+            yield conn
+
+    @contextmanager
+    def open_current_conn(self):
+        """
+        Conexión del pool para la base actual, independiente de la sesión principal
+        (que puede estar ocupada con una consulta del editor SQL).
+        """
+        info = self.get_current_info()
+        if info is None:
+            raise RuntimeError("No hay conexión actual.")
+        with self.open_temp_conn(info, info.database) as conn:
+            yield conn
+
+    def ensure_pool_capacity(self, info: ConnectionInfo, database: str, size: int) -> None:
+        self._pool(info, database).ensure_capacity(size)
+
     def get_databases(self, info: ConnectionInfo) -> list[str]:
-        conn = self.open_temp_conn(info, info.database)
-        try:
+        with self.open_temp_conn(info, info.database) as conn:
             return list_databases(conn)
-        finally:
-            conn.close()
 
     def get_schemas(self, info: ConnectionInfo, database: str) -> list[str]:
-        conn = self.open_temp_conn(info, database)
-        try:
+        with self.open_temp_conn(info, database) as conn:
             return list_schemas(conn)
-        finally:
-            conn.close()
 
     def switch_database(self, database: str):
         info = self.get_current_info()
@@ -128,11 +222,8 @@ class ConnectionService:
         info = self.get_current_info()
         if info is None:
             raise RuntimeError("No hay conexión actual.")
-        conn = self.open_temp_conn(info, database)
-        try:
+        with self.open_temp_conn(info, database) as conn:
             return list_schemas(conn)
-        finally:
-            conn.close()
 
     def get_active_info(self) -> Optional[ConnectionInfo]:
         infos, active = self.load_all()
@@ -149,8 +240,5 @@ class ConnectionService:
         info = self.get_active_info()
         if info is None:
             return []
-        conn = self.open_temp_conn(info, info.database) 
-        try:
+        with self.open_temp_conn(info, info.database) as conn:
             return list_databases(conn)
-        finally:
-            conn.close()
\ No newline at end of file
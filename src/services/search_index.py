@@ -0,0 +1,244 @@
+import math
+import re
+import threading
+from collections import Counter
+from dataclasses import dataclass
+from typing import Callable, Optional
+
+from db.objects_repo import list_databases, list_all_objects
+
+SEARCH_LIMIT = 50
+FUZZY_MIN_QUERY = 3        # con menos letras solo se busca por prefijo
+FUZZY_MIN_SCORE = 0.5      # fracción mínima de trigramas de la consulta que debe tener el nombre
+PREFIX_CANDIDATES = 400    # candidatos por prefijo que se ordenan antes de cortar a limit
+
+_TOKEN_SPLIT_RE = re.compile(r"[_\-.$ ]+")
+_EMPTY: frozenset = frozenset()
+
+
+@dataclass(frozen=True)
+class SearchEntry:
+    conn_id: str
+    database: str
+    schema: str
+    kind: str               # table | view | index | function | sequence | type
+    name: str
+    parent: Optional[str] = None   # tabla, para índices
+
+    @property
+    def path(self) -> str:
+        base = f"{self.database}.{self.schema}"
+        if self.parent:
+            return f"{base}.{self.parent}.{self.name}"
+        return f"{base}.{self.name}"
+
+
+class _TrieNode:
+    __slots__ = ("children", "ids")
+
+    def __init__(self):
+        self.children: dict[str, "_TrieNode"] = {}
+        self.ids: set[int] = set()
+
+
+def trigrams(text: str) -> set[str]:
+    s = f"  {text.lower()} "
+    return {s[i:i + 3] for i in range(len(s) - 2)}
+
+
+def _keys(name: str) -> set[str]:
+    # El nombre completo y cada sufijo que empieza en un token ("orders" encuentra "customer_orders")
+    low = name.lower()
+    keys = {low}
+    for m in _TOKEN_SPLIT_RE.finditer(low):
+        if m.end() < len(low):
+            keys.add(low[m.end():])
+    return keys
+
+
+class SearchIndex:
+    """
+    Índice en memoria de los objetos de todas las bases: trie de prefijos + trigramas para
+    búsqueda aproximada. Se llena por base de datos (replace_database), así que se puede
+    consultar mientras se construye.
+    """
+
+    def __init__(self):
+        self._entries: dict[int, SearchEntry] = {}
+        self._by_db: dict[tuple[str, str], list[int]] = {}
+        self._root = _TrieNode()
+        self._grams: dict[str, set[int]] = {}
+        self._next_id = 0
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
+
+    def databases(self) -> int:
+        with self._lock:
+            return len(self._by_db)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._by_db.clear()
+            self._root = _TrieNode()
+            self._grams.clear()
+
+    def replace_database(self, conn_id: str, database: str, rows) -> int:
+        """
+        rows: [(schema, kind, name, parent)] de list_all_objects.
+        Retorna: cantidad de objetos indexados para la base.
+        """
+        with self._lock:
+            self._remove_database_locked(conn_id, database)
+            ids = []
+            for schema, kind, name, parent in rows:
+                eid = self._next_id
+                self._next_id += 1
+                entry = SearchEntry(conn_id, database, schema, kind, name, parent)
+                self._entries[eid] = entry
+                for key in _keys(name):
+                    self._trie_node(key, create=True).ids.add(eid)
+                for g in trigrams(name):
+                    self._grams.setdefault(g, set()).add(eid)
+                ids.append(eid)
+            self._by_db[(conn_id, database)] = ids
+            return len(ids)
+
+    def indexed_databases(self, conn_id: str) -> set[str]:
+        with self._lock:
+            return {db for cid, db in self._by_db if cid == conn_id}
+
+    def remove_database(self, conn_id: str, database: str) -> None:
+        with self._lock:
+            self._remove_database_locked(conn_id, database)
+
+    def _remove_database_locked(self, conn_id: str, database: str) -> None:
+        for eid in self._by_db.pop((conn_id, database), []):
+            entry = self._entries.pop(eid)
+            for key in _keys(entry.name):
+                node = self._trie_node(key)
+                if node is not None:
+                    node.ids.discard(eid)
+            for g in trigrams(entry.name):
+                posting = self._grams.get(g)
+                if posting is not None:
+                    posting.discard(eid)
+                    if not posting:
+                        del self._grams[g]
+
+    def _trie_node(self, key: str, create: bool = False) -> Optional[_TrieNode]:
+        node = self._root
+        for ch in key:
+            nxt = node.children.get(ch)
+            if nxt is None:
+                if not create:
+                    return None
+                nxt = node.children[ch] = _TrieNode()
+            node = nxt
+        return node
+
+    def _prefix_ids(self, prefix: str, cap: int) -> set[int]:
+        start = self._trie_node(prefix)
+        if start is None:
+            return set()
+        found: set[int] = set()
+        stack = [start]
+        while stack and len(found) < cap:
+            node = stack.pop()
+            found.update(node.ids)
+            stack.extend(node.children.values())
+        return found
+
+    def _fuzzy_ids(self, text: str) -> dict[int, float]:
+        # score = fracción de los trigramas de la consulta presentes en el nombre.
+        # Para llegar a `needed` un objeto tiene que aparecer en alguna de las
+        # (total - needed + 1) listas más cortas: solo esas aportan candidatos, y el conteo
+        # se hace con intersecciones de sets en lugar de recorrer objeto por objeto.
+        grams = trigrams(text)
+        needed = max(1, math.ceil(FUZZY_MIN_SCORE * len(grams)))
+        postings = sorted((self._grams.get(g, _EMPTY) for g in grams), key=len)
+        candidates = set().union(*postings[:len(grams) - needed + 1])
+        hits: Counter = Counter()
+        for p in postings:
+            hits.update(candidates & p)
+        return {eid: n / len(grams) for eid, n in hits.items() if n >= needed}
+
+    def search(self, query: str, limit: int = SEARCH_LIMIT) -> list[SearchEntry]:
+        """
+        "ord" busca por prefijo (del nombre o de cada token); "ventas.ord" filtra además por schema.
+        Si no alcanza, completa con coincidencias aproximadas por trigramas.
+        """
+        q = query.strip().lower()
+        schema_filter = None
+        if "." in q:
+            schema_filter, q = q.rsplit(".", 1)
+            schema_filter = schema_filter.split(".")[-1]
+        if not q:
+            return []
+
+        with self._lock:
+            def keep(e: SearchEntry) -> bool:
+                return schema_filter is None or e.schema.lower().startswith(schema_filter)
+
+            ranked: dict[int, tuple] = {}
+            for eid in self._prefix_ids(q, PREFIX_CANDIDATES):
+                e = self._entries[eid]
+                if not keep(e):
+                    continue
+                low = e.name.lower()
+                rank = 0 if low == q else 1 if low.startswith(q) else 2
+                ranked[eid] = (rank, 0.0, len(e.name), low)
+
+            if len(ranked) < limit and len(q) >= FUZZY_MIN_QUERY:
+                for eid, score in self._fuzzy_ids(q).items():
+                    e = self._entries[eid]
+                    if eid not in ranked and keep(e):
+                        ranked[eid] = (3, -score, len(e.name), e.name.lower())
+
+            best = sorted(ranked, key=ranked.__getitem__)[:limit]
+            return [self._entries[eid] for eid in best]
+
+
+def build_index(
+    conn_service,
+    index: SearchIndex,
+    should_stop: Optional[Callable[[], bool]] = None,
+    on_progress: Optional[Callable[[str, str, int], None]] = None,
+) -> tuple[int, list[str]]:
+    """
+    Recorre todas las conexiones guardadas y sus bases: una consulta por base.
+    Las conexiones que fallan se saltean (el resto del índice sigue sirviendo).
+    Retorna: (bases indexadas, errores)
+    """
+    infos, _ = conn_service.load_all()
+    done = 0
+    errors: list[str] = []
+    for info in infos:
+        try:
+            with conn_service.open_temp_conn(info, info.database) as conn:
+                databases = list_databases(conn)
+        except Exception as e:
+            errors.append(f"{info.name}: {e}")
+            continue
+
+        for gone in index.indexed_databases(info.id) - set(databases):
+            index.remove_database(info.id, gone)
+
+        for database in databases:
+            if should_stop and should_stop():
+                return done, errors
+            try:
+                with conn_service.open_temp_conn(info, database) as conn:
+                    rows = list_all_objects(conn)
+                    conn.rollback()
+            except Exception as e:
+                errors.append(f"{info.name}/{database}: {e}")
+                continue
+            n = index.replace_database(info.id, database, rows)
+            done += 1
+            if on_progress:
+                on_progress(info.name, database, n)
+    return done, errors
@@ -0,0 +1,27 @@
+from db.ddl_repo import build_create_table_ddl
+from models.table_descriptor import ColumnInfo, ForeignKeyInfo, TableDescriptor
+
+def main():
+    # FK compuesta: una fila por par de columnas, como la devuelve el catálogo
+    desc = TableDescriptor(schema="public", name="order_lines")
+    desc.columns = [
+        ColumnInfo("id", "INT8", True),
+        ColumnInfo("region", "STRING", True),
+        ColumnInfo("order_id", "INT8", True),
+    ]
+    desc.primary_key = ["id"]
+    desc.foreign_keys = [
+        ForeignKeyInfo("order_lines_order_fkey", "region", "public", "orders", "region"),
+        ForeignKeyInfo("order_lines_order_fkey", "order_id", "public", "orders", "id"),
+    ]
+    ddl = build_create_table_ddl(desc)
+    print(ddl)
+    assert ddl.count('CONSTRAINT "order_lines_order_fkey"') == 1, ddl
+    assert (
+        'CONSTRAINT "order_lines_order_fkey" FOREIGN KEY ("region", "order_id") '
+        'REFERENCES "public"."orders" ("region", "id")'
+    ) in ddl, ddl
+    print("OK")
+
+if __name__ == "__main__":
+    main()
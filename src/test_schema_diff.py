@@ -0,0 +1,74 @@
+from db.schema_diff import build_catalog, diff_catalogs
+from models.schema_snapshot import SchemaSnapshot
+from models.table_descriptor import ColumnInfo, IndexInfo
+
+def snapshot(database: str) -> SchemaSnapshot:
+    """
+    El mismo schema como lo devuelve CockroachDB en la base indicada:
+    pg_get_viewdef y pg_get_indexdef traen el nombre de la base.
+    """
+    snap = SchemaSnapshot(schema="public")
+    snap.relations = {1: ("orders", "r"), 2: ("v_orders", "v")}
+    snap.oid_by_name = {"orders": 1, "v_orders": 2}
+    snap.columns[1] = [ColumnInfo("id", "INT8", True), ColumnInfo("total", "DECIMAL", False)]
+    snap.primary_keys[1] = ["id"]
+    snap.indexes[1] = [
+        IndexInfo("orders_pkey", True, True, f"CREATE UNIQUE INDEX orders_pkey ON {database}.public.orders USING btree (id ASC)"),
+        IndexInfo("orders_total_idx", False, False, f"CREATE INDEX orders_total_idx ON {database}.public.orders USING btree (total ASC)"),
+    ]
+    snap.view_definitions[2] = f"SELECT o.id, o.total FROM {database}.public.orders AS o WHERE o.total > 0"
+    return snap
+
+def main():
+    # Mismo schema en dos bases con distinto nombre: no hay diferencias
+    source = build_catalog([snapshot("staging")], "staging")
+    target = build_catalog([snapshot("production")], "production")
+    diff = diff_catalogs(source, target)
+    assert diff.is_empty, [i.as_row() for i in diff.items]
+
+    # Vista nueva: el CREATE VIEW no apunta a la base de origen
+    target = build_catalog([SchemaSnapshot(schema="public")], "production")
+    script = diff_catalogs(source, target).script()
+    print(script)
+    assert 'CREATE VIEW "public"."v_orders" AS SELECT o.id, o.total FROM public.orders AS o' in script, script
+    assert "staging" not in script, script
+
+    # Nombres entre comillas y referencias a otra base no se tocan
+    snap = snapshot('"Staging"')
+    snap.view_definitions[2] += " AND o.id IN (SELECT id FROM other.public.ids)"
+    view = build_catalog([snap], "Staging").views[("public", "v_orders")]
+    assert view.endswith("FROM public.orders AS o WHERE o.total > 0 AND o.id IN (SELECT id FROM other.public.ids)"), view
+
+    # Secuencias: se comparan sus opciones y se crean con ellas
+    seq = SchemaSnapshot(schema="public")
+    seq.relations = {3: ("order_seq", "S")}
+    seq.oid_by_name = {"order_seq": 3}
+    seq.sequence_definitions[3] = "INCREMENT 5 MINVALUE 1 MAXVALUE 1000 START 10 CACHE 1"
+    source = build_catalog([seq])
+    created = diff_catalogs(source, build_catalog([SchemaSnapshot(schema="public")])).script()
+    assert 'CREATE SEQUENCE "public"."order_seq" INCREMENT 5 MINVALUE 1 MAXVALUE 1000 START 10 CACHE 1;' in created, created
+    old = SchemaSnapshot(schema="public", relations=dict(seq.relations), oid_by_name=dict(seq.oid_by_name))
+    old.sequence_definitions[3] = "INCREMENT 1 MINVALUE 1 MAXVALUE 1000 START 10 CACHE 1"
+    diff = diff_catalogs(source, build_catalog([old]))
+    assert [i.change for i in diff.items] == ["changed"], diff.items
+    assert 'ALTER SEQUENCE "public"."order_seq" INCREMENT 5' in diff.script(), diff.script()
+
+    # Tabla sin PK: la columna rowid oculta no se crea en el destino
+    heap = SchemaSnapshot(schema="public")
+    heap.relations = {4: ("events", "r")}
+    heap.oid_by_name = {"events": 4}
+    heap.columns[4] = [ColumnInfo("payload", "JSONB", False), ColumnInfo("rowid", "INT8", True, "unique_rowid()")]
+    heap.primary_keys[4] = ["rowid"]
+    script = diff_catalogs(build_catalog([heap]), build_catalog([SchemaSnapshot(schema="public")])).script()
+    assert "rowid" not in script and "PRIMARY KEY" not in script, script
+
+    # Mismas columnas en otro orden: sin diferencias
+    reordered = SchemaSnapshot(schema="public", relations=dict(heap.relations), oid_by_name=dict(heap.oid_by_name))
+    reordered.columns[4] = list(reversed(heap.columns[4]))
+    reordered.primary_keys[4] = ["rowid"]
+    diff = diff_catalogs(build_catalog([heap]), build_catalog([reordered]))
+    assert diff.is_empty, [i.as_row() for i in diff.items]
+    print("OK")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+import queue
+import threading
+from concurrent.futures import Executor
+from typing import Any, Callable, Optional
+
+POLL_MS = 30
+
+
+class BackgroundTask:
+    """
+    Ejecuta fn en otro hilo y entrega el resultado en el hilo de Tk.
+    Tk no es thread-safe: el hilo de trabajo solo deja el resultado en una cola
+    y el widget la revisa con after().
+    """
+
+    def __init__(
+        self,
+        widget,
+        fn: Callable[[], Any],
+        on_done: Optional[Callable[[Any], None]] = None,
+        on_error: Optional[Callable[[BaseException], None]] = None,
+        executor: Optional[Executor] = None,
+    ):
+        self.widget = widget
+        self.fn = fn
+        self.on_done = on_done
+        self.on_error = on_error
+        self.executor = executor
+        self.cancelled = False
+        self.finished = False
+        self._queue: "queue.Queue[tuple[bool, Any]]" = queue.Queue(maxsize=1)
+
+    def _run(self):
+        try:
+            self._queue.put((True, self.fn()))
+        except BaseException as e:
+            self._queue.put((False, e))
+
+    def start(self) -> "BackgroundTask":
+        if self.executor is not None:
+            self.executor.submit(self._run)
+        else:
+            threading.Thread(target=self._run, daemon=True).start()
+        self.widget.after(POLL_MS, self._poll)
+        return self
+
+    def cancel(self) -> None:
+        """
+        Descarta el resultado (el hilo termina igual, pero no se llama a los callbacks).
+        """
+        self.cancelled = True
+
+    def _poll(self):
+        try:
+            ok, value = self._queue.get_nowait()
+        except queue.Empty:
+            try:
+                self.widget.after(POLL_MS, self._poll)
+            except Exception:
+                pass  # widget destruido
+            return
+
+        self.finished = True
+        if self.cancelled:
+            return
+        if ok:
+            if self.on_done:
+                self.on_done(value)
+        elif self.on_error:
+            self.on_error(value)
+
+
+def run_in_background(widget, fn, on_done=None, on_error=None, executor=None) -> BackgroundTask:
+    return BackgroundTask(widget, fn, on_done=on_done, on_error=on_error, executor=executor).start()
@@ -0,0 +1,146 @@
+import tkinter as tk
+from tkinter import ttk, messagebox, filedialog
+from typing import Any, Callable, ContextManager
+
+from db.export import EXPORT_FORMATS, format_for_path, export_query
+from ui.background import run_in_background
+
+PROGRESS_MS = 250
+
+_FILETYPES = {
+    "csv": ("CSV", "*.csv"),
+    "jsonl": ("JSON Lines", "*.jsonl"),
+    "parquet": ("Parquet", "*.parquet"),
+}
+
+
+class ExportDialog(tk.Toplevel):
+    """
+    Exporta el resultado de una consulta a CSV/JSONL/Parquet.
+    open_conn(): context manager que presta una conexión (no la sesión del editor).
+    """
+
+    def __init__(
+        self,
+        parent: tk.Tk,
+        open_conn: Callable[[], ContextManager[Any]],
+        sql: str,
+        title: str,
+        default_name: str = "export",
+    ):
+        super().__init__(parent)
+        self.title(f"Exportar - {title}")
+        self.resizable(False, False)
+        self.open_conn = open_conn
+        self.sql = sql
+        self.default_name = default_name
+
+        self._task = None
+        self._progress = None
+        self._stop = False
+
+        self.transient(parent)
+        self.grab_set()
+
+        frm = ttk.Frame(self, padding=12)
+        frm.pack(fill="both", expand=True)
+
+        self.var_fmt = tk.StringVar(value="csv")
+        self.var_path = tk.StringVar(value="")
+
+        ttk.Label(frm, text="Formato").grid(row=0, column=0, sticky="w", pady=4)
+        cmb = ttk.Combobox(frm, textvariable=self.var_fmt, values=list(EXPORT_FORMATS), width=10, state="readonly")
+        cmb.grid(row=0, column=1, sticky="w", pady=4)
+
+        ttk.Label(frm, text="Archivo").grid(row=1, column=0, sticky="w", pady=4)
+        ttk.Entry(frm, textvariable=self.var_path, width=40).grid(row=1, column=1, sticky="w", pady=4)
+        ttk.Button(frm, text="Buscar", command=self.choose_file).grid(row=1, column=2, padx=(8, 0))
+
+        self.progress = ttk.Progressbar(frm, mode="indeterminate", length=420)
+        self.progress.grid(row=2, column=0, columnspan=3, sticky="we", pady=(8, 0))
+        self.lbl_progress = ttk.Label(frm, text="")
+        self.lbl_progress.grid(row=3, column=0, columnspan=3, sticky="w", pady=(4, 0))
+
+        btns = ttk.Frame(frm)
+        btns.grid(row=4, column=0, columnspan=3, sticky="e", pady=(12, 0))
+        ttk.Button(btns, text="Cancelar", command=self.on_cancel).pack(side="left", padx=(0, 8))
+        self.btn_export = ttk.Button(btns, text="Exportar", command=self.on_export)
+        self.btn_export.pack(side="left")
+
+        self.protocol("WM_DELETE_WINDOW", self.on_cancel)
+        self.bind("<Escape>", lambda e: self.on_cancel())
+
+    def choose_file(self):
+        fmt = self.var_fmt.get()
+        path = filedialog.asksaveasfilename(
+            parent=self,
+            initialfile=f"{self.default_name}.{fmt}",
+            defaultextension=f".{fmt}",
+            filetypes=[_FILETYPES[fmt], ("Todos", "*.*")],
+        )
+        if path:
+            self.var_path.set(path)
+            self.var_fmt.set(format_for_path(path))
+
+    def on_export(self):
+        path = self.var_path.get().strip()
+        if not path:
+            messagebox.showwarning("Exportar", "Selecciona un archivo de destino.", parent=self)
+            return
+        fmt = self.var_fmt.get()
+
+        self._stop = False
+        self._progress = None
+        self.btn_export.configure(state="disabled")
+        self.progress.start(12)
+        self.lbl_progress.configure(text="Exportando...")
+
+        def work():
+            with self.open_conn() as conn:
+                return export_query(
+                    conn, self.sql, path, fmt=fmt,
+                    on_progress=self._set_progress,
+                    should_stop=lambda: self._stop,
+                )
+
+        self._task = run_in_background(self, work, on_done=self._on_done, on_error=self._on_error)
+        self.after(PROGRESS_MS, self._tick)
+
+    def _set_progress(self, progress):
+        # Se llama desde el hilo de exportación; solo se guarda para el próximo _tick
+        self._progress = progress
+
+    def _format_progress(self, p) -> str:
+        return f"{p.rows:,} filas · {p.rows_per_sec:,.0f} filas/s · {p.elapsed:.1f} s"
+
+    def _tick(self):
+        if self._task is None or self._task.finished:
+            return
+        if self._progress is not None:
+            self.lbl_progress.configure(text=self._format_progress(self._progress))
+        self.after(PROGRESS_MS, self._tick)
+
+    def _finish(self):
+        self._task = None
+        self.progress.stop()
+        self.btn_export.configure(state="normal")
+
+    def _on_done(self, progress):
+        self._finish()
+        self.lbl_progress.configure(text=self._format_progress(progress))
+        if progress.cancelled:
+            self.lbl_progress.configure(text="Exportación cancelada; se borró el archivo parcial.")
+            return
+        messagebox.showinfo("Exportar", f"Se exportaron {progress.rows:,} filas.", parent=self)
+        self.destroy()
+
+    def _on_error(self, err):
+        self._finish()
+        messagebox.showerror("Exportar", str(err), parent=self)
+
+    def on_cancel(self):
+        if self._task is not None and not self._task.finished:
+            self._stop = True
+            self.lbl_progress.configure(text="Cancelando...")
+            return
+        self.destroy()
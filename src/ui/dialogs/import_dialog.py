@@ -0,0 +1,200 @@
+import tkinter as tk
+from tkinter import ttk, messagebox, filedialog
+
+from services.connection_service import ConnectionService
+from db.bulk_import import (
+    IMPORT_CHUNK_ROWS,
+    IMPORT_WORKERS,
+    FORMATS,
+    detect_format,
+    read_header,
+    import_file,
+)
+from db.objects_repo import get_table_columns
+from ui.background import run_in_background
+
+PROGRESS_MS = 250
+
+
+class ImportDialog(tk.Toplevel):
+    """
+    Importa un archivo CSV/JSONL a la tabla seleccionada usando COPY por chunks.
+    """
+
+    def __init__(self, parent: tk.Tk, conn_service: ConnectionService, schema: str, table: str):
+        super().__init__(parent)
+        self.title(f"Importar datos - {schema}.{table}")
+        self.resizable(False, False)
+        self.conn_service = conn_service
+        self.schema = schema
+        self.table = table
+        self.info = conn_service.get_current_info()
+
+        self._task = None
+        self._progress = None
+        self._stop = False
+
+        self.transient(parent)
+        self.grab_set()
+
+        frm = ttk.Frame(self, padding=12)
+        frm.pack(fill="both", expand=True)
+
+        self.var_path = tk.StringVar(value="")
+        self.var_fmt = tk.StringVar(value="csv")
+        self.var_workers = tk.StringVar(value=str(IMPORT_WORKERS))
+        self.var_chunk = tk.StringVar(value=str(IMPORT_CHUNK_ROWS))
+        self.var_resume = tk.BooleanVar(value=True)
+
+        ttk.Label(frm, text="Archivo").grid(row=0, column=0, sticky="w", pady=4)
+        ttk.Entry(frm, textvariable=self.var_path, width=40).grid(row=0, column=1, sticky="w", pady=4)
+        ttk.Button(frm, text="Buscar", command=self.choose_file).grid(row=0, column=2, padx=(8, 0))
+
+        ttk.Label(frm, text="Formato").grid(row=1, column=0, sticky="w", pady=4)
+        ttk.Combobox(frm, textvariable=self.var_fmt, values=list(FORMATS), width=10, state="readonly").grid(
+            row=1, column=1, sticky="w", pady=4
+        )
+
+        ttk.Label(frm, text="Conexiones").grid(row=2, column=0, sticky="w", pady=4)
+        ttk.Spinbox(frm, from_=1, to=16, textvariable=self.var_workers, width=8).grid(row=2, column=1, sticky="w", pady=4)
+
+        ttk.Label(frm, text="Filas por chunk").grid(row=3, column=0, sticky="w", pady=4)
+        ttk.Entry(frm, textvariable=self.var_chunk, width=10).grid(row=3, column=1, sticky="w", pady=4)
+
+        ttk.Checkbutton(frm, text="Reanudar desde el último chunk confirmado", variable=self.var_resume).grid(
+            row=4, column=0, columnspan=3, sticky="w", pady=4
+        )
+
+        self.lbl_mapping = ttk.Label(frm, text="", style="Muted.TLabel", wraplength=420, justify="left")
+        self.lbl_mapping.grid(row=5, column=0, columnspan=3, sticky="w", pady=(4, 8))
+
+        self.progress = ttk.Progressbar(frm, mode="indeterminate", length=420)
+        self.progress.grid(row=6, column=0, columnspan=3, sticky="we")
+        self.lbl_progress = ttk.Label(frm, text="")
+        self.lbl_progress.grid(row=7, column=0, columnspan=3, sticky="w", pady=(4, 0))
+
+        btns = ttk.Frame(frm)
+        btns.grid(row=8, column=0, columnspan=3, sticky="e", pady=(12, 0))
+        self.btn_cancel = ttk.Button(btns, text="Cancelar", command=self.on_cancel)
+        self.btn_cancel.pack(side="left", padx=(0, 8))
+        self.btn_import = ttk.Button(btns, text="Importar", command=self.on_import)
+        self.btn_import.pack(side="left")
+
+        self.protocol("WM_DELETE_WINDOW", self.on_cancel)
+        self.bind("<Escape>", lambda e: self.on_cancel())
+
+    def choose_file(self):
+        path = filedialog.askopenfilename(
+            parent=self,
+            filetypes=[("CSV / JSONL", "*.csv *.jsonl *.ndjson *.json"), ("Todos", "*.*")],
+        )
+        if not path:
+            return
+        self.var_path.set(path)
+        self.var_fmt.set(detect_format(path))
+        self._show_mapping()
+
+    def _show_mapping(self):
+        path = self.var_path.get().strip()
+        try:
+            header = read_header(path, self.var_fmt.get())
+            with self.conn_service.open_current_conn() as conn:
+                table_cols = {r[0].lower() for r in get_table_columns(conn, self.schema, self.table)}
+        except Exception as e:
+            self.lbl_mapping.configure(text=str(e))
+            return
+        used = [c for c in header if c.strip().lower() in table_cols]
+        ignored = [c for c in header if c.strip().lower() not in table_cols]
+        text = f"Columnas: {', '.join(used) or '(ninguna)'}"
+        if ignored:
+            text += f"\nSe ignoran: {', '.join(ignored)}"
+        self.lbl_mapping.configure(text=text)
+
+    def on_import(self):
+        path = self.var_path.get().strip()
+        if not path:
+            messagebox.showwarning("Importar", "Selecciona un archivo.", parent=self)
+            return
+        try:
+            workers = max(1, int(self.var_workers.get()))
+            chunk_rows = max(1, int(self.var_chunk.get()))
+        except ValueError:
+            messagebox.showerror("Importar", "Conexiones y filas por chunk deben ser números.", parent=self)
+            return
+
+        info = self.info
+        database = info.database
+        # Una conexión por escritor más la sesión principal
+        self.conn_service.ensure_pool_capacity(info, database, workers + 1)
+
+        self._stop = False
+        self._progress = None
+        self.btn_import.configure(state="disabled")
+        self.progress.start(12)
+        self.lbl_progress.configure(text="Importando...")
+
+        def work():
+            return import_file(
+                lambda: self.conn_service.open_temp_conn(info, database),
+                self.schema,
+                self.table,
+                path,
+                fmt=self.var_fmt.get(),
+                chunk_rows=chunk_rows,
+                workers=workers,
+                on_progress=self._set_progress,
+                should_stop=lambda: self._stop,
+                resume=self.var_resume.get(),
+            )
+
+        self._task = run_in_background(self, work, on_done=self._on_done, on_error=self._on_error)
+        self.after(PROGRESS_MS, self._tick)
+
+    def _set_progress(self, progress):
+        # Se llama desde los hilos de importación; solo se guarda para el próximo _tick
+        self._progress = progress
+
+    def _format_progress(self, p) -> str:
+        text = f"{p.rows_committed:,} filas · {p.rows_per_sec:,.0f} filas/s · {p.elapsed:.1f} s"
+        if p.chunks_skipped:
+            text += f" · {p.chunks_skipped} chunk(s) ya importados"
+        return text
+
+    def _tick(self):
+        if self._task is None or self._task.finished:
+            return
+        if self._progress is not None:
+            self.lbl_progress.configure(text=self._format_progress(self._progress))
+        self.after(PROGRESS_MS, self._tick)
+
+    def _finish(self):
+        self._task = None
+        self.progress.stop()
+        self.btn_import.configure(state="normal")
+
+    def _on_done(self, progress):
+        self._finish()
+        self.lbl_progress.configure(text=self._format_progress(progress))
+        if progress.done:
+            messagebox.showinfo("Importar", f"Importación terminada: {progress.rows_committed:,} filas.", parent=self)
+        else:
+            messagebox.showinfo(
+                "Importar",
+                "Importación detenida. Puedes reanudarla desde el último chunk confirmado.",
+                parent=self,
+            )
+
+    def _on_error(self, err):
+        self._finish()
+        messagebox.showerror(
+            "Importar",
+            f"{err}\n\nLos chunks confirmados se conservan; vuelve a importar para reanudar.",
+            parent=self,
+        )
+
+    def on_cancel(self):
+        if self._task is not None and not self._task.finished:
+            self._stop = True
+            self.lbl_progress.configure(text="Deteniendo...")
+            return
+        self.destroy()
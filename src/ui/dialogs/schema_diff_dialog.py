@@ -0,0 +1,154 @@
+import tkinter as tk
+from tkinter import ttk, messagebox, filedialog
+from typing import Any, Callable, Optional
+
+from db.schema_diff import compare_databases
+from ui.background import run_in_background
+
+
+class SchemaDiffDialog(tk.Toplevel):
+    """
+    Compara el schema de dos bases (pueden ser dos conexiones de connections.json)
+    y genera el DDL que lleva el destino al estado del origen.
+    """
+
+    def __init__(self, parent: tk.Tk, conn_service, on_open_sql: Optional[Callable[[str, Any, str], bool]] = None):
+        super().__init__(parent)
+        self.title("Comparar schemas")
+        self.geometry("900x620")
+        self.conn_service = conn_service
+        self.on_open_sql = on_open_sql
+        self.diff = None
+        self._target = None     # (info, base) del destino de la última comparación
+        self._task = None
+
+        self.transient(parent)
+
+        self.infos, active = conn_service.load_all()
+        names = [i.name for i in self.infos]
+        current = conn_service.get_current_info()
+        default = next((i for i in self.infos if current and i.id == current.id), None) \
+            or next((i for i in self.infos if i.id == active), None) \
+            or (self.infos[0] if self.infos else None)
+
+        frm = ttk.Frame(self, padding=12)
+        frm.pack(fill="both", expand=True)
+
+        self.var_src_conn = tk.StringVar(value=default.name if default else "")
+        self.var_src_db = tk.StringVar(value=(current or default).database if default else "")
+        self.var_dst_conn = tk.StringVar(value=default.name if default else "")
+        self.var_dst_db = tk.StringVar(value="")
+        self.var_schemas = tk.StringVar(value="")
+
+        ttk.Label(frm, text="Origen (deseado)").grid(row=0, column=0, sticky="w", pady=4)
+        ttk.Combobox(frm, textvariable=self.var_src_conn, values=names, width=24, state="readonly").grid(row=0, column=1, sticky="w", padx=(8, 8))
+        ttk.Label(frm, text="Base").grid(row=0, column=2, sticky="w")
+        ttk.Entry(frm, textvariable=self.var_src_db, width=24).grid(row=0, column=3, sticky="w", padx=(8, 0))
+
+        ttk.Label(frm, text="Destino (a migrar)").grid(row=1, column=0, sticky="w", pady=4)
+        ttk.Combobox(frm, textvariable=self.var_dst_conn, values=names, width=24, state="readonly").grid(row=1, column=1, sticky="w", padx=(8, 8))
+        ttk.Label(frm, text="Base").grid(row=1, column=2, sticky="w")
+        ttk.Entry(frm, textvariable=self.var_dst_db, width=24).grid(row=1, column=3, sticky="w", padx=(8, 0))
+
+        ttk.Label(frm, text="Schemas").grid(row=2, column=0, sticky="w", pady=4)
+        ttk.Entry(frm, textvariable=self.var_schemas, width=30).grid(row=2, column=1, sticky="w", padx=(8, 8))
+        ttk.Label(frm, text="(separados por coma; vacío = todos)", style="Muted.TLabel").grid(row=2, column=2, columnspan=2, sticky="w")
+
+        self.btn_compare = ttk.Button(frm, text="Comparar", command=self.on_compare)
+        self.btn_compare.grid(row=3, column=3, sticky="e", pady=(8, 8))
+        self.lbl_status = ttk.Label(frm, text="")
+        self.lbl_status.grid(row=3, column=0, columnspan=3, sticky="w")
+
+        self.tree = ttk.Treeview(frm, columns=("change", "kind", "object", "detail"), show="headings", height=10)
+        for col, head, w in (("change", "Cambio", 90), ("kind", "Tipo", 110), ("object", "Objeto", 320), ("detail", "Detalle", 300)):
+            self.tree.heading(col, text=head)
+            self.tree.column(col, width=w, anchor="w", stretch=True)
+        self.tree.grid(row=4, column=0, columnspan=4, sticky="nsew")
+
+        ttk.Label(frm, text="Migración", style="Section.TLabel").grid(row=5, column=0, sticky="w", pady=(10, 4))
+        self.txt_sql = tk.Text(frm, height=12, wrap="none")
+        self.txt_sql.grid(row=6, column=0, columnspan=4, sticky="nsew")
+
+        btns = ttk.Frame(frm)
+        btns.grid(row=7, column=0, columnspan=4, sticky="e", pady=(10, 0))
+        ttk.Button(btns, text="Cerrar", command=self.destroy).pack(side="left", padx=(0, 8))
+        self.btn_save = ttk.Button(btns, text="Guardar .sql", command=self.on_save, state="disabled")
+        self.btn_save.pack(side="left", padx=(0, 8))
+        self.btn_open = ttk.Button(btns, text="Abrir en SQL", command=self.on_open, state="disabled")
+        self.btn_open.pack(side="left")
+
+        frm.columnconfigure(3, weight=1)
+        frm.rowconfigure(4, weight=1)
+        frm.rowconfigure(6, weight=1)
+        self.bind("<Escape>", lambda e: self.destroy())
+
+    def _info(self, name: str):
+        return next((i for i in self.infos if i.name == name), None)
+
+    def on_compare(self):
+        src, dst = self._info(self.var_src_conn.get()), self._info(self.var_dst_conn.get())
+        src_db, dst_db = self.var_src_db.get().strip(), self.var_dst_db.get().strip()
+        if src is None or dst is None or not src_db or not dst_db:
+            messagebox.showwarning("Comparar schemas", "Elige conexión y base de origen y de destino.", parent=self)
+            return
+        schemas = [s.strip() for s in self.var_schemas.get().split(",") if s.strip()] or None
+
+        def work():
+            with self.conn_service.open_temp_conn(src, src_db) as source, \
+                    self.conn_service.open_temp_conn(dst, dst_db) as target:
+                return compare_databases(source, target, schemas)
+
+        self._target = (dst, dst_db)
+        self.btn_compare.configure(state="disabled")
+        self.lbl_status.configure(text="Leyendo catálogos...")
+        self._task = run_in_background(self, work, on_done=self._on_done, on_error=self._on_error)
+
+    def _on_done(self, diff):
+        self._task = None
+        self.diff = diff
+        self.btn_compare.configure(state="normal")
+        self.tree.delete(*self.tree.get_children())
+        for item in diff.items:
+            self.tree.insert("", "end", values=item.as_row())
+        self.txt_sql.delete("1.0", "end")
+        self.txt_sql.insert("1.0", diff.script())
+
+        if diff.is_empty:
+            self.lbl_status.configure(text=f"Sin diferencias ({diff.compared:,} objetos comparados).")
+        else:
+            self.lbl_status.configure(text=(
+                f"{diff.count('added')} agregados · {diff.count('removed')} quitados · "
+                f"{diff.count('changed')} cambiados · {diff.unchanged:,} de {diff.compared:,} sin cambios"
+            ))
+        state = "disabled" if diff.is_empty else "normal"
+        self.btn_save.configure(state=state)
+        self.btn_open.configure(state=state if self.on_open_sql else "disabled")
+
+    def _on_error(self, err):
+        self._task = None
+        self.btn_compare.configure(state="normal")
+        self.lbl_status.configure(text="")
+        messagebox.showerror("Comparar schemas", str(err), parent=self)
+
+    def on_save(self):
+        if self.diff is None:
+            return
+        path = filedialog.asksaveasfilename(
+            parent=self,
+            initialfile="migracion.sql",
+            defaultextension=".sql",
+            filetypes=[("SQL", "*.sql"), ("Todos", "*.*")],
+        )
+        if path:
+            with open(path, "w", encoding="utf-8") as f:
+                f.write(self.diff.script() + "\n")
+
+    def on_open(self):
+        """
+        La migración se abre sobre la sesión del destino que se comparó, sin ejecutarla.
+        """
+        if self.diff is None or self._target is None or not self.on_open_sql:
+            return
+        info, database = self._target
+        if self.on_open_sql(self.diff.script(), info, database):
+            self.destroy()
@@ -0,0 +1,15 @@
+from typing import Optional
+
+
+def fmt_bytes(n: Optional[int]) -> str:
+    if n is None:
+        return ""
+    for unit in ("B", "KiB", "MiB", "GiB"):
+        if n < 1024 or unit == "GiB":
+            return f"{n:.0f} {unit}" if unit == "B" else f"{n:.1f} {unit}"
+        n /= 1024
+    return ""
+
+
+def fmt_count(n: Optional[int]) -> str:
+    return "" if n is None else f"{n:,}"
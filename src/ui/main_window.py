@@ -1,19 +1,19 @@
 import tkinter as tk
 from tkinter import ttk, messagebox
-from typing import Optional
-
-from services.connection_service import ConnectionService, ConnectionInfo
-from services.browser_service import get_browser_data
-from ui.widgets.object_tree import ObjectTree
-from db.objects_repo import get_table_columns, get_primary_key_columns, get_column_defaults, get_table_indexes, get_foreign_keys
-from db.ddl_repo import get_create_table_ddl
-from ui.widgets.table_details import TableDetails
+from typing import TYPE_CHECKING, Callable, Optional
+
+from ui import startup
 from ui.widgets.empty_view import EmptyView
-from ui.widgets.ddl_view import DDLView
-from ui.widgets.scroll_frame import ScrollFrame
-from ui.widgets.sql_runner_view import SqlRunnerView
-from ui.widgets.create_table_view import CreateTableView
-from ui.widgets.create_view_view import CreateViewView
+
+# Los módulos con psycopg2 y las vistas se importan recién cuando se usan,
+# para que la ventana aparezca sin esperar a la capa de base de datos
+if TYPE_CHECKING:
+    from services.connection_service import ConnectionService, ConnectionInfo
+
+# Vistas que no cambian _last_view (al volver se regresa a la anterior)
+_TRANSIENT_VIEWS = ("sql", "create_table", "create_view", "diagnostics", "statements")
+# Cada cuánto se cierran las sesiones de otras bases que quedaron sin uso
+SESSION_SWEEP_MS = 60_000
 
 class MainWindow(tk.Tk):
     def __init__(self):
@@ -21,7 +21,11 @@ class MainWindow(tk.Tk):
         self.title("Database Manager Tool")
         self.geometry("1100x650")
 
-        self.conn_service = ConnectionService()
+        self.conn_service: Optional["ConnectionService"] = None
+        self.obj_tree = None
+        # Se llama cuando termina la inicialización diferida (lo usa --profile-startup)
+        self.on_ready: Optional[Callable[[], None]] = None
+        self.protocol("WM_DELETE_WINDOW", self._on_close)
 
         top = ttk.Frame(self, padding=8)
         top.pack(fill="x")
@@ -29,47 +33,116 @@ class MainWindow(tk.Tk):
         self.lbl_status = ttk.Label(top, text="No conectado")
         self.lbl_status.pack(side="left")
 
+        ttk.Button(top, text="Comparar", command=self.open_schema_diff).pack(side="right", padx=(0, 8))
+        ttk.Button(top, text="Diagnóstico", command=self.open_diagnostics).pack(side="right", padx=(0, 8))
+        ttk.Button(top, text="Sentencias", command=self.open_statements).pack(side="right", padx=(0, 8))
         ttk.Button(top, text="SQL", command=self.open_sql).pack(side="right", padx=(0, 8))
         ttk.Button(top, text="Conectar", command=self.open_login).pack(side="right")
         ttk.Button(top, text="Crear Tabla", command=self.open_create_table).pack(side="right", padx=(0, 8))
         ttk.Button(top, text="Crear Vista", command=self.open_create_view).pack(side="right", padx=(0, 8))
 
+        footer = ttk.Frame(self, padding=(8, 2))
+        footer.pack(side="bottom", fill="x")
+        self.lbl_stats = ttk.Label(footer, text="", style="Muted.TLabel")
+        self.lbl_stats.pack(side="right")
+
         body = ttk.PanedWindow(self, orient="horizontal")
         body.pack(fill="both", expand=True)
-        left = ttk.Frame(body, padding=8)
-        body.add(left, weight=1)
-        ttk.Label(left, text="Objetos").pack(anchor="w")
-
-        self.obj_tree = ObjectTree(left, self.conn_service, on_select=self.on_object_selected)
-        self.obj_tree.pack(fill="both", expand=True)
-        self.obj_tree.populate_connections()
-        self.obj_tree.auto_expand_active()
-
-        ttk.Button(left, text="Refrescar", command=self.refresh_objects).pack(fill="x", pady=(8, 0))
+        self.left = ttk.Frame(body, padding=8)
+        body.add(self.left, weight=1)
+        ttk.Label(self.left, text="Objetos").pack(anchor="w")
+        self.lbl_loading = ttk.Label(self.left, text="Cargando...", style="Muted.TLabel")
+        self.lbl_loading.pack(anchor="w", pady=(8, 0))
 
         right = ttk.Frame(body, padding=8)
         body.add(right, weight=3)
         self.right_container = ttk.Frame(right)
         self.right_container.pack(fill="both", expand=True)
         self.view_empty = EmptyView(self.right_container)
-        self.details_scroll = ScrollFrame(self.right_container)
+        self.view_empty.place(relx=0, rely=0, relwidth=1, relheight=1)
+
+        # Las vistas se construyen la primera vez que se muestran
+        self._views: dict[str, tk.Widget] = {"empty": self.view_empty}
+        self._view_factories = {
+            "details": self._build_details,
+            "ddl": self._build_ddl,
+            "sql": self._build_sql,
+            "create_table": self._build_create_table,
+            "create_view": self._build_create_view,
+            "diagnostics": self._build_diagnostics,
+            "statements": self._build_statements,
+        }
+
+        self._last_view = "empty"
+        self.show_view("empty")
+
+        # after_idle + after(0): corre después de que Tk dibujó el primer frame
+        self.after_idle(lambda: self.after(0, self._first_frame))
+
+    def _first_frame(self):
+        startup.profile.mark("window")
+        with startup.profile.phase("conexiones"):
+            from services.connection_service import ConnectionService
+            self.conn_service = ConnectionService()
+
+        with startup.profile.phase("árbol de objetos"):
+            from ui.widgets.object_tree import ObjectTree
+            self.lbl_loading.destroy()
+            self.obj_tree = ObjectTree(
+                self.left, self.conn_service, on_select=self.on_object_selected, on_export=self.handle_export_object,
+                on_export_ddl=self.handle_export_ddl,
+            )
+            self.obj_tree.pack(fill="both", expand=True)
+            ttk.Button(self.left, text="Refrescar", command=self.refresh_objects).pack(fill="x", pady=(8, 0))
+            self.obj_tree.populate_connections()
+            self.obj_tree.auto_expand_active()
+
+        self._refresh_stats()
+        self.after(SESSION_SWEEP_MS, self._close_idle_sessions)
+        startup.profile.mark("ready")
+        if self.on_ready:
+            self.on_ready()
+
+    def _view(self, name: str) -> tk.Widget:
+        view = self._views.get(name)
+        if view is None:
+            with startup.profile.phase(f"vista {name}"):
+                view = self._view_factories[name]()
+            view.place(relx=0, rely=0, relwidth=1, relheight=1)
+            self._views[name] = view
+        return view
+
+    def _build_details(self):
+        from ui.widgets.scroll_frame import ScrollFrame
+        from ui.widgets.table_details import TableDetails
+
+        scroll = ScrollFrame(self.right_container)
         self.view_details = TableDetails(
-            self.details_scroll.inner,
+            scroll.inner,
             on_view_ddl=self.handle_view_ddl,
             on_drop=self.handle_drop_table,
             on_edit=self.handle_edit_table,
+            on_import=self.handle_import_table,
         )
         self.view_details.pack(fill="both", expand=True)
+        return scroll
 
-        self.view_ddl = DDLView(self.right_container, on_back=lambda: self.show_view("details"))
+    def _build_ddl(self):
+        from ui.widgets.ddl_view import DDLView
+        return DDLView(self.right_container, on_back=lambda: self.show_view("details"))
 
-        self.view_sql = SqlRunnerView(
-        self.right_container,
+    def _build_sql(self):
+        from ui.widgets.sql_runner_view import SqlRunnerView
+        return SqlRunnerView(
+            self.right_container,
             get_conn=self.conn_service.get_conn,
-            on_back=self.back_from_sql
+            on_back=self.back_from_sql,
+            open_conn=self.conn_service.open_current_conn,
         )
-        self.view_sql.place(relx=0, rely=0, relwidth=1, relheight=1)
-        self.view_create_table = CreateTableView(
+
+    def _build_create_table(self):
+        from ui.widgets.create_table_view import CreateTableView
+        return CreateTableView(
             self.right_container,
             get_conn=self.conn_service.get_conn,
             get_databases=self.conn_service.get_databases_active,
@@ -77,10 +150,11 @@ class MainWindow(tk.Tk):
             get_current_info=self.conn_service.get_current_info,
             switch_database=self.conn_service.switch_database,
             on_back=lambda: self.show_view(self._last_view),
-            on_created=self.refresh_objects,)
-        self.view_create_table.place(relx=0, rely=0, relwidth=1, relheight=1)
+            on_created=self._on_object_created,)
 
-        self.view_create_view = CreateViewView(
+    def _build_create_view(self):
+        from ui.widgets.create_view_view import CreateViewView
+        return CreateViewView(
             self.right_container,
             get_conn=self.conn_service.get_conn,
             get_databases=self.conn_service.get_databases_active,
@@ -88,39 +162,90 @@ class MainWindow(tk.Tk):
             get_current_info=self.conn_service.get_current_info,
             switch_database=self.conn_service.switch_database,
             on_back=lambda: self.show_view(self._last_view),
-            on_created=self.refresh_objects,)
-        self.view_create_view.place(relx=0, rely=0, relwidth=1, relheight=1)
-
+            on_created=self._on_object_created,)
 
-        self._last_view = "empty"
+    def _build_diagnostics(self):
+        from ui.widgets.diagnostics_view import DiagnosticsView
+        return DiagnosticsView(self.right_container, on_back=lambda: self.show_view(self._last_view))
 
+    def _build_statements(self):
+        from ui.widgets.statements_view import StatementsView
+        return StatementsView(
+            self.right_container,
+            open_conn=self.conn_service.open_current_conn,
+            on_open_sql=self.open_statement_stat,
+            on_back=lambda: self.show_view(self._last_view),
+        )
 
-        for v in (self.view_empty, self.details_scroll, self.view_ddl):
-            v.place(relx=0, rely=0, relwidth=1, relheight=1)
+    @property
+    def view_ddl(self):
+        return self._view("ddl")
+
+    @property
+    def view_sql(self):
+        return self._view("sql")
+
+    @property
+    def view_statements(self):
+        return self._view("statements")
+
+    @property
+    def view_diagnostics(self):
+        return self._view("diagnostics")
+
+    def _ensure_details(self):
+        self._view("details")
+
+    def _refresh_stats(self):
+        from db.metadata_cache import metadata_cache
+        from db.connection import pool_stats
+        from db.result_cache import result_cache
+
+        c = metadata_cache.stats
+        pools = pool_stats().values()
+        p_hits = sum(p.hits for p in pools)
+        p_misses = sum(p.misses for p in pools)
+        p_wait = sum(p.wait_time for p in pools)
+        self.lbl_stats.configure(
+            text=(
+                f"Caché metadata: {c.hits} aciertos · {c.misses} fallos · {len(metadata_cache)} entradas"
+                f"   |   Pool: {p_hits} reusadas · {p_misses} nuevas · espera {p_wait:.2f} s"
+                f"   |   Caché resultados: {len(result_cache)} · {result_cache.bytes / (1 << 20):.1f} MiB"
+            )
+        )
+        self.after(2000, self._refresh_stats)
 
-        self.show_view("empty")
+    def _close_idle_sessions(self):
+        self.conn_service.close_idle_sessions()
+        self.after(SESSION_SWEEP_MS, self._close_idle_sessions)
 
-    def set_status_connected(self, info: ConnectionInfo):
+    def _on_close(self):
+        try:
+            if self.conn_service is not None:
+                from db.connection import close_all_pools
+                self.conn_service.close_all()
+                close_all_pools()
+        finally:
+            self.destroy()
+
+    def set_status_connected(self, info: "ConnectionInfo"):
         self.lbl_status.configure(
             text=f"Conectado a {info.database} @ {info.host}:{info.port} (user: {info.user})"
         )
 
     def show_view(self, name: str):
-        if name not in ("sql", "create_table", "create_view"):
+        if self.conn_service is None and name != "empty":
+            return   # todavía en la inicialización diferida
+        if name not in _TRANSIENT_VIEWS:
             self._last_view = name
+        for key in ("diagnostics", "statements"):
+            if key in self._views:
+                self._views[key].active = name == key
 
-        if name == "empty":
-            self.view_empty.lift()
-        elif name == "details":
-            self.details_scroll.lift()
-        elif name == "ddl":
-            self.view_ddl.lift()
-        elif name == "sql":
-            self.view_sql.lift()
-        elif name == "create_table":
-            self.view_create_table.lift()
-        elif name == "create_view":
-            self.view_create_view.lift()
+        view = self._view(name)
+        if name == "diagnostics":
+            view.refresh()
+        view.lift()
 
 
     def set_status_disconnected(self):
@@ -128,6 +253,8 @@ class MainWindow(tk.Tk):
 
     def open_login(self):
         from ui.dialogs.login_dialog import LoginDialog
+        if self.conn_service is None:
+            return
 
         dlg = LoginDialog(self, self.conn_service)
         self.wait_window(dlg)
@@ -136,22 +263,42 @@ class MainWindow(tk.Tk):
         if info is not None:
             self.set_status_connected(info)
             self.refresh_objects()
+            # Conexión recién guardada: se indexa su base sin reconstruir el resto
+            if info.database not in self.obj_tree.search_index.indexed_databases(info.id):
+                self.obj_tree.reindex_database(info, info.database)
             self.show_view("empty")
         else:
             self.set_status_disconnected()
             self.show_view("empty")
 
     def refresh_objects(self):
-        conn = self.conn_service.get_conn()
-        if conn is None:
+        from db.metadata_cache import metadata_cache
+
+        if self.conn_service is None or self.conn_service.get_conn() is None:
             return
+        metadata_cache.clear()
         self.obj_tree.populate_connections()
 
+    def _on_object_created(self):
+        # Solo cambió la base activa: se reindexa esa, no todas
+        self.refresh_objects()
+        info = self.conn_service.get_current_info()
+        if info is not None:
+            self.obj_tree.reindex_database(info, info.database)
+
     def on_object_selected(self, obj, meta=None):
-        conn = self.conn_service.get_conn()
-        if conn is None:
+        if self.conn_service is None or self.conn_service.get_conn() is None:
             return
 
+        # Conexión del pool: la sesión principal puede estar ejecutando una consulta del editor
+        with self.conn_service.open_current_conn() as conn:
+            self._show_object(conn, obj, meta)
+
+    def _show_object(self, conn, obj, meta=None):
+        from db.objects_repo import describe_table
+        from db.ddl_repo import build_create_table_ddl
+        from db.instrumentation import timed
+
         if obj.obj_type != "table":
             from db.ddl_repo import get_object_ddl
             ddl = get_object_ddl(conn, obj, meta or {})
@@ -160,44 +307,54 @@ class MainWindow(tk.Tk):
             self.show_view("ddl")
             return
 
+        self._ensure_details()
         self.view_details.clear_all()
         self.view_details.current_schema = obj.schema
         self.view_details.current_table = obj.name
         self.view_details.set_header(obj.name, obj.schema)
 
-        # PK columns
-        pk_cols = set(get_primary_key_columns(conn, obj.schema, obj.name))
-        defaults = get_column_defaults(conn, obj.schema, obj.name)
+        desc = describe_table(conn, obj.schema, obj.name)
+        with timed("ui:load_table"):
+            self.view_details.load_table(desc)
 
-        # Columnas
-        cols = get_table_columns(conn, obj.schema, obj.name)
+        # Datos: se paginan en segundo plano con conexiones del pool
+        self.view_details.browse(self.conn_service.open_current_conn, obj.schema, obj.name)
+        self._load_table_stats(obj.schema, obj.name)
 
-        columns_rows = []
-        for name, dtype, notnull in cols:
-            pk_flag = "PK" if name in pk_cols else ""
-            default_val = defaults.get(name, "")
-            columns_rows.append((name, dtype, "NO" if notnull else "YES", default_val, pk_flag))
+        self.view_details.current_ddl = build_create_table_ddl(desc)
+        self.show_view("details")
 
-        self.view_details.load_columns(columns_rows) 
-        idx_rows = get_table_indexes(conn, obj.schema, obj.name)
-        self.view_details.load_indexes(idx_rows)
-        fk_rows = get_foreign_keys(conn, obj.schema, obj.name)
-        self.view_details.load_foreign_keys(fk_rows)
+    def _load_table_stats(self, schema: str, table: str):
+        """
+        Filas/bytes/rangos aproximados en segundo plano, después de dibujar las columnas.
+        """
+        from db.table_stats import get_table_stats
+        from ui.background import run_in_background
 
-        # Preview
-        try:
-            from db.execute import fetch_all
-            preview_sql = f'SELECT * FROM "{obj.schema}"."{obj.name}" LIMIT 100;'
-            pcols, prows = fetch_all(conn, preview_sql)
-            self.view_details.load_preview(pcols, prows)
-        except Exception:
-            self.view_details.load_preview(["info"], [("No se pudo cargar preview.",)])
-
-        self.view_details.current_ddl = get_create_table_ddl(conn, obj.schema, obj.name)
-        self.show_view("details")
+        details = self.view_details
+        open_conn = self.conn_service.open_current_conn
+
+        def job():
+            with open_conn() as conn:
+                return get_table_stats(conn, schema, table)
+
+        def is_current():
+            return details.current_schema == schema and details.current_table == table
+
+        def on_done(stats):
+            if is_current():
+                details.load_stats(stats)
+
+        def on_error(e):
+            if is_current():
+                details.set_stats_error(e)
 
+        details.set_stats_loading()
+        run_in_background(self, job, on_done, on_error)
 
     def handle_view_ddl(self):
+        if "details" not in self._views:
+            return
         if not self.view_details.current_table or not self.view_details.current_ddl:
             return
         title = f"Generación de DDL - TABLE {self.view_details.current_table}"
@@ -211,6 +368,100 @@ class MainWindow(tk.Tk):
     def handle_edit_table(self):
         pass
 
+    def handle_import_table(self):
+        from ui.dialogs.import_dialog import ImportDialog
+        if "details" not in self._views or not self.conn_service.get_current_info():
+            return
+        if not self.view_details.current_table:
+            return
+        dlg = ImportDialog(self, self.conn_service, self.view_details.current_schema, self.view_details.current_table)
+        self.wait_window(dlg)
+
+    def handle_export_object(self, meta):
+        from ui.dialogs.export_dialog import ExportDialog
+        info, database = meta["info"], meta["database"]
+        schema, name = meta["schema"], meta["name"]
+        sql = 'SELECT * FROM "{}"."{}"'.format(schema.replace('"', '""'), name.replace('"', '""'))
+        dlg = ExportDialog(
+            self,
+            lambda: self.conn_service.open_temp_conn(info, database),
+            sql,
+            title=f"{schema}.{name}",
+            default_name=name,
+        )
+        self.wait_window(dlg)
+
+    def handle_export_ddl(self, meta):
+        from ui.dialogs.ddl_export_dialog import DdlExportDialog
+        info, database = meta["info"], meta["database"]
+        schema = meta.get("schema")
+        dlg = DdlExportDialog(
+            self,
+            lambda: self.conn_service.open_temp_conn(info, database),
+            title=f"{database}.{schema}" if schema else database,
+            schema=schema,
+            default_name=f"{database}_{schema}" if schema else database,
+        )
+        self.wait_window(dlg)
+
+    def open_statements(self):
+        if self.conn_service is None or self.conn_service.get_conn() is None:
+            messagebox.showwarning("Sin conexión", "Conéctate primero.")
+            return
+        self.show_view("statements")
+        self.view_statements.refresh()
+
+    def open_statement_stat(self, stat):
+        """
+        Abre el fingerprint de una sentencia en el editor. Solo se pide el plan si se puede
+        ejecutar tal cual: sin constantes reemplazadas ni parámetros, y en la base actual.
+        """
+        self.show_view("sql")
+        current = self.conn_service.get_current_info()
+        if stat.has_placeholders:
+            self.view_sql.load_text(
+                stat.query, "La sentencia tiene parámetros (_ o $n): reemplázalos por valores para ver el plan."
+            )
+        elif stat.database and (current is None or current.database != stat.database):
+            self.view_sql.load_text(
+                stat.query, f"La sentencia es de la base {stat.database}: cámbiate a esa base para ver el plan."
+            )
+        else:
+            self.view_sql.open_statement(stat.query)
+
+    def open_migration_in_sql(self, sql: str, info: "ConnectionInfo", database: str) -> bool:
+        """
+        Carga la migración en el editor, sin ejecutarla, sobre la sesión de la base destino.
+        Retorna: False si no se pudo cambiar a esa sesión
+        """
+        from dataclasses import replace
+        if "sql" in self._views and self.view_sql.busy:
+            messagebox.showwarning("Migración", "El editor SQL está ejecutando una consulta. Espera a que termine o cancélala.")
+            return False
+
+        target = replace(info, database=database)
+        cur = self.conn_service.get_current_info()
+        if cur is None or (cur.id, cur.database) != (target.id, target.database):
+            try:
+                self.conn_service.connect(target)
+            except Exception as e:
+                messagebox.showerror("Migración", f"No se pudo abrir la sesión de {database}:\n{e}")
+                return False
+            self.set_status_connected(target)
+
+        self.show_view("sql")
+        self.view_sql.load_text(sql, f"Migración para {database} @ {info.name}: revísala antes de ejecutarla.")
+        return True
+
+    def open_schema_diff(self):
+        if self.conn_service is None:
+            return
+        from ui.dialogs.schema_diff_dialog import SchemaDiffDialog
+        SchemaDiffDialog(self, self.conn_service, on_open_sql=self.open_migration_in_sql)
+
+    def open_diagnostics(self):
+        self.show_view("diagnostics")
+
     def open_sql(self):
         self.show_view("sql")
 
@@ -223,7 +474,7 @@ class MainWindow(tk.Tk):
     def open_create_view(self):
         self.show_view("create_view")
 
-    def get_active_info(self) -> Optional[ConnectionInfo]:
+    def get_active_info(self) -> Optional["ConnectionInfo"]:
         infos, active = self.load_all()
         if not infos:
             return None
@@ -0,0 +1,116 @@
+import builtins
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from typing import Optional
+
+# Tiempo máximo desde que arranca el proceso hasta que se dibuja la ventana
+STARTUP_BUDGET_MS = 500.0
+REPORT_TOP_MODULES = 25
+
+
+class ImportProfiler:
+    """
+    Mide cuánto tarda cada import nuevo (tiempo propio, sin contar los imports que dispara).
+    Solo mide el hilo principal: los hilos de fondo importan normalmente.
+    """
+
+    def __init__(self):
+        self.self_time: dict[str, float] = {}
+        self.total_time: dict[str, float] = {}
+        self._stack: list[float] = []
+        self._orig = None
+        self._main = threading.get_ident()
+
+    def install(self) -> None:
+        if self._orig is None:
+            self._orig = builtins.__import__
+            builtins.__import__ = self._import
+
+    def uninstall(self) -> None:
+        if self._orig is not None:
+            builtins.__import__ = self._orig
+            self._orig = None
+
+    def _import(self, name, globals=None, locals=None, fromlist=(), level=0):
+        if threading.get_ident() != self._main:
+            return self._orig(name, globals, locals, fromlist, level)
+
+        key = name
+        if level:
+            package = (globals or {}).get("__package__") or ""
+            base = package.rsplit(".", level - 1)[0] if level > 1 else package
+            key = f"{base}.{name}" if name else base
+        # from paquete import submódulo: el submódulo también puede ser nuevo
+        new = [key] if key not in sys.modules else []
+        new += [f"{key}.{f}" for f in fromlist or () if f != "*" and f"{key}.{f}" not in sys.modules]
+        if not new:
+            return self._orig(name, globals, locals, fromlist, level)
+
+        started = time.perf_counter()
+        self._stack.append(0.0)
+        try:
+            return self._orig(name, globals, locals, fromlist, level)
+        finally:
+            elapsed = time.perf_counter() - started
+            children = self._stack.pop()
+            label = new[0]
+            self.self_time[label] = self.self_time.get(label, 0.0) + elapsed - children
+            self.total_time[label] = self.total_time.get(label, 0.0) + elapsed
+            if self._stack:
+                self._stack[-1] += elapsed
+
+
+class StartupProfile:
+    """
+    Hitos del arranque (segundos desde started) y fases de inicialización de MainWindow.
+    Los hitos se registran siempre (es barato); el reporte solo con --profile-startup.
+    """
+
+    def __init__(self, started: Optional[float] = None):
+        self.started = time.perf_counter() if started is None else started
+        self.marks: dict[str, float] = {}
+        self.phases: list[tuple[str, float]] = []
+        self.imports: Optional[ImportProfiler] = None
+
+    def mark(self, name: str) -> None:
+        self.marks.setdefault(name, time.perf_counter() - self.started)
+
+    @contextmanager
+    def phase(self, name: str):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.phases.append((name, time.perf_counter() - started))
+
+    def time_to_window_ms(self) -> Optional[float]:
+        t = self.marks.get("window")
+        return None if t is None else t * 1000
+
+    def report(self, budget_ms: float = STARTUP_BUDGET_MS, top: int = REPORT_TOP_MODULES) -> str:
+        lines = ["== Arranque =="]
+        for name, t in sorted(self.marks.items(), key=lambda kv: kv[1]):
+            lines.append(f"  {name:<28} {t * 1000:9.1f} ms")
+
+        ttw = self.time_to_window_ms()
+        if ttw is not None:
+            status = "OK" if ttw <= budget_ms else "EXCEDIDO"
+            lines.append(f"Ventana visible: {ttw:.1f} ms (presupuesto {budget_ms:.0f} ms, {status})")
+
+        if self.phases:
+            lines.append("== Inicialización ==")
+            for name, t in sorted(self.phases, key=lambda p: -p[1]):
+                lines.append(f"  {name:<28} {t * 1000:9.1f} ms")
+
+        if self.imports is not None and self.imports.self_time:
+            lines.append(f"== Imports (top {top}, tiempo propio / acumulado) ==")
+            ranked = sorted(self.imports.self_time.items(), key=lambda kv: -kv[1])[:top]
+            for name, t in ranked:
+                total = self.imports.total_time.get(name, t)
+                lines.append(f"  {name:<40} {t * 1000:8.1f} ms {total * 1000:9.1f} ms")
+        return "\n".join(lines)
+
+
+profile = StartupProfile()
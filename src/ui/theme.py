@@ -66,3 +66,9 @@ def apply_theme(root):
     style.map("TCombobox", fieldbackground=[("readonly", BG_TABLE)], foreground=[("readonly", TEXT)])
 
     style.map("TButton", background=[("active", "#1e293b")])
+
+    style.configure("TNotebook", background=BG_MAIN, bordercolor=BORDER)
+    style.configure("TNotebook.Tab", background=BG_PANEL, foreground=TEXT, padding=(10, 4))
+    style.map("TNotebook.Tab", background=[("selected", BG_TABLE)], foreground=[("selected", TEXT)])
+
+    style.configure("TCheckbutton", background=BG_MAIN, foreground=TEXT)
@@ -0,0 +1,140 @@
+import tkinter as tk
+from tkinter import ttk
+from typing import Any, Callable, ContextManager, Optional
+
+from db.table_browser import TableBrowser, BrowsePage, open_browser
+from ui.background import run_in_background
+from ui.widgets.virtual_grid import VirtualGrid
+
+KEY_ORDER = "(clave primaria)"
+
+
+class DataBrowser(ttk.Frame):
+    """
+    Datos de una tabla página por página (keyset sobre la primary key o un índice).
+    Anterior/Siguiente cuestan lo mismo en cualquier parte de la tabla.
+    """
+
+    def __init__(self, parent, height: int = 12):
+        super().__init__(parent)
+        self.open_conn: Optional[Callable[[], ContextManager[Any]]] = None
+        self.browser: Optional[TableBrowser] = None
+        self._token = None
+
+        bar = ttk.Frame(self)
+        bar.pack(fill="x", pady=(0, 6))
+
+        self.btn_first = ttk.Button(bar, text="⏮ Inicio", command=lambda: self._go("first"))
+        self.btn_first.pack(side="left", padx=(0, 4))
+        self.btn_prev = ttk.Button(bar, text="◀ Anterior", command=lambda: self._go("prev"))
+        self.btn_prev.pack(side="left", padx=(0, 4))
+        self.btn_next = ttk.Button(bar, text="Siguiente ▶", command=lambda: self._go("next"))
+        self.btn_next.pack(side="left", padx=(0, 12))
+
+        ttk.Label(bar, text="Ordenar por").pack(side="left", padx=(0, 6))
+        self.var_sort = tk.StringVar(value=KEY_ORDER)
+        self.cmb_sort = ttk.Combobox(bar, textvariable=self.var_sort, values=[KEY_ORDER], width=18, state="readonly")
+        self.cmb_sort.pack(side="left", padx=(0, 4))
+        self.cmb_sort.bind("<<ComboboxSelected>>", lambda e: self._change_sort())
+        self.var_desc = tk.BooleanVar(value=False)
+        ttk.Checkbutton(bar, text="Desc", variable=self.var_desc, command=self._change_sort).pack(side="left", padx=(0, 12))
+
+        ttk.Label(bar, text="Ir a").pack(side="left", padx=(0, 6))
+        self.var_seek = tk.StringVar()
+        ent = ttk.Entry(bar, textvariable=self.var_seek, width=18)
+        ent.pack(side="left", padx=(0, 4))
+        ent.bind("<Return>", lambda e: self._go("seek"))
+        ttk.Button(bar, text="Ir", command=lambda: self._go("seek")).pack(side="left")
+
+        self.lbl_status = ttk.Label(self, text="", style="Muted.TLabel")
+        self.lbl_status.pack(anchor="w", pady=(0, 4))
+
+        self.grid_view = VirtualGrid(self, column_width=140, height=height)
+        self.grid_view.pack(fill="both", expand=True)
+        self._update_buttons(None)
+
+    def clear(self):
+        self._token = None
+        self.browser = None
+        self.grid_view.clear()
+        self.lbl_status.configure(text="")
+        self.cmb_sort["values"] = [KEY_ORDER]
+        self.var_sort.set(KEY_ORDER)
+        self.var_desc.set(False)
+        self._update_buttons(None)
+
+    def open(self, open_conn: Callable[[], ContextManager[Any]], schema: str, table: str):
+        self.clear()
+        self.open_conn = open_conn
+        token = self._token = object()
+
+        def job():
+            with open_conn() as conn:
+                browser = open_browser(conn, schema, table)
+                return browser, browser.first_page(conn)
+
+        def on_done(result):
+            if token is not self._token:
+                return
+            self.browser, page = result
+            self.cmb_sort["values"] = [KEY_ORDER] + self.browser.sortable
+            self._show(page)
+
+        self.lbl_status.configure(text="Cargando...")
+        run_in_background(self, job, on_done, lambda e: self._fail(token, e))
+
+    def _go(self, action: str):
+        browser = self.browser
+        if browser is None or self.open_conn is None:
+            return
+        seek = [v.strip() for v in self.var_seek.get().split(",")] if action == "seek" else None
+        if seek == [""]:
+            action = "first"
+        token = self._token = object()
+
+        def job():
+            with self.open_conn() as conn:
+                if action == "next":
+                    return browser.next_page(conn)
+                if action == "prev":
+                    return browser.prev_page(conn)
+                if action == "seek":
+                    return browser.seek(conn, seek)
+                return browser.first_page(conn)
+
+        def on_done(page):
+            if token is self._token:
+                self._show(page)
+
+        self._update_buttons(None)
+        self.lbl_status.configure(text="Cargando...")
+        run_in_background(self, job, on_done, lambda e: self._fail(token, e))
+
+    def _change_sort(self):
+        if self.browser is None:
+            return
+        col = self.var_sort.get()
+        try:
+            self.browser.set_sort(None if col == KEY_ORDER else col, self.var_desc.get())
+        except ValueError as e:
+            self.lbl_status.configure(text=str(e))
+            return
+        self._go("first")
+
+    def _fail(self, token, e):
+        if token is self._token:
+            self.lbl_status.configure(text=f"ERROR: {e}")
+            self._update_buttons(self.browser.page if self.browser else None)
+
+    def _show(self, page: BrowsePage):
+        self.grid_view.set_rows(page.columns, page.rows)
+        b = self.browser
+        where = f"página {b.page_no}" if b.page_no is not None else "desde la clave indicada"
+        order = ", ".join(b.order_columns) + (" (desc)" if b.descending else "")
+        self.lbl_status.configure(text=f"{len(page.rows)} fila(s) · {where} · orden: {order}")
+        self._update_buttons(page)
+
+    def _update_buttons(self, page: Optional[BrowsePage]):
+        self.btn_first.configure(state="normal" if page is not None and page.has_prev else "disabled")
+        self.btn_prev.configure(state="normal" if page is not None and page.has_prev else "disabled")
+        self.btn_next.configure(state="normal" if page is not None and page.has_next else "disabled")
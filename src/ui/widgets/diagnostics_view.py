@@ -0,0 +1,109 @@
+import time
+import tkinter as tk
+from tkinter import ttk, filedialog, messagebox
+
+from db.instrumentation import instrumentation
+
+REFRESH_MS = 2000
+SLOWEST_LIMIT = 100
+
+
+class DiagnosticsView(ttk.Frame):
+    """
+    Llamadas más lentas recientes y percentiles de latencia por etiqueta.
+    """
+
+    def __init__(self, parent, on_back=None):
+        super().__init__(parent)
+        self.on_back = on_back
+
+        top = ttk.Frame(self, padding=8)
+        top.pack(fill="x")
+
+        ttk.Button(top, text="← Volver", command=self._back).pack(side="left", padx=(0, 8))
+        ttk.Label(top, text="Diagnóstico", style="Title.TLabel").pack(side="left")
+
+        btns = ttk.Frame(top)
+        btns.pack(side="right")
+        ttk.Button(btns, text="Actualizar", command=self.refresh).pack(side="left", padx=(0, 8))
+        ttk.Button(btns, text="Exportar JSON", command=self._save).pack(side="left", padx=(0, 8))
+        ttk.Button(btns, text="Limpiar", command=self._clear).pack(side="left")
+
+        body = ttk.Frame(self, padding=8)
+        body.pack(fill="both", expand=True)
+
+        ttk.Label(body, text="Latencia por etiqueta", style="Section.TLabel").pack(anchor="w")
+        self.hist_tree = self._make_tree(
+            body,
+            columns=("label", "count", "p50", "p95", "p99", "max"),
+            headings=("Etiqueta", "Llamadas", "p50 (ms)", "p95 (ms)", "p99 (ms)", "Máx (ms)"),
+            widths=(320, 80, 90, 90, 90, 90),
+            height=8,
+        )
+        self.hist_tree.pack(fill="x", pady=(6, 14))
+
+        ttk.Label(body, text="Llamadas más lentas (recientes)", style="Section.TLabel").pack(anchor="w")
+        self.slow_tree = self._make_tree(
+            body,
+            columns=("when", "kind", "label", "ms", "rows", "bytes", "conn", "error"),
+            headings=("Hora", "Tipo", "Etiqueta", "ms", "Filas", "Bytes", "Conexión", "Error"),
+            widths=(80, 80, 300, 80, 70, 90, 80, 240),
+            height=12,
+        )
+        self.slow_tree.pack(fill="both", expand=True, pady=(6, 0))
+
+        # MainWindow lo marca al mostrar/ocultar el panel
+        self.active = False
+        self.after(REFRESH_MS, self._auto_refresh)
+
+    def _make_tree(self, parent, columns, headings, widths, height):
+        tree = ttk.Treeview(parent, columns=columns, show="headings", height=height)
+        for col, head, w in zip(columns, headings, widths):
+            tree.heading(col, text=head)
+            tree.column(col, width=w, anchor="w", stretch=True)
+        return tree
+
+    def _back(self):
+        if self.on_back:
+            self.on_back()
+
+    def refresh(self):
+        self.hist_tree.delete(*self.hist_tree.get_children())
+        hist = instrumentation.histograms()
+        for label, h in sorted(hist.items(), key=lambda kv: kv[1]["p95"], reverse=True):
+            self.hist_tree.insert("", "end", values=(
+                label, h["count"],
+                f"{h['p50'] * 1000:.1f}", f"{h['p95'] * 1000:.1f}",
+                f"{h['p99'] * 1000:.1f}", f"{h['max'] * 1000:.1f}",
+            ))
+
+        self.slow_tree.delete(*self.slow_tree.get_children())
+        for r in instrumentation.slowest(SLOWEST_LIMIT):
+            self.slow_tree.insert("", "end", values=(
+                time.strftime("%H:%M:%S", time.localtime(r.started)),
+                r.kind, r.label, f"{r.elapsed * 1000:.1f}",
+                r.rows, r.bytes, r.conn_id or "", r.error or "",
+            ))
+
+    def _auto_refresh(self):
+        # Solo se repinta cuando el panel está al frente
+        try:
+            if self.active:
+                self.refresh()
+            self.after(REFRESH_MS, self._auto_refresh)
+        except tk.TclError:
+            pass  # ventana destruida
+
+    def _save(self):
+        path = filedialog.asksaveasfilename(
+            defaultextension=".json",
+            filetypes=[("JSON", "*.json"), ("All", "*.*")]
+        )
+        if not path:
+            return
+        instrumentation.dump_json(path)
+        messagebox.showinfo("Guardado", "Archivo guardado correctamente.")
+
+    def _clear(self):
+        instrumentation.clear()
+        self.refresh()
@@ -1,42 +1,151 @@
 import tkinter as tk
+from concurrent.futures import ThreadPoolExecutor
 from tkinter import ttk
 from typing import Callable, Optional, Any
 
 from models.db_object import DbObject
 from services.connection_service import ConnectionInfo
+from services.search_index import SearchIndex, SearchEntry, build_index
+from ui.background import run_in_background
 from db.objects_repo import (
-    list_tables_by_schema,
-    list_views_by_schema,
-    list_indexes_by_schema,
-    list_functions_by_schema,
-    list_sequences_by_schema,
-    list_types_by_schema,
+    FOLDER_PAGE_SIZE,
+    FOLDER_START_KEYS,
+    like_pattern,
+    list_all_objects,
+    list_folder_page,
+    load_schema_snapshot,
 )
 
 DUMMY = "__DUMMY__"
+MORE = "__MORE__"
+INSERT_CHUNK = 250             # items insertados por vuelta del loop de Tk
+FILTER_DEBOUNCE_MS = 300
+TREE_WORKERS = 6               # una por carpeta de schema
+PREFETCH_SCHEMA_FOLDERS = True # al abrir un schema, cargar sus seis carpetas en paralelo
+SEARCH_RESULTS_HEIGHT = 10
+
+# kind del objeto -> kind de la carpeta que lo contiene
+_FOLDER_OF = {
+    "table": "folder_tables",
+    "view": "folder_views",
+    "index": "folder_indexes",
+    "function": "folder_functions",
+    "sequence": "folder_sequences",
+    "type": "folder_types",
+}
+_KIND_OF_FOLDER = {folder: kind for kind, folder in _FOLDER_OF.items()}
+_FOLDER_LABELS = {
+    "folder_tables": "Tables",
+    "folder_views": "Views",
+    "folder_indexes": "Indexes",
+    "folder_functions": "Functions",
+    "folder_sequences": "Sequences",
+    "folder_types": "Types",
+}
 
 class ObjectTree(ttk.Frame):
-    def __init__(self, parent, connection_service, on_select: Optional[Callable[[DbObject], None]] = None):
+    def __init__(
+        self,
+        parent,
+        connection_service,
+        on_select: Optional[Callable[[DbObject], None]] = None,
+        on_export: Optional[Callable[[dict], None]] = None,
+        on_export_ddl: Optional[Callable[[dict], None]] = None,
+        prefetch_folders: bool = PREFETCH_SCHEMA_FOLDERS,
+    ):
         super().__init__(parent)
         self.on_select = on_select
+        self.on_export = on_export
+        self.on_export_ddl = on_export_ddl
         self.conn_service = connection_service
 
+        self.search_index = SearchIndex()
+        self._index_task = None
+        self._index_gen = 0
+        self._index_status = ""
+        self._results: list[SearchEntry] = []
+
+        self.var_search = tk.StringVar()
+        self.ent_search = ttk.Entry(self, textvariable=self.var_search)
+        self.ent_search.pack(fill="x", pady=(0, 4))
+        self.ent_search.bind("<KeyRelease>", self._handle_search_key)
+        self.ent_search.bind("<Return>", lambda e: self._reveal_result(0))
+        self.ent_search.bind("<Down>", self._focus_results)
+        self.ent_search.bind("<Escape>", lambda e: self._clear_search())
+
+        frm_index = ttk.Frame(self)
+        frm_index.pack(fill="x")
+        self.lbl_index = ttk.Label(frm_index, text="", style="Muted.TLabel")
+        self.lbl_index.pack(side="left", anchor="w")
+        ttk.Button(frm_index, text="Reindexar", command=self.rebuild_search_index).pack(side="right")
+
+        # Filtro de la carpeta seleccionada (se aplica en la consulta al catálogo)
+        frm_filter = ttk.Frame(self)
+        frm_filter.pack(fill="x", pady=(4, 4))
+        self.lbl_filter = ttk.Label(frm_filter, text="Filtrar carpeta:", style="Muted.TLabel")
+        self.lbl_filter.pack(side="left", padx=(0, 6))
+        self.var_filter = tk.StringVar()
+        self.ent_filter = ttk.Entry(frm_filter, textvariable=self.var_filter, state="disabled")
+        self.ent_filter.pack(side="left", fill="x", expand=True)
+        self.ent_filter.bind("<KeyRelease>", self._handle_filter_key)
+
+        # Se muestra solo mientras hay resultados (entre el buscador y el árbol)
+        self.lst_results = tk.Listbox(self, height=SEARCH_RESULTS_HEIGHT, activestyle="dotbox")
+        self.lst_results.bind("<Return>", lambda e: self._reveal_selected_result())
+        self.lst_results.bind("<Double-1>", lambda e: self._reveal_selected_result())
+        self.lst_results.bind("<Escape>", lambda e: self._clear_search())
+
         self.tree = ttk.Treeview(self, show="tree")
         self.tree.pack(fill="both", expand=True)
 
         self._node_meta: dict[str, dict[str, Any]] = {} 
         self._node_to_obj: dict[str, DbObject] = {}      
 
+        self.prefetch_folders = prefetch_folders
+        self._executor = ThreadPoolExecutor(max_workers=TREE_WORKERS, thread_name_prefix="object-tree")
+        self._generation = 0                          # sube en cada clear(): invalida cargas en curso
+        self._loading: dict[str, object] = {}         # nodo -> token de la carga en curso
+        self._waiters: dict[str, list[Callable[[], None]]] = {}
+        self._loaders = {
+            "connection": (self._fetch_databases, self._render_databases),
+            "database": (self._fetch_schemas, self._render_schemas),
+        }
+        for fkind in _KIND_OF_FOLDER:
+            self._loaders[fkind] = (self._fetch_folder_page, self._render_folder_page)
+        self._inserting: dict[str, object] = {}       # carpeta -> token de la inserción por partes
+        self._filter_folder: Optional[str] = None
+        self._filter_after = None
+
         self.tree.bind("<<TreeviewSelect>>", self._handle_select)
         self.tree.bind("<<TreeviewOpen>>", self._handle_open)
+        self.tree.bind("<<TreeviewClose>>", self._handle_close)
+        self.tree.bind("<Button-3>", self._handle_context_menu)
+
+        self.menu = tk.Menu(self, tearoff=0)
+        self.menu.add_command(label="Exportar datos...", command=self._export_selected)
+        self.ddl_menu = tk.Menu(self, tearoff=0)
+        self.ddl_menu.add_command(label="Exportar DDL...", command=self._export_ddl_selected)
+
+    def destroy(self):
+        self._executor.shutdown(wait=False, cancel_futures=True)
+        super().destroy()
 
     def clear(self):
+        self._generation += 1
+        self._loading.clear()
+        self._waiters.clear()
+        self._inserting.clear()
+        self._bind_filter_to("")
         for item in self.tree.get_children():
             self.tree.delete(item)
         self._node_meta.clear()
         self._node_to_obj.clear()
 
-    def populate_connections(self):
+    def populate_connections(self, reindex: bool = False):
+        """
+        El índice de búsqueda se arma solo la primera vez o si se pide (reindex);
+        después de un DDL alcanza con reindex_database.
+        """
         self.clear()
         infos, active = self.conn_service.load_all()
 
@@ -49,6 +158,9 @@ class ObjectTree(ttk.Frame):
             if active and info.id == active:
                 self.tree.item(conn_id, open=True)
 
+        if reindex or self._index_gen == 0:
+            self.rebuild_search_index()
+
     def _add_dummy(self, parent_id: str):
         dummy = self.tree.insert(parent_id, "end", text="Cargando...")
         self._node_meta[dummy] = {"kind": DUMMY}
@@ -64,165 +176,284 @@ class ObjectTree(ttk.Frame):
             self._node_to_obj.pop(ch, None)
 
     def _handle_open(self, _evt):
+        self._expand_node(self.tree.focus())
+
+    def _handle_close(self, _evt):
+        # Si todavía estaba cargando, el resultado se descarta y se recarga al volver a abrir
         node_id = self.tree.focus()
+        if self._has_dummy(node_id) and self._loading.pop(node_id, None) is not None:
+            self._set_dummy_text(node_id, "Cargando...")
+            self._waiters.pop(node_id, None)
+        elif self._inserting.pop(node_id, None) is not None:
+            # Sin token, _insert_page corta en la próxima tanda; la carpeta a medias vuelve a "sin cargar"
+            self._clear_children(node_id)
+            self._add_dummy(node_id)
+            self._waiters.pop(node_id, None)
+
+    def _expand_node(self, node_id: str, on_loaded: Optional[Callable[[], None]] = None):
+        """
+        Carga los hijos de node_id en el pool de hilos; el "Cargando..." queda hasta que llegan.
+        on_loaded se llama (en el hilo de Tk) cuando el nodo ya tiene sus hijos.
+        """
         meta = self._node_meta.get(node_id)
-        if not meta:
-            return
-
-        if not self._has_dummy(node_id):
+        if not meta or not self._has_dummy(node_id):
+            if on_loaded:
+                on_loaded()
             return
-
-        self._clear_children(node_id)
+        if on_loaded:
+            self._waiters.setdefault(node_id, []).append(on_loaded)
+        if node_id in self._loading:
+            return   # ya está en camino (p.ej. por prefetch)
 
         kind = meta["kind"]
-
-        if kind == "connection":
-            self._load_databases(node_id, meta["info"])
-
-        elif kind == "database":
-            self._load_schemas(node_id, meta["info"], meta["database"])
-
-        elif kind == "schema":
+        if kind == "schema":
+            # Las carpetas son fijas: no hace falta ir al servidor
+            self._clear_children(node_id)
             self._load_schema_folders(node_id, meta["info"], meta["database"], meta["schema"])
+            self._loaded(node_id)
+            return
 
-        elif kind == "folder_tables":
-            self._load_tables(node_id, meta["info"], meta["database"], meta["schema"])
+        loader = self._loaders.get(kind)
+        if loader is None:
+            return
+        fetch, render = loader
+
+        token = object()
+        self._loading[node_id] = token
+        gen = self._generation
+
+        def on_done(data):
+            if not self._is_current(node_id, token, gen):
+                return
+            del self._loading[node_id]
+            self._clear_children(node_id)
+            render(node_id, meta, data)
+            if kind not in _KIND_OF_FOLDER:
+                self._loaded(node_id)   # las carpetas avisan al terminar de insertar
+
+        def on_error(e):
+            if not self._is_current(node_id, token, gen):
+                return
+            del self._loading[node_id]
+            msg = str(e).strip()
+            self._set_dummy_text(node_id, f"Error: {msg.splitlines()[0] if msg else type(e).__name__}")
+            self._loaded(node_id)
+
+        run_in_background(self, lambda: fetch(meta), on_done, on_error, executor=self._executor)
+
+    def _is_current(self, node_id: str, token, gen: int) -> bool:
+        # Descarta resultados de nodos borrados, colapsados o de antes de un refresco
+        return gen == self._generation and self._loading.get(node_id) is token and self.tree.exists(node_id)
+
+    def _loaded(self, node_id: str):
+        for cb in self._waiters.pop(node_id, []):
+            cb()
+
+    def _set_dummy_text(self, node_id: str, text: str):
+        if self.tree.exists(node_id) and self._has_dummy(node_id):
+            self.tree.item(self.tree.get_children(node_id)[0], text=text)
 
-        elif kind == "folder_views":
-            self._load_views(node_id, meta["info"], meta["database"], meta["schema"])
+    def _load_schema_folders(self, schema_node: str, info, database: str, schema: str):
+        folders = [
+            ("Tables", "folder_tables"),
+            ("Views", "folder_views"),
+            ("Indexes", "folder_indexes"),
+            ("Functions", "folder_functions"),
+            ("Sequences", "folder_sequences"),
+            ("Types", "folder_types"),
+        ]
+        fids = []
+        for label, fkind in folders:
+            fid = self.tree.insert(schema_node, "end", text=label, open=False)
+            self._node_meta[fid] = {"kind": fkind, "info": info, "database": database, "schema": schema, "filter": ""}
+            self._add_dummy(fid)
+            fids.append(fid)
 
-        elif kind == "folder_indexes":
-            self._load_indexes(node_id, meta["info"], meta["database"], meta["schema"])
+        if self.prefetch_folders:
+            # Las seis carpetas en paralelo, sin esperar a que el usuario las abra
+            self.conn_service.ensure_pool_capacity(info, database, TREE_WORKERS)
+            for fid in fids:
+                self._expand_node(fid)
 
-        elif kind == "folder_functions":
-            self._load_functions(node_id, meta["info"], meta["database"], meta["schema"])
+    def _open_meta_conn(self, info, database: str):
+        return self.conn_service.open_temp_conn(info, database)
 
-        elif kind == "folder_sequences":
-            self._load_sequences(node_id, meta["info"], meta["database"], meta["schema"])
+    # --- Carga: fetch_* corre en el pool de hilos, render_* en el hilo de Tk ---
 
-        elif kind == "folder_types":
-            self._load_types(node_id, meta["info"], meta["database"], meta["schema"])
+    def _fetch_databases(self, meta):
+        return self.conn_service.get_databases(meta["info"])
 
-    def _load_databases(self, conn_node: str, info):
-        dbs = self.conn_service.get_databases(info)
+    def _render_databases(self, conn_node: str, meta, dbs):
+        info = meta["info"]
         for db in dbs:
             db_id = self.tree.insert(conn_node, "end", text=db, open=False)
             self._node_meta[db_id] = {"kind": "database", "info": info, "database": db}
             self._add_dummy(db_id)
 
-    def _load_schemas(self, db_node: str, info, database: str):
-        schemas = self.conn_service.get_schemas(info, database)
+    def _fetch_schemas(self, meta):
+        return self.conn_service.get_schemas(meta["info"], meta["database"])
+
+    def _render_schemas(self, db_node: str, meta, schemas):
+        info, database = meta["info"], meta["database"]
         for sch in schemas:
             sch_id = self.tree.insert(db_node, "end", text=sch, open=False)
             self._node_meta[sch_id] = {"kind": "schema", "info": info, "database": database, "schema": sch}
             self._add_dummy(sch_id)
 
-    def _load_schema_folders(self, schema_node: str, info, database: str, schema: str):
-        folders = [
-            ("Tables", "folder_tables"),
-            ("Views", "folder_views"),
-            ("Indexes", "folder_indexes"),
-            ("Functions", "folder_functions"),
-            ("Sequences", "folder_sequences"),
-            ("Types", "folder_types"),
-        ]
-        for label, fkind in folders:
-            fid = self.tree.insert(schema_node, "end", text=label, open=False)
-            self._node_meta[fid] = {"kind": fkind, "info": info, "database": database, "schema": schema}
-            self._add_dummy(fid)
+    def _fetch_folder_page(self, meta, after: Optional[tuple] = None):
+        kind = _KIND_OF_FOLDER[meta["kind"]]
+        first = after is None
+        after = FOLDER_START_KEYS[kind] if first else after
+        pattern = like_pattern(meta.get("filter", ""))
+        with self._open_meta_conn(meta["info"], meta["database"]) as conn:
+            rows = list_folder_page(conn, meta["schema"], kind, after, pattern, FOLDER_PAGE_SIZE)
+            if kind == "table" and first and not meta.get("filter") and len(rows) < FOLDER_PAGE_SIZE:
+                # Schema chico: con el snapshot, los detalles de cada tabla salen de memoria
+                load_schema_snapshot(conn, meta["schema"])
+            return rows
+
+    def _render_folder_page(self, folder: str, meta, rows):
+        meta["idx_tables"] = {}
+        self._insert_page(folder, meta, rows, lambda: self._loaded(folder))
+
+    def _insert_page(self, folder: str, meta, rows: list, done: Callable[[], None]):
+        """
+        Inserta rows en tandas de INSERT_CHUNK con after(), para no congelar la UI.
+        Si la página vino llena, agrega al final un nodo para cargar la siguiente.
+        """
+        token = object()
+        self._inserting[folder] = token
+        kind = _KIND_OF_FOLDER[meta["kind"]]
+        pos = 0
+
+        def tick():
+            nonlocal pos
+            if self._inserting.get(folder) is not token or not self.tree.exists(folder):
+                return
+            for row in rows[pos:pos + INSERT_CHUNK]:
+                self._insert_folder_row(folder, meta, kind, row)
+            pos += INSERT_CHUNK
+            if pos < len(rows):
+                self.after(1, tick)
+                return
+            del self._inserting[folder]
+            if len(rows) >= FOLDER_PAGE_SIZE:
+                more = self.tree.insert(folder, "end", text=f"Cargar siguientes {FOLDER_PAGE_SIZE}...")
+                self._node_meta[more] = {"kind": MORE, "folder": folder, "after": tuple(rows[-1])}
+            done()
+
+        tick()
+
+    def _insert_folder_row(self, folder: str, meta, kind: str, row: tuple):
+        schema = meta["schema"]
+        if kind == "index":
+            tbl, idx = row
+            # Los índices de una tabla pueden venir partidos entre dos páginas
+            tbl_id = meta["idx_tables"].get(tbl)
+            if tbl_id is None or not self.tree.exists(tbl_id):
+                tbl_id = self.tree.insert(folder, "end", text=tbl, open=False)
+                self._node_meta[tbl_id] = {**self._folder_base(meta), "kind": "idx_table", "table": tbl}
+                meta["idx_tables"][tbl] = tbl_id
+            iid = self.tree.insert(tbl_id, "end", text=idx, open=False)
+            self._node_to_obj[iid] = DbObject(obj_type="index", schema=schema, name=idx)
+            self._node_meta[iid] = {**self._folder_base(meta), "kind": "index", "table": tbl, "index": idx}
+            return
 
-    def _open_meta_conn(self, info, database: str):
-        return self.conn_service.open_temp_conn(info, database)
+        name = row[0]
+        nid = self.tree.insert(folder, "end", text=name, open=False)
+        self._node_to_obj[nid] = DbObject(obj_type=kind, schema=schema, name=name)
+        self._node_meta[nid] = {**self._folder_base(meta), "kind": kind, "name": name}
+
+    def _load_more(self, more_node: str):
+        more = self._node_meta.get(more_node)
+        folder = more["folder"] if more else None
+        if folder is None or folder in self._loading or folder in self._inserting:
+            return
+        meta = self._node_meta[folder]
+        self.tree.item(more_node, text="Cargando...")
+
+        token = object()
+        self._loading[folder] = token
+        gen = self._generation
+
+        def on_done(rows):
+            if not self._is_current(folder, token, gen):
+                return
+            del self._loading[folder]
+            if self.tree.exists(more_node):
+                self.tree.delete(more_node)
+            self._node_meta.pop(more_node, None)
+            self._insert_page(folder, meta, rows, lambda: None)
+
+        def on_error(e):
+            if self._is_current(folder, token, gen):
+                del self._loading[folder]
+                if self.tree.exists(more_node):
+                    self.tree.item(more_node, text=f"Error: {str(e).strip() or type(e).__name__} (click para reintentar)")
+
+        run_in_background(
+            self, lambda: self._fetch_folder_page(meta, more["after"]), on_done, on_error, executor=self._executor
+        )
+
+    def set_folder_filter(self, folder: str, text: str, on_loaded: Optional[Callable[[], None]] = None):
+        """
+        Recarga la carpeta desde la primera página, filtrando por text en el servidor.
+        """
+        meta = self._node_meta.get(folder)
+        if meta is None or meta["kind"] not in _KIND_OF_FOLDER:
+            return
+        text = text.strip()
+        meta["filter"] = text
+        label = _FOLDER_LABELS[meta["kind"]]
+        self.tree.item(folder, text=f"{label} (filtro: {text})" if text else label)
+
+        # Descarta cargas/inserciones en curso y vuelve al estado "sin cargar"
+        self._loading.pop(folder, None)
+        self._inserting.pop(folder, None)
+        self._clear_children(folder)
+        self._add_dummy(folder)
+        if on_loaded is not None or self.tree.item(folder, "open"):
+            self._expand_node(folder, on_loaded)
+
+    def _folder_of(self, node_id: str) -> Optional[str]:
+        while node_id:
+            if self._node_meta.get(node_id, {}).get("kind") in _KIND_OF_FOLDER:
+                return node_id
+            node_id = self.tree.parent(node_id)
+        return None
+
+    def _bind_filter_to(self, node_id: str):
+        folder = self._folder_of(node_id)
+        if folder == self._filter_folder:
+            return
+        self._filter_folder = folder
+        if folder is None:
+            self.var_filter.set("")
+            self.ent_filter.configure(state="disabled")
+            self.lbl_filter.configure(text="Filtrar carpeta:")
+            return
+        meta = self._node_meta[folder]
+        self.var_filter.set(meta.get("filter", ""))
+        self.ent_filter.configure(state="normal")
+        self.lbl_filter.configure(text=f"Filtrar {_FOLDER_LABELS[meta['kind']]} ({meta['schema']}):")
+
+    def _handle_filter_key(self, _evt):
+        if self._filter_after is not None:
+            self.after_cancel(self._filter_after)
+
+        def apply():
+            self._filter_after = None
+            folder = self._filter_folder
+            if folder is not None and self.tree.exists(folder):
+                if self.var_filter.get().strip() != self._node_meta[folder].get("filter", ""):
+                    self.tree.item(folder, open=True)
+                    self.set_folder_filter(folder, self.var_filter.get())
 
-    def _load_tables(self, folder_node: str, info, database: str, schema: str):
-        conn = self._open_meta_conn(info, database)
-        try:
-            tables = list_tables_by_schema(conn, schema)
-        finally:
-            conn.close()
-
-        for t in tables:
-            tid = self.tree.insert(folder_node, "end", text=t.name, open=False)
-            self._node_to_obj[tid] = t
-            self._node_meta[tid] = {"kind": "table", "info": info, "database": database, "schema": schema, "name": t.name}
-
-    def _load_views(self, folder_node: str, info, database: str, schema: str):
-        conn = self._open_meta_conn(info, database)
-        try:
-            views = list_views_by_schema(conn, schema)
-        finally:
-            conn.close()
-
-        for v in views:
-            vid = self.tree.insert(folder_node, "end", text=v.name, open=False)
-            self._node_to_obj[vid] = v
-            self._node_meta[vid] = {"kind": "view", "info": info, "database": database, "schema": schema, "name": v.name}
-
-    def _load_indexes(self, folder_node: str, info, database: str, schema: str):
-        conn = self._open_meta_conn(info, database)
-        try:
-            rows = list_indexes_by_schema(conn, schema)
-        finally:
-            conn.close()
-
-        by_table = {}
-        for sch, tbl, idx in rows:
-            by_table.setdefault(tbl, []).append(idx)
-
-        for tbl, idxs in by_table.items():
-            tbl_id = self.tree.insert(folder_node, "end", text=tbl, open=False)
-            self._node_meta[tbl_id] = {"kind": "idx_table", "info": info, "database": database, "schema": schema, "table": tbl}
-            for idx in idxs:
-                iid = self.tree.insert(tbl_id, "end", text=idx, open=False)
-
-                dbo = DbObject(obj_type="index", schema=schema, name=idx)
-                self._node_to_obj[iid] = dbo
-                self._node_meta[iid] = {
-                    "kind": "index",
-                    "info": info,
-                    "database": database,
-                    "schema": schema,
-                    "table": tbl,
-                    "index": idx,
-                }
-    def _load_functions(self, folder_node: str, info, database: str, schema: str):
-        conn = self._open_meta_conn(info, database)
-        try:
-            rows = list_functions_by_schema(conn, schema)
-        finally:
-            conn.close()
-
-        for sch, fname in rows:
-            fid = self.tree.insert(folder_node, "end", text=fname, open=False)
-            dbo = DbObject(obj_type="function", schema=schema, name=fname)
-            self._node_to_obj[fid] = dbo
-            self._node_meta[fid] = {"kind": "function", "info": info, "database": database, "schema": schema, "name": fname}
-
-    def _load_sequences(self, folder_node: str, info, database: str, schema: str):
-        conn = self._open_meta_conn(info, database)
-        try:
-            rows = list_sequences_by_schema(conn, schema)
-        finally:
-            conn.close()
-
-        for sch, sname in rows:
-            sid = self.tree.insert(folder_node, "end", text=sname, open=False)
-            dbo = DbObject(obj_type="sequence", schema=schema, name=sname)
-            self._node_to_obj[sid] = dbo
-            self._node_meta[sid] = {"kind": "sequence", "info": info, "database": database, "schema": schema, "name": sname}
-
-    def _load_types(self, folder_node: str, info, database: str, schema: str):
-        conn = self._open_meta_conn(info, database)
-        try:
-            rows = list_types_by_schema(conn, schema)
-        finally:
-            conn.close()
-
-        for sch, tname in rows:
-            tid = self.tree.insert(folder_node, "end", text=tname, open=False)
-            dbo = DbObject(obj_type="type", schema=schema, name=tname)
-            self._node_to_obj[tid] = dbo
-            self._node_meta[tid] = {"kind": "type", "info": info, "database": database, "schema": schema, "name": tname}
+        self._filter_after = self.after(FILTER_DEBOUNCE_MS, apply)
+
+    @staticmethod
+    def _folder_base(meta) -> dict[str, Any]:
+        return {"info": meta["info"], "database": meta["database"], "schema": meta["schema"]}
 
     def _handle_select(self, _evt):
         sel = self.tree.selection()
@@ -232,6 +463,11 @@ class ObjectTree(ttk.Frame):
         item_id = sel[0]
         obj = self._node_to_obj.get(item_id)
         meta = self._node_meta.get(item_id, {})
+        self._bind_filter_to(item_id)
+
+        if meta.get("kind") == MORE:
+            self._load_more(item_id)
+            return
 
         if obj is None:
             return
@@ -241,7 +477,8 @@ class ObjectTree(ttk.Frame):
             database = meta.get("database")
             if info and database:
                 cur = self.conn_service.get_current_info()
-                if cur is None or cur.database != database:
+                # Sesiones por (conexión, base): dos clusters pueden tener una base con el mismo nombre
+                if cur is None or (cur.id, cur.database) != (info.id, database):
                     from services.connection_service import ConnectionInfo
                     self.conn_service.connect(ConnectionInfo(
                         id=info.id, name=info.name, host=info.host, port=info.port,
@@ -250,6 +487,37 @@ class ObjectTree(ttk.Frame):
         if self.on_select:
             self.on_select(obj, meta)
 
+    def _handle_context_menu(self, event):
+        item_id = self.tree.identify_row(event.y)
+        if not item_id:
+            return
+        kind = self._node_meta.get(item_id, {}).get("kind")
+        if kind in ("table", "view"):
+            menu = self.menu
+        elif kind in ("database", "schema"):
+            menu = self.ddl_menu
+        else:
+            return
+        self.tree.selection_set(item_id)
+        self.tree.focus(item_id)
+        menu.tk_popup(event.x_root, event.y_root)
+
+    def _export_selected(self):
+        sel = self.tree.selection()
+        if not sel or self.on_export is None:
+            return
+        meta = self._node_meta.get(sel[0], {})
+        if meta.get("kind") in ("table", "view"):
+            self.on_export(meta)
+
+    def _export_ddl_selected(self):
+        sel = self.tree.selection()
+        if not sel or self.on_export_ddl is None:
+            return
+        meta = self._node_meta.get(sel[0], {})
+        if meta.get("kind") in ("database", "schema"):
+            self.on_export_ddl(meta)
+
     def auto_expand_active(self):
         infos, active = self.conn_service.load_all()
         if not active:
@@ -263,3 +531,167 @@ class ObjectTree(ttk.Frame):
                 self.tree.selection_set(item)
                 self._handle_open(None)
                 break
+
+    # --- Búsqueda ---
+
+    def rebuild_search_index(self):
+        """
+        Reconstruye el índice en segundo plano; las búsquedas siguen usando lo ya indexado.
+        """
+        self._index_gen += 1
+        gen = self._index_gen
+        self._index_status = "Indexando objetos..."
+
+        def progress(conn_name, database, n):
+            self._index_status = f"Indexando... {conn_name}/{database} ({n} objetos)"
+
+        def on_done(result):
+            done, errors = result
+            if gen != self._index_gen:
+                return
+            self._index_task = None
+            text = f"{len(self.search_index):,} objetos en {self.search_index.databases()} bases"
+            if errors:
+                text += f" · {len(errors)} sin indexar"
+            self._index_status = text
+
+        def on_error(e):
+            if gen == self._index_gen:
+                self._index_task = None
+                self._index_status = f"Índice incompleto: {e}"
+
+        # Una reconstrucción anterior se corta en la siguiente base
+        self._index_task = run_in_background(
+            self,
+            lambda: build_index(self.conn_service, self.search_index, lambda: gen != self._index_gen, progress),
+            on_done,
+            on_error,
+        )
+        self._poll_index_status()
+
+    def reindex_database(self, info: ConnectionInfo, database: str):
+        """
+        Vuelve a indexar una sola base (por ejemplo, después de crear un objeto en ella).
+        """
+        def work():
+            with self.conn_service.open_temp_conn(info, database) as conn:
+                rows = list_all_objects(conn)
+                conn.rollback()
+            return self.search_index.replace_database(info.id, database, rows)
+
+        def on_done(n):
+            if self._index_task is None:
+                self._index_status = f"{len(self.search_index):,} objetos en {self.search_index.databases()} bases"
+                self.lbl_index.configure(text=self._index_status)
+
+        def on_error(e):
+            if self._index_task is None:
+                self._index_status = f"No se pudo reindexar {database}: {e}"
+                self.lbl_index.configure(text=self._index_status)
+
+        run_in_background(self, work, on_done, on_error)
+
+    def _poll_index_status(self):
+        self.lbl_index.configure(text=self._index_status)
+        if self._index_task is not None:
+            self.after(250, self._poll_index_status)
+
+    def _handle_search_key(self, evt):
+        if evt.keysym in ("Return", "Down", "Escape"):
+            return
+        query = self.var_search.get()
+        self._results = self.search_index.search(query) if query.strip() else []
+
+        self.lst_results.delete(0, "end")
+        for e in self._results:
+            self.lst_results.insert("end", f"{e.name}  ·  {e.kind}  ·  {e.path}")
+        if self._results:
+            if not self.lst_results.winfo_ismapped():
+                self.lst_results.pack(fill="x", pady=(0, 4), before=self.tree)
+        else:
+            self.lst_results.pack_forget()
+
+    def _focus_results(self, _evt=None):
+        if self._results:
+            self.lst_results.focus_set()
+            self.lst_results.selection_clear(0, "end")
+            self.lst_results.selection_set(0)
+            self.lst_results.activate(0)
+
+    def _clear_search(self):
+        self.var_search.set("")
+        self._results = []
+        self.lst_results.delete(0, "end")
+        self.lst_results.pack_forget()
+        self.tree.focus_set()
+
+    def _reveal_selected_result(self):
+        sel = self.lst_results.curselection()
+        self._reveal_result(sel[0] if sel else 0)
+
+    def _reveal_result(self, pos: int):
+        if pos >= len(self._results):
+            return
+        entry = self._results[pos]
+        self._clear_search()
+        self.reveal(entry)
+
+    def _find_child(self, parent: str, **match) -> Optional[str]:
+        for ch in self.tree.get_children(parent):
+            meta = self._node_meta.get(ch, {})
+            if all(meta.get(k) == v for k, v in match.items()):
+                return ch
+        return None
+
+    def reveal(self, entry: SearchEntry, on_done: Optional[Callable[[bool], None]] = None) -> None:
+        """
+        Expande conexión → base → schema → carpeta y selecciona el objeto.
+        Cada nivel se carga en segundo plano; on_done(False) si el objeto ya no está
+        en el árbol (p.ej. se borró después de indexar).
+        """
+        node = None
+        for ch in self.tree.get_children(""):
+            info = self._node_meta.get(ch, {}).get("info")
+            if info is not None and info.id == entry.conn_id:
+                node = ch
+                break
+        steps = [
+            {"kind": "database", "database": entry.database},
+            {"kind": "schema", "schema": entry.schema},
+            {"kind": _FOLDER_OF.get(entry.kind)},
+        ]
+        if entry.kind == "index":
+            steps += [{"kind": "idx_table", "table": entry.parent}, {"kind": "index", "index": entry.name}]
+        else:
+            steps.append({"kind": entry.kind, "name": entry.name})
+
+        gen = self._generation
+
+        def finish(ok: bool):
+            if on_done:
+                on_done(ok)
+
+        def step(node: Optional[str], i: int):
+            if node is None or gen != self._generation or not self.tree.exists(node):
+                finish(False)
+                return
+            if i == len(steps):
+                self.tree.see(node)
+                self.tree.focus(node)
+                self.tree.selection_set(node)
+                finish(True)
+                return
+            self.tree.item(node, open=True)
+            self._expand_node(node, lambda: find(node, i))
+
+        def find(parent: str, i: int):
+            child = self._find_child(parent, **steps[i])
+            meta = self._node_meta.get(parent, {})
+            if child is None and meta.get("kind") in _KIND_OF_FOLDER and not meta.get("filter"):
+                # Puede estar en una página que todavía no se cargó: filtrar por su nombre
+                name = entry.parent if entry.kind == "index" else entry.name
+                self.set_folder_filter(parent, name, lambda: step(self._find_child(parent, **steps[i]), i + 1))
+                return
+            step(child, i + 1)
+
+        step(node, 0)
@@ -0,0 +1,116 @@
+import tkinter as tk
+from tkinter import ttk
+from typing import Optional
+
+from models.explain_plan import ExplainPlan, PlanNode
+from ui.formatting import fmt_bytes, fmt_count
+
+
+class PlanView(ttk.Frame):
+    """
+    Árbol de operadores de EXPLAIN [ANALYZE]:
+    - los nodos más caros se resaltan ("hot")
+    - los FULL SCAN se marcan, indicando si la tabla existe en el catálogo
+    Al seleccionar un nodo se muestran todos sus atributos.
+    """
+
+    def __init__(self, parent):
+        super().__init__(parent)
+
+        self.lbl_header = ttk.Label(self, text="", style="Muted.TLabel", wraplength=900, justify="left")
+        self.lbl_header.pack(anchor="w", pady=(4, 6))
+
+        cols = ("rows", "est", "time", "memory", "spill", "detail")
+        self.tree = ttk.Treeview(self, columns=cols, show="tree headings", height=12, selectmode="browse")
+        self.tree.heading("#0", text="Operador")
+        self.tree.column("#0", width=260, anchor="w", stretch=True)
+        for col, head, w in zip(
+            cols,
+            ("Filas", "Filas est.", "Tiempo (ms)", "Memoria", "Disco", "Detalle"),
+            (90, 90, 100, 90, 90, 320),
+        ):
+            self.tree.heading(col, text=head)
+            self.tree.column(col, width=w, anchor="w", stretch=True)
+        self.tree.pack(fill="both", expand=True)
+
+        self.tree.tag_configure("hot", background="#5b1d1d")
+        self.tree.tag_configure("fullscan", background="#4a3b0b")
+        self.tree.tag_configure("hot_fullscan", background="#7a2e0e")
+        self.tree.bind("<<TreeviewSelect>>", self._on_select)
+
+        self.txt = tk.Text(self, height=8, wrap="word")
+        self.txt.pack(fill="x", pady=(6, 0))
+        self.txt.configure(bg="#0b1220", fg="#e5e7eb", insertbackground="#e5e7eb", relief="flat")
+
+        self._nodes: dict[str, PlanNode] = {}
+        self.plan: Optional[ExplainPlan] = None
+
+    def set_plan(self, plan: ExplainPlan) -> None:
+        self.plan = plan
+        self._nodes = {}
+        self.tree.delete(*self.tree.get_children())
+        self.lbl_header.configure(text=" · ".join(f"{k}: {v}" for k, v in plan.header))
+
+        for root in plan.roots:
+            self._insert("", root)
+
+        self._set_text(self._summary() if plan.roots else plan.text)
+
+    def _insert(self, parent: str, node: PlanNode) -> None:
+        detail = []
+        if node.table:
+            detail.append(f"{node.table}@{node.index}" if node.index else node.table)
+        if node.full_scan:
+            detail.append("FULL SCAN")
+
+        if node.hot and node.full_scan:
+            tags = ("hot_fullscan",)
+        elif node.hot:
+            tags = ("hot",)
+        elif node.full_scan:
+            tags = ("fullscan",)
+        else:
+            tags = ()
+
+        iid = self.tree.insert(
+            parent, "end", text=node.name, open=True, tags=tags,
+            values=(
+                fmt_count(node.rows),
+                fmt_count(node.estimated_rows),
+                "" if node.time is None else f"{node.time * 1000:.1f}",
+                fmt_bytes(node.memory),
+                fmt_bytes(node.spill),
+                " · ".join(detail),
+            ),
+        )
+        self._nodes[iid] = node
+        for ch in node.children:
+            self._insert(iid, ch)
+
+    def _summary(self) -> str:
+        lines = []
+        hot = [n for n in self.plan.nodes() if n.hot]
+        if hot:
+            lines.append("Operadores más costosos: " + ", ".join(n.name for n in hot))
+        for n in self.plan.full_scans():
+            where = n.known_table or f"{n.table} (no encontrada en el catálogo)"
+            rows = f", {n.estimated_rows:,} filas estimadas" if n.estimated_rows is not None else ""
+            lines.append(f"FULL SCAN sobre {where}{rows}.")
+        for n in self.plan.nodes():
+            if n.spill:
+                lines.append(f"{n.name} usó {fmt_bytes(n.spill)} de disco temporal.")
+        return "\n".join(lines) or "Sin observaciones."
+
+    def _on_select(self, _evt):
+        sel = self.tree.selection()
+        node = self._nodes.get(sel[0]) if sel else None
+        if node is None:
+            return
+        text = "\n".join(f"{k}: {v}" for k, v in node.attrs)
+        if node.full_scan and node.known_table:
+            text += f"\n\nFULL SCAN sobre {node.known_table}."
+        self._set_text(text)
+
+    def _set_text(self, text: str) -> None:
+        self.txt.delete("1.0", "end")
+        self.txt.insert("1.0", text)
@@ -1,15 +1,30 @@
+import threading
+import time
 import tkinter as tk
 from tkinter import ttk, messagebox
-from typing import Callable, Optional, Any, Dict
+from typing import Callable, ContextManager, Optional, Any, Dict
 
-from db.execute import run_sql
+from db.execute import run_sql, cancel_query, is_select
+from db.script_runner import split_statements
+from db.instrumentation import timed
+from db.explain import run_explain, flag_known_tables
+from ui.background import run_in_background
+from ui.widgets.virtual_grid import VirtualGrid, ListRowSource
+from ui.widgets.plan_view import PlanView
 
 
 class SqlRunnerView(ttk.Frame):
-    def __init__(self, parent, get_conn: Callable[[], Any], on_back: Optional[Callable[[], None]] = None):
+    def __init__(
+        self,
+        parent,
+        get_conn: Callable[[], Any],
+        on_back: Optional[Callable[[], None]] = None,
+        open_conn: Optional[Callable[[], ContextManager[Any]]] = None,
+    ):
         super().__init__(parent)
         self.get_conn = get_conn
         self.on_back = on_back
+        self.open_conn = open_conn
 
         top = ttk.Frame(self, padding=8)
         top.pack(fill="x")
@@ -19,7 +34,15 @@ class SqlRunnerView(ttk.Frame):
 
         btns = ttk.Frame(top)
         btns.pack(side="right")
-        ttk.Button(btns, text="Ejecutar", command=self.execute).pack(side="left", padx=(0, 8))
+        self.btn_run = ttk.Button(btns, text="Ejecutar", command=self.execute)
+        self.btn_run.pack(side="left", padx=(0, 8))
+        self.btn_explain = ttk.Button(btns, text="Explain", command=lambda: self.explain(analyze=False))
+        self.btn_explain.pack(side="left", padx=(0, 8))
+        self.btn_analyze = ttk.Button(btns, text="Explain Analyze", command=lambda: self.explain(analyze=True))
+        self.btn_analyze.pack(side="left", padx=(0, 8))
+        self.btn_cancel = ttk.Button(btns, text="Cancelar", command=self.cancel, state="disabled")
+        self.btn_cancel.pack(side="left", padx=(0, 8))
+        ttk.Button(btns, text="Exportar", command=self.export).pack(side="left", padx=(0, 8))
         ttk.Button(btns, text="Limpiar", command=self.clear).pack(side="left")
 
         editor_box = ttk.Frame(self, padding=(8, 0, 8, 8))
@@ -31,39 +54,161 @@ class SqlRunnerView(ttk.Frame):
         # dark para el Text
         self.txt_sql.configure(bg="#0b1220", fg="#e5e7eb", insertbackground="#e5e7eb", relief="flat")
 
+        opts = ttk.Frame(editor_box)
+        opts.pack(fill="x", pady=(6, 0))
+        self.var_single_tx = tk.BooleanVar(value=False)
+        self.var_continue = tk.BooleanVar(value=False)
+        ttk.Checkbutton(opts, text="Transacción única", variable=self.var_single_tx).pack(side="left", padx=(0, 12))
+        ttk.Checkbutton(opts, text="Continuar si hay errores", variable=self.var_continue).pack(side="left", padx=(0, 12))
+        self.var_debug = tk.BooleanVar(value=False)
+        ttk.Checkbutton(opts, text="Explain Analyze con bundle DEBUG", variable=self.var_debug).pack(side="left", padx=(0, 12))
+        self.var_cache = tk.BooleanVar(value=False)
+        ttk.Checkbutton(opts, text="Caché de resultados", variable=self.var_cache).pack(side="left")
+
         out_box = ttk.Frame(self, padding=8)
         out_box.pack(fill="both", expand=True)
 
-        ttk.Label(out_box, text="Resultados", style="Section.TLabel").pack(anchor="w")
+        out_hdr = ttk.Frame(out_box)
+        out_hdr.pack(fill="x")
+        ttk.Label(out_hdr, text="Resultados", style="Section.TLabel").pack(side="left")
+        self.btn_more = ttk.Button(out_hdr, text="Más filas", command=self.load_more, state="disabled")
+        self.btn_more.pack(side="right")
+
         self.lbl_msg = ttk.Label(out_box, text="", style="Muted.TLabel")
         self.lbl_msg.pack(anchor="w", pady=(2, 6))
 
-        self.grid = ttk.Treeview(out_box, show="headings")
-        self.grid.pack(fill="both", expand=True)
+        # Pestaña principal: resultado (o resumen del script); una pestaña extra por cada result set
+        self.nb = ttk.Notebook(out_box)
+        self.nb.pack(fill="both", expand=True)
+
+        # Al acercarse al final del grid se pide la siguiente página del cursor
+        self.grid = VirtualGrid(self.nb, on_need_more=self.load_more)
+        self.nb.add(self.grid, text="Resultado")
+        self._extra_tabs: list = []
+
+        self._stream = None
+        self._cancel_requested = False
+        self._task = None
+        self._task_conn = None
+        self._started_at = 0.0
 
     def _back(self):
         if self.on_back:
             self.on_back()
 
     def clear(self):
+        if self._task is not None:
+            return
+        self._close_stream()
         self.txt_sql.delete("1.0", "end")
         self.lbl_msg.configure(text="")
-        self.grid.delete(*self.grid.get_children())
-        self.grid["columns"] = ()
+        self._clear_extra_tabs()
+        self.grid.clear()
+
+    def _clear_extra_tabs(self):
+        for tab in self._extra_tabs:
+            self.nb.forget(tab)
+            tab.destroy()
+        self._extra_tabs = []
+        self.nb.tab(self.grid, text="Resultado")
+        self.nb.select(self.grid)
+
+    def _show_script(self, script):
+        summary = []
+        for st in script.statements:
+            first_line = " ".join(st.sql.split())[:120]
+            if st.error:
+                status = f"ERROR: {st.error.splitlines()[0]}"
+            elif st.truncated:
+                status = f"OK (primeras {len(st.rows)} filas)"
+            else:
+                status = "OK"
+            rows = st.rowcount if st.rowcount >= 0 else len(st.rows)
+            summary.append((st.index, first_line, f"{st.elapsed * 1000:.1f}", rows, status))
+
+            if st.returns_rows:
+                tab = VirtualGrid(self.nb)
+                tab.set_rows(st.columns, st.rows)
+                self.nb.add(tab, text=f"#{st.index}")
+                self._extra_tabs.append(tab)
+
+        self.grid.set_rows(("#", "Sentencia", "Tiempo (ms)", "Filas", "Estado"), summary)
+        self.nb.tab(self.grid, text="Resumen")
+
+    def _close_stream(self):
+        if self._stream is not None:
+            try:
+                self._stream.close()
+            except Exception:
+                pass
+        self._stream = None
+        self.btn_more.configure(state="disabled")
+
+    def _update_msg(self):
+        total = len(self.grid.source)
+        if self._stream is not None:
+            self.lbl_msg.configure(text=f"{total} fila(s) cargadas; hay más.")
+        else:
+            self.lbl_msg.configure(text=f"{total} fila(s).")
+
+    def _load_grid(self, columns, rows, stream=None):
+        self._stream = stream
+        self.grid.set_source(ListRowSource(columns, list(rows), has_more=stream is not None))
+        self.btn_more.configure(state="normal" if stream is not None else "disabled")
+        self._update_msg()
 
-    def _load_grid(self, columns, rows):
-        self.grid.delete(*self.grid.get_children())
-        self.grid["columns"] = columns
-        for c in columns:
-            self.grid.heading(c, text=c)
-            self.grid.column(c, width=160, anchor="w", stretch=True)
+    def _set_running(self, conn):
+        self._task_conn = conn
+        self._started_at = time.monotonic()
+        for b in (self.btn_run, self.btn_explain, self.btn_analyze, self.btn_more):
+            b.configure(state="disabled")
+        self.btn_cancel.configure(state="normal")
+        self._tick()
 
-        for r in rows[:500]:
-            self.grid.insert("", "end", values=r)
+    def _set_idle(self):
+        self._task = None
+        self._task_conn = None
+        for b in (self.btn_run, self.btn_explain, self.btn_analyze):
+            b.configure(state="normal")
+        self.btn_cancel.configure(state="disabled")
+        self.btn_more.configure(state="normal" if self._stream is not None else "disabled")
+        if self._stream is not None:
+            self.grid.rows_appended()
 
-        self.lbl_msg.configure(text=f"{len(rows)} fila(s)." if len(rows) <= 500 else f"Mostrando 500 de {len(rows)} filas.")
+    def _tick(self):
+        if self._task is None:
+            return
+        elapsed = time.monotonic() - self._started_at
+        self.lbl_msg.configure(text=f"Ejecutando... {elapsed:.1f} s")
+        self.after(100, self._tick)
+
+    def _show_error(self, e: BaseException):
+        self._set_idle()
+        self.lbl_msg.configure(text=f"ERROR: {e}")
+
+    def load_more(self):
+        if self._stream is None or self._task is not None:
+            return
+        stream = self._stream
+
+        def on_done(rows):
+            if stream.exhausted:
+                self._stream = None
+            self.grid.source.append(rows, has_more=self._stream is not None)
+            self._set_idle()
+            self.grid.rows_appended()
+            self._update_msg()
+
+        def on_error(e):
+            self._stream = None
+            self._show_error(e)
+
+        self._task = run_in_background(self, stream.fetch_page, on_done, on_error)
+        self._set_running(stream.conn)
 
     def execute(self):
+        if self._task is not None:
+            return
         conn = self.get_conn()
         if conn is None:
             messagebox.showwarning("Sin conexión", "Conéctate primero.")
@@ -73,15 +218,145 @@ class SqlRunnerView(ttk.Frame):
         if not sql:
             return
 
-        try:
-            result: Dict[str, Any] = run_sql(conn, sql)
-            if result["type"] == "query":
-                self._load_grid(result.get("columns", []), result.get("rows", []))
-            else:
-                self.grid.delete(*self.grid.get_children())
-                self.grid["columns"] = ()
+        old_stream, self._stream = self._stream, None
+        self._clear_extra_tabs()
+        self._cancel_requested = False
+        single_tx = self.var_single_tx.get()
+        stop_on_error = not self.var_continue.get()
+        use_cache = self.var_cache.get()
+
+        def job():
+            if old_stream is not None:
+                old_stream.close()
+            return run_sql(
+                conn, sql, stream=True,
+                single_transaction=single_tx,
+                stop_on_error=stop_on_error,
+                should_stop=lambda: self._cancel_requested,
+                cache=use_cache,
+            )
+
+        def on_done(result: Dict[str, Any]):
+            self._set_idle()
+            elapsed = time.monotonic() - self._started_at
+            if result["type"] == "script":
+                with timed("ui:sql_script"):
+                    self._show_script(result["script"])
                 self.lbl_msg.configure(text=result.get("message", "OK"))
-        except Exception as e:
-            self.grid.delete(*self.grid.get_children())
-            self.grid["columns"] = ()
-            self.lbl_msg.configure(text=f"ERROR: {e}")
+            elif result["type"] == "query":
+                with timed("ui:sql_grid"):
+                    self._load_grid(result.get("columns", []), result.get("rows", []), result.get("stream"))
+                if result.get("cached"):
+                    self.lbl_msg.configure(
+                        text=f"{self.lbl_msg.cget('text')} Servido desde caché (antigüedad {result['cache_age']:.0f} s)."
+                    )
+                else:
+                    self.lbl_msg.configure(text=f"{self.lbl_msg.cget('text')} ({elapsed:.2f} s)")
+            else:
+                self.grid.clear()
+                self.lbl_msg.configure(text=f"{result.get('message', 'OK')} ({elapsed:.2f} s)")
+
+        def on_error(e):
+            self.grid.clear()
+            self._show_error(e)
+
+        self._task = run_in_background(self, job, on_done, on_error)
+        self._set_running(conn)
+
+    @property
+    def busy(self) -> bool:
+        return self._task is not None
+
+    def load_text(self, sql: str, message: str = ""):
+        """
+        Carga sql en el editor sin ejecutarlo.
+        """
+        self.txt_sql.delete("1.0", "end")
+        self.txt_sql.insert("1.0", sql)
+        self.lbl_msg.configure(text=message)
+
+    def open_statement(self, sql: str):
+        """
+        Carga sql en el editor y muestra su plan (EXPLAIN sin ANALYZE: no ejecuta la sentencia).
+        """
+        self.load_text(sql)
+        self.explain(analyze=False)
+
+    def explain(self, analyze: bool):
+        if self._task is not None:
+            return
+        conn = self.get_conn()
+        if conn is None:
+            messagebox.showwarning("Sin conexión", "Conéctate primero.")
+            return
+
+        statements = split_statements(self.txt_sql.get("1.0", "end"))
+        if len(statements) != 1:
+            messagebox.showwarning("Explain", "Para ver el plan, el editor debe tener una sola sentencia.")
+            return
+        stmt = statements[0]
+        mode = ("debug" if self.var_debug.get() else "analyze") if analyze else "plain"
+
+        old_stream, self._stream = self._stream, None
+        self._cancel_requested = False
+
+        def job():
+            if old_stream is not None:
+                old_stream.close()
+            plan = run_explain(conn, stmt, mode)
+            # Los FULL SCAN se cruzan con las tablas del catálogo (en otra conexión si hay pool)
+            try:
+                if self.open_conn is not None:
+                    with self.open_conn() as meta_conn:
+                        flag_known_tables(meta_conn, plan)
+                else:
+                    flag_known_tables(conn, plan)
+            except Exception:
+                pass
+            return plan
+
+        def on_done(plan):
+            self._set_idle()
+            elapsed = time.monotonic() - self._started_at
+            self._clear_extra_tabs()
+            self.grid.clear()
+            with timed("ui:plan"):
+                view = PlanView(self.nb)
+                view.set_plan(plan)
+            self.nb.add(view, text="Plan")
+            self._extra_tabs.append(view)
+            self.nb.select(view)
+            full = len(plan.full_scans())
+            self.lbl_msg.configure(
+                text=f"Plan: {len(plan.nodes())} operador(es); {full} full scan(s). ({elapsed:.2f} s)"
+            )
+
+        def on_error(e):
+            self._show_error(e)
+
+        self._task = run_in_background(self, job, on_done, on_error)
+        self._set_running(conn)
+
+    def cancel(self):
+        conn = self._task_conn
+        if self._task is None or conn is None:
+            return
+        self.btn_cancel.configure(state="disabled")
+        self._cancel_requested = True
+        # cancel() envía la petición de cancelación por otro socket; no bloquea Tk
+        threading.Thread(target=lambda: cancel_query(conn), daemon=True).start()
+
+    def export(self):
+        from ui.dialogs.export_dialog import ExportDialog
+        if self.open_conn is None or self.get_conn() is None:
+            messagebox.showwarning("Sin conexión", "Conéctate primero.")
+            return
+
+        statements = split_statements(self.txt_sql.get("1.0", "end"))
+        if len(statements) != 1 or not is_select(statements[0]):
+            messagebox.showwarning("Exportar", "Para exportar, el editor debe tener una sola consulta SELECT.")
+            return
+
+        # La exportación usa su propia conexión; el editor queda libre
+        dlg = ExportDialog(self.winfo_toplevel(), self.open_conn, statements[0], title="Consulta SQL", default_name="resultado")
+        self.wait_window(dlg)
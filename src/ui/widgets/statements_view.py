@@ -0,0 +1,148 @@
+import tkinter as tk
+from tkinter import ttk
+from typing import Any, Callable, ContextManager, Optional
+
+from db.metadata_cache import conn_scope
+from db.statement_stats import StatementStatsCollector, STATS_TOP_N
+from models.statement_stat import StatementStat
+from ui.background import run_in_background
+
+AUTO_REFRESH_MS = 10_000
+
+_ORDER_LABELS = {
+    "Latencia total": "total_latency",
+    "Latencia media": "mean_latency",
+    "Filas leídas": "rows_read",
+    "Contención": "contention",
+}
+
+
+class StatementsView(ttk.Frame):
+    """
+    Sentencias más costosas según las estadísticas del cluster, agrupadas por fingerprint.
+    Doble click abre la sentencia en el editor SQL (con su plan si se puede ejecutar tal cual).
+    """
+
+    def __init__(
+        self,
+        parent,
+        open_conn: Callable[[], ContextManager[Any]],
+        on_open_sql: Optional[Callable[[StatementStat], None]] = None,
+        on_back: Optional[Callable[[], None]] = None,
+    ):
+        super().__init__(parent)
+        self.open_conn = open_conn
+        self.on_open_sql = on_open_sql
+        self.on_back = on_back
+
+        self.collector = StatementStatsCollector()
+        self._scope = None
+        self._task = None
+        self._stats: dict[str, Any] = {}
+        # MainWindow lo marca al mostrar/ocultar el panel
+        self.active = False
+
+        top = ttk.Frame(self, padding=8)
+        top.pack(fill="x")
+
+        ttk.Button(top, text="← Volver", command=self._back).pack(side="left", padx=(0, 8))
+        ttk.Label(top, text="Sentencias", style="Title.TLabel").pack(side="left")
+
+        btns = ttk.Frame(top)
+        btns.pack(side="right")
+        ttk.Button(btns, text="Actualizar", command=self.refresh).pack(side="left")
+
+        opts = ttk.Frame(self, padding=(8, 0, 8, 0))
+        opts.pack(fill="x")
+        self.var_order = tk.StringVar(value="Latencia total")
+        self.var_top = tk.StringVar(value=str(STATS_TOP_N))
+        self.var_auto = tk.BooleanVar(value=False)
+
+        ttk.Label(opts, text="Ordenar por").pack(side="left", padx=(0, 6))
+        cmb = ttk.Combobox(opts, textvariable=self.var_order, values=list(_ORDER_LABELS), width=16, state="readonly")
+        cmb.pack(side="left", padx=(0, 12))
+        cmb.bind("<<ComboboxSelected>>", lambda e: self._render())
+        ttk.Label(opts, text="Top").pack(side="left", padx=(0, 6))
+        spn = ttk.Spinbox(opts, from_=5, to=500, increment=5, textvariable=self.var_top, width=6, command=self._render)
+        spn.pack(side="left", padx=(0, 12))
+        ttk.Checkbutton(opts, text="Auto-actualizar", variable=self.var_auto).pack(side="left")
+
+        self.lbl_msg = ttk.Label(self, text="", style="Muted.TLabel", padding=(8, 4))
+        self.lbl_msg.pack(anchor="w")
+
+        body = ttk.Frame(self, padding=8)
+        body.pack(fill="both", expand=True)
+        cols = ("query", "db", "count", "total", "mean", "rows", "contention")
+        self.tree = ttk.Treeview(body, columns=cols, show="headings", height=18, selectmode="browse")
+        for col, head, w in zip(
+            cols,
+            ("Sentencia", "Base", "Ejecuciones", "Total (ms)", "Media (ms)", "Filas leídas", "Contención (ms)"),
+            (420, 100, 90, 100, 100, 110, 110),
+        ):
+            self.tree.heading(col, text=head)
+            self.tree.column(col, width=w, anchor="w", stretch=True)
+        self.tree.pack(fill="both", expand=True)
+        self.tree.bind("<Double-1>", self._open_selected)
+
+        self.after(AUTO_REFRESH_MS, self._auto_refresh)
+
+    def _back(self):
+        if self.on_back:
+            self.on_back()
+
+    def refresh(self):
+        if self._task is not None:
+            return
+
+        def job():
+            with self.open_conn() as conn:
+                # Otra conexión/cluster: lo acumulado ya no aplica
+                scope = conn_scope(conn)
+                if scope != self._scope:
+                    self.collector.reset()
+                    self._scope = scope
+                return self.collector.poll(conn)
+
+        def on_done(n):
+            self._task = None
+            src = "statement_statistics" if self.collector.source == "cluster" else "node_statement_statistics"
+            self.lbl_msg.configure(text=f"Fuente: crdb_internal.{src} · {n} fila(s) leídas en este refresco.")
+            self._render()
+
+        def on_error(e):
+            self._task = None
+            self.lbl_msg.configure(text=f"ERROR: {e}")
+
+        self.lbl_msg.configure(text="Actualizando...")
+        self._task = run_in_background(self, job, on_done, on_error)
+
+    def _render(self):
+        try:
+            n = max(1, int(self.var_top.get()))
+        except ValueError:
+            n = STATS_TOP_N
+        order_by = _ORDER_LABELS.get(self.var_order.get(), "total_latency")
+
+        self.tree.delete(*self.tree.get_children())
+        self._stats = {}
+        for s in self.collector.top(n, order_by):
+            iid = self.tree.insert("", "end", values=(
+                " ".join(s.query.split())[:300], s.database, f"{s.count:,}",
+                f"{s.total_latency * 1000:,.1f}", f"{s.mean_latency * 1000:,.2f}",
+                f"{s.rows_read:,.0f}", f"{s.contention * 1000:,.1f}",
+            ))
+            self._stats[iid] = s
+
+    def _auto_refresh(self):
+        try:
+            if self.active and self.var_auto.get():
+                self.refresh()
+            self.after(AUTO_REFRESH_MS, self._auto_refresh)
+        except tk.TclError:
+            pass  # ventana destruida
+
+    def _open_selected(self, _evt):
+        sel = self.tree.selection()
+        s = self._stats.get(sel[0]) if sel else None
+        if s is not None and self.on_open_sql:
+            self.on_open_sql(s)
@@ -1,21 +1,25 @@
 import tkinter as tk
 from tkinter import ttk
 
+from ui.widgets.data_browser import DataBrowser
+from ui.formatting import fmt_bytes, fmt_count
+
 
 class TableDetails(ttk.Frame):
     """
     Panel derecho tipo 'ficha' de tabla:
-    - Header con nombre + botones
+    - Header con nombre + botones + tamaño aproximado (filas, bytes, rangos)
     - Sección Columnas (Treeview)
     - Sección Índices (Treeview)
-    - Sección Preview (Treeview)
+    - Sección Datos (DataBrowser, paginado por clave)
     """
 
-    def __init__(self, parent, on_view_ddl=None, on_drop=None, on_edit=None):
+    def __init__(self, parent, on_view_ddl=None, on_drop=None, on_edit=None, on_import=None):
         super().__init__(parent)
         self.on_view_ddl = on_view_ddl
         self.on_drop = on_drop
         self.on_edit = on_edit
+        self.on_import = on_import
 
         header = ttk.Frame(self)
         header.pack(fill="x", pady=(0, 8))
@@ -29,12 +33,18 @@ class TableDetails(ttk.Frame):
         self.lbl_sub = ttk.Label(left, text="", style="Sub.TLabel")
         self.lbl_sub.pack(anchor="w")
 
+        self.lbl_stats = ttk.Label(left, text="", style="Muted.TLabel")
+        self.lbl_stats.pack(anchor="w")
+
         right = ttk.Frame(header)
         right.pack(side="right")
 
         self.btn_ddl = ttk.Button(right, text="Ver DDL", command=lambda: self.on_view_ddl() if self.on_view_ddl else None)
         self.btn_ddl.pack(side="left", padx=(0, 8))
 
+        self.btn_import = ttk.Button(right, text="Importar", command=lambda: self.on_import() if self.on_import else None)
+        self.btn_import.pack(side="left", padx=(0, 8))
+
         self.btn_edit = ttk.Button(right, text="Modificar", command=lambda: self.on_edit() if self.on_edit else None)
         self.btn_edit.pack(side="left", padx=(0, 8))
 
@@ -66,9 +76,9 @@ class TableDetails(ttk.Frame):
         )
         self.fk_tree.pack(fill="x", pady=(6, 14))
 
-        self._section_label("Vista previa de datos (primeras 100 filas)").pack(anchor="w")
-        self.preview_tree = ttk.Treeview(self, show="headings")
-        self.preview_tree.pack(fill="both", expand=True, pady=(6, 0))
+        self._section_label("Datos").pack(anchor="w")
+        self.data_browser = DataBrowser(self, height=12)
+        self.data_browser.pack(fill="both", expand=True, pady=(6, 0))
 
         self.current_schema = None
         self.current_table = None
@@ -94,10 +104,8 @@ class TableDetails(ttk.Frame):
             for i in t.get_children():
                 t.delete(i)
 
-        # preview
-        for i in self.preview_tree.get_children():
-            self.preview_tree.delete(i)
-        self.preview_tree["columns"] = ()
+        self.data_browser.clear()
+        self.lbl_stats.configure(text="")
 
         self.current_schema = None
         self.current_table = None
@@ -114,21 +122,50 @@ class TableDetails(ttk.Frame):
         self.columns_tree.tag_configure("odd", background="#132038")
 
 
+    def load_table(self, desc):
+        """
+        Carga columnas, índices y FKs desde un TableDescriptor.
+        """
+        self.load_columns(desc.column_rows())
+        self.load_indexes(desc.index_rows())
+        self.load_foreign_keys(desc.foreign_key_rows())
+
     def load_indexes(self, rows):
         for i in self.indexes_tree.get_children():
             self.indexes_tree.delete(i)
         for r in rows:
             self.indexes_tree.insert("", "end", values=r)
 
-    def load_preview(self, columns, rows):
-        self.preview_tree.delete(*self.preview_tree.get_children())
-        self.preview_tree["columns"] = columns
-        for c in columns:
-            self.preview_tree.heading(c, text=c)
-            self.preview_tree.column(c, width=140, anchor="w", stretch=True)
-
-        for r in rows:
-            self.preview_tree.insert("", "end", values=r)
+    def browse(self, open_conn, schema: str, table: str):
+        """
+        open_conn: callable que retorna un context manager con una conexión (se usa en segundo plano).
+        """
+        self.data_browser.open(open_conn, schema, table)
+
+    def set_stats_loading(self):
+        self.lbl_stats.configure(text="Calculando tamaño...")
+
+    def set_stats_error(self, e: Exception):
+        self.lbl_stats.configure(text=f"Estadísticas no disponibles: {e}")
+
+    def load_stats(self, stats):
+        """
+        Muestra un TableStats; los datos que faltan se omiten.
+        """
+        parts = []
+        if stats.approx_rows is not None:
+            parts.append(f"~{fmt_count(stats.approx_rows)} filas")
+        if stats.live_bytes is not None:
+            parts.append(f"{fmt_bytes(stats.live_bytes)} vivos")
+        if stats.total_bytes is not None:
+            parts.append(f"{fmt_bytes(stats.total_bytes)} en total")
+        if stats.range_count is not None:
+            parts.append(f"{fmt_count(stats.range_count)} rango(s)")
+        if stats.stats_created is not None:
+            parts.append(f"estadísticas del {stats.stats_created:%Y-%m-%d %H:%M}")
+        else:
+            parts.append("sin estadísticas (ANALYZE)")
+        self.lbl_stats.configure(text=" · ".join(parts))
 
     def load_foreign_keys(self, rows):
         for i in self.fk_tree.get_children():
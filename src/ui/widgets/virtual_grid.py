@@ -0,0 +1,176 @@
+from tkinter import ttk
+from typing import Callable, Optional, Sequence
+
+
+class ListRowSource:
+    """
+    Filas en memoria para VirtualGrid. has_more indica que el origen puede traer más
+    (p.ej. un QueryStream); en ese caso el grid pide más filas al acercarse al final.
+    """
+
+    def __init__(self, columns: Sequence[str] = (), rows: Optional[list] = None, has_more: bool = False):
+        self.columns = list(columns)
+        self._rows = rows if rows is not None else []
+        self.has_more = has_more
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def get(self, start: int, end: int) -> list:
+        return self._rows[start:end]
+
+    def append(self, rows: list, has_more: bool = False) -> None:
+        self._rows.extend(rows)
+        self.has_more = has_more
+
+
+class VirtualGrid(ttk.Frame):
+    """
+    Grid de resultados que solo materializa las filas visibles.
+    El Treeview tiene un conjunto fijo de items que se reutilizan al hacer scroll,
+    así que el costo de pintar no depende del total de filas.
+    """
+
+    def __init__(
+        self,
+        parent,
+        on_need_more: Optional[Callable[[], None]] = None,
+        column_width: int = 160,
+        height: int = 12,
+    ):
+        super().__init__(parent)
+        self.on_need_more = on_need_more
+        self.column_width = column_width
+
+        self.tree = ttk.Treeview(self, show="headings", height=height, selectmode="browse")
+        self.vbar = ttk.Scrollbar(self, orient="vertical", command=self._on_scrollbar)
+        self.hbar = ttk.Scrollbar(self, orient="horizontal", command=self.tree.xview)
+        self.tree.configure(xscrollcommand=self.hbar.set)
+
+        self.vbar.pack(side="right", fill="y")
+        self.hbar.pack(side="bottom", fill="x")
+        self.tree.pack(side="left", fill="both", expand=True)
+
+        self.tree.tag_configure("even", background="#0b1220")
+        self.tree.tag_configure("odd", background="#132038")
+        self.tree.tag_configure("blank", background="#0b1220")
+
+        self.source = ListRowSource()
+        self.offset = 0
+        self._visible = height
+        self._items: list[str] = []
+        self._need_more_pending = False
+
+        self.tree.bind("<Configure>", self._on_resize)
+        self.tree.bind("<MouseWheel>", self._on_wheel)
+        self.tree.bind("<Button-4>", lambda e: self._scroll_by(-3))
+        self.tree.bind("<Button-5>", lambda e: self._scroll_by(3))
+        self.tree.bind("<Up>", lambda e: self._scroll_by(-1))
+        self.tree.bind("<Down>", lambda e: self._scroll_by(1))
+        self.tree.bind("<Prior>", lambda e: self._scroll_by(-self._visible))
+        self.tree.bind("<Next>", lambda e: self._scroll_by(self._visible))
+        self.tree.bind("<Home>", lambda e: self._scroll_to(0))
+        self.tree.bind("<End>", lambda e: self._scroll_to(len(self.source)))
+
+    # --- datos ---
+
+    def set_source(self, source: ListRowSource) -> None:
+        self.source = source
+        self.offset = 0
+        self._need_more_pending = False
+        self.tree.delete(*self.tree.get_children())
+        self._items = []
+        self.tree["columns"] = source.columns
+        for c in source.columns:
+            self.tree.heading(c, text=c)
+            self.tree.column(c, width=self.column_width, anchor="w", stretch=True)
+        self.refresh()
+
+    def set_rows(self, columns: Sequence[str], rows: list) -> None:
+        self.set_source(ListRowSource(columns, list(rows)))
+
+    def clear(self) -> None:
+        self.set_source(ListRowSource())
+
+    def rows_appended(self) -> None:
+        """
+        Llamar después de source.append() para repintar y permitir otro pedido de filas.
+        """
+        self._need_more_pending = False
+        self.refresh()
+
+    def selected_row(self) -> Optional[tuple]:
+        sel = self.tree.selection()
+        if not sel or sel[0] not in self._items:
+            return None
+        idx = self.offset + self._items.index(sel[0])
+        rows = self.source.get(idx, idx + 1)
+        return tuple(rows[0]) if rows else None
+
+    # --- pintado ---
+
+    def _ensure_pool(self) -> None:
+        # Tantos items como filas visibles; se crean una sola vez
+        while len(self._items) < self._visible:
+            self._items.append(self.tree.insert("", "end", values=()))
+        while len(self._items) > self._visible:
+            self.tree.delete(self._items.pop())
+
+    def refresh(self) -> None:
+        total = len(self.source)
+        self.offset = max(0, min(self.offset, total - self._visible))
+        self._ensure_pool()
+
+        rows = self.source.get(self.offset, self.offset + self._visible)
+        for pos, iid in enumerate(self._items):
+            if pos < len(rows):
+                idx = self.offset + pos
+                self.tree.item(iid, values=tuple(rows[pos]), tags=("even" if idx % 2 == 0 else "odd",))
+            else:
+                self.tree.item(iid, values=(), tags=("blank",))
+
+        if total:
+            self.vbar.set(self.offset / total, min(1.0, (self.offset + len(rows)) / total))
+        else:
+            self.vbar.set(0.0, 1.0)
+
+        self._maybe_need_more()
+
+    def _maybe_need_more(self) -> None:
+        if not self.source.has_more or self._need_more_pending or self.on_need_more is None:
+            return
+        if self.offset + 2 * self._visible >= len(self.source):
+            self._need_more_pending = True
+            self.after_idle(self.on_need_more)
+
+    # --- scroll ---
+
+    def _scroll_to(self, offset: int) -> None:
+        self.tree.selection_remove(self.tree.selection())
+        self.offset = int(offset)
+        self.refresh()
+
+    def _scroll_by(self, delta: int):
+        self._scroll_to(self.offset + delta)
+        return "break"
+
+    def _on_wheel(self, event):
+        step = -3 if event.delta > 0 else 3
+        return self._scroll_by(step)
+
+    def _on_scrollbar(self, *args) -> None:
+        total = len(self.source)
+        if args[0] == "moveto":
+            self._scroll_to(float(args[1]) * total)
+        elif args[0] == "scroll":
+            amount = int(args[1])
+            unit = self._visible if args[2] == "pages" else 1
+            self._scroll_by(amount * unit)
+
+    def _on_resize(self, event) -> None:
+        style = ttk.Style(self)
+        row_h = int(style.lookup("Treeview", "rowheight") or 20)
+        visible = max(1, (event.height - row_h) // row_h)
+        if visible != self._visible:
+            self._visible = visible
+            self.refresh()